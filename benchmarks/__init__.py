@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the spreadsheet engine.
+Every module is a script, run from the repository root, for example: python -m benchmarks.formula_cache
+"""
@@ -0,0 +1,104 @@
+import argparse
+from threading import Event
+from time import perf_counter
+
+from spreadsheet import Spreadsheet
+from recalc_scheduler import RecalcScheduler
+
+
+def run(length: int) -> None:
+    """
+    Function run
+    Edits the head of a chain of references through the background scheduler, and prints how long the edit blocks the caller,
+    how long until the edited cell's value is ready and how long until the whole chain is
+
+    Parameters:
+        * length: int - number of cells in the chain
+    """
+
+    spreadsheet = Spreadsheet(rows=length, cols=1)
+    spreadsheet.edit_cells({f'A{row}': f'=A{row - 1}+1' if row > 1 else '1' for row in range(1, length + 1)})
+
+    first_value = Event()
+    times = {}
+
+    def on_values(generation, values):
+        if 'A1' in values and not first_value.is_set():
+            times['first'] = perf_counter()
+            first_value.set()
+
+    scheduler = RecalcScheduler(spreadsheet, on_values=on_values)
+
+    start = perf_counter()
+    scheduler.submit('A1', '2')
+    submit = perf_counter() - start
+
+    first_value.wait()
+    scheduler.wait_idle()
+    done = perf_counter() - start
+    scheduler.stop()
+
+    assert spreadsheet.get_value_from_cell(f'A{length}') == str(length + 1)
+
+    print(f'{length:>9,} cells  submit {submit * 1e6:7.1f}us  edited cell ready {(times["first"] - start) * 1e3:8.2f}ms  '
+          f'all cells ready {done * 1e3:9.2f}ms')
+
+
+def run_fan_out(dependents: int, visible: int) -> None:
+    """
+    Function run_fan_out
+    Edits a cell that many cells depend on, and prints how long until the visible cells are ready with and without a priority region
+
+    Parameters:
+        * dependents: int - cells that depend on the edited cell, in column B
+        * visible: int - visible cells at the top of column B
+    """
+
+    visible_cells = {f'B{row}' for row in range(1, visible + 1)}
+
+    for prioritized in (False, True):
+        spreadsheet = Spreadsheet(rows=dependents, cols=2)
+        spreadsheet.edit_cells({'A1': '1', **{f'B{row}': f'=A1*{row}' for row in range(1, dependents + 1)}})
+
+        remaining = set(visible_cells)
+        visible_ready = Event()
+        times = {}
+
+        def on_values(generation, values):
+            remaining.difference_update(values)
+            if not remaining and not visible_ready.is_set():
+                times['visible'] = perf_counter()
+                visible_ready.set()
+
+        scheduler = RecalcScheduler(spreadsheet, on_values=on_values)
+        if prioritized:
+            scheduler.set_priority(visible_cells)
+
+        start = perf_counter()
+        scheduler.submit('A1', '2')
+        visible_ready.wait()
+        scheduler.wait_idle()
+        done = perf_counter() - start
+        scheduler.stop()
+
+        mode = 'priority' if prioritized else 'in order'
+        print(f'{dependents:>9,} dependents {mode:>8}  {visible} visible cells ready {(times["visible"] - start) * 1e3:8.2f}ms  '
+              f'all cells ready {done * 1e3:9.2f}ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Latency of an edit through the background recalculation scheduler')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--dependents', type=int, nargs='+', default=[10_000, 100_000], help='sizes of the viewport priority runs')
+    parser.add_argument('--visible', type=int, default=300)
+    args = parser.parse_args()
+
+    for length in args.sizes:
+        run(length)
+
+    for dependents in args.dependents:
+        run_fan_out(dependents, args.visible)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+from time import perf_counter
+
+from spreadsheet import Spreadsheet
+
+
+def sheet_cells(rows: int) -> dict:
+    """
+    Function sheet_cells
+    Returns the cells of a sheet the way a file is loaded - by columns, so every formula is loaded before the cells it depends on.
+    Column A is a chain of references, column B sums ten cells of column A and column C refers to all of column B through a total.
+    """
+
+    cells = {f'C{row}': f'=B{row}+C{rows}' if row < rows else '1' for row in range(1, rows + 1)}
+    cells.update({f'B{row}': f'=SUM(A{row}, A{max(row - 9, 1)})' for row in range(1, rows + 1)})
+    cells.update({f'A{row}': f'=A{row + 1}+1' if row < rows else '1' for row in range(1, rows + 1)})
+
+    return cells
+
+
+def run(rows: int) -> None:
+    """
+    Function run
+    Loads the same cells one by one through edit_cell and at once through edit_cells, and prints the times
+
+    Parameters:
+        * rows: int - rows of the sheet
+    """
+
+    cells = sheet_cells(rows)
+
+    spreadsheet = Spreadsheet(rows=rows, cols=3)
+    start = perf_counter()
+    for cell_name, value in cells.items():
+        spreadsheet.edit_cell(cell_name, value)
+    one_by_one = perf_counter() - start
+    expected = [spreadsheet.get_value_from_cell(f'{col}{row}') for col in 'ABC' for row in range(1, rows + 1)]
+
+    spreadsheet = Spreadsheet(rows=rows, cols=3)
+    start = perf_counter()
+    errors = spreadsheet.edit_cells(cells)
+    batch = perf_counter() - start
+
+    assert not errors
+    assert [spreadsheet.get_value_from_cell(f'{col}{row}') for col in 'ABC' for row in range(1, rows + 1)] == expected
+
+    print(f'{len(cells):>9,} cells  edit_cell {one_by_one:8.3f}s  edit_cells {batch:8.3f}s ({batch / len(cells) * 1e6:6.1f} us/cell)  speedup {one_by_one / batch:6.1f}x')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Loading interdependent cells one by one versus as a single batch')
+    parser.add_argument('--rows', type=int, nargs='+', default=[300, 1_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import random
+from timeit import timeit
+
+from cell_address import AddressResolver
+from spreadsheet import Spreadsheet
+
+
+def linear_location(columns_names, cell_name):
+    """
+    Function linear_location
+    The way cells names were resolved before the address tables - splitting the name by its characters and scanning the columns names
+    """
+
+    for i, char in enumerate(cell_name):
+        if char.isdigit():
+            break
+
+    col = cell_name[:i].upper()
+    row = cell_name[i:]
+
+    for col_index, column in enumerate(columns_names):
+        if column == col:
+            return int(row) - 1, col_index + 1
+
+
+def report(title: str, func, names) -> None:
+    """
+    Function report
+    Prints the average time of calling func on every one of the names
+    """
+    seconds = timeit(lambda: [func(name) for name in names], number=1)
+    print(f'{title:<40} {seconds / len(names) * 1e9:10.0f} ns/lookup')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Cost of resolving cells names')
+    parser.add_argument('--cols', type=int, default=16_384)
+    parser.add_argument('--rows', type=int, default=1_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+
+    spreadsheet = Spreadsheet(rows=args.rows, cols=args.cols, sparse=True)
+    columns_names = spreadsheet.columns_names
+
+    random.seed(0)
+    names = [random.choice(columns_names) + str(random.randint(1, args.rows)) for _ in range(args.lookups)]
+    cols = [random.randint(1, args.cols) for _ in range(args.lookups)]
+
+    print(f'{args.cols:,} columns, {args.lookups:,} random cells names')
+
+    # Before - linear scan of the columns, on a sample because it is slow
+    report('linear scan (before)', lambda name: linear_location(columns_names, name), names[:args.lookups // 100])
+
+    # After - a resolver that keeps no parsed names for the cold cache, its columns tables are ready like the spreadsheet's
+    cold = AddressResolver(cache_size=1)
+    cold.columns_names(args.cols)
+    report('parse, cold cache', cold.parse, names)
+
+    for name in names:
+        spreadsheet.addresses.parse(name)
+    report('parse, warm cache', spreadsheet.addresses.parse, names)
+    report('spreadsheet.cell_ref, warm cache', spreadsheet.cell_ref, names)
+    report('column_name', spreadsheet.addresses.column_name, cols)
+    report('column_index', spreadsheet.addresses.column_index, [columns_names[col - 1] for col in cols])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.range_functions import build_sheet, measure, COLS
+from spreadsheet_types import ValueKind
+
+
+def scan_count(spreadsheet, start_row: int, stop_row: int, value: int) -> int:
+    """
+    Function scan_count
+    COUNTIF of a number the way it was calculated before the values index - comparing every cell of the range
+    """
+
+    range_values = spreadsheet.values.range_values(start_row, stop_row, 0, 1)
+    return sum(int(np.count_nonzero((block.numbers == value) & (block.kinds >= ValueKind.INT) & (block.kinds <= ValueKind.FLOAT)))
+               for block in range_values.blocks)
+
+
+def run(rows: int, formulas: int, repeat: int) -> None:
+    """
+    Function run
+    Counts values in segments of a column by scanning and by the values index, then writes many COUNTIF formulas and changes a cell
+
+    Parameters:
+        * rows: int - rows of the column
+        * formulas: int - amount of COUNTIF formulas
+        * repeat: int - times to repeat every measurement
+    """
+
+    spreadsheet = build_sheet(rows * COLS, False)
+    index = spreadsheet.value_index
+    target_col = spreadsheet.columns_names[COLS]
+    segments = [(i * rows // (2 * formulas), rows // 2 + i * rows // (2 * formulas)) for i in range(formulas)]
+
+    # First lookup builds the column's index
+    start = perf_counter()
+    index.count(0, rows, 0, 1, 0)
+    build = perf_counter() - start
+
+    scan = measure(lambda: [scan_count(spreadsheet, first, last, i % 100) for i, (first, last) in enumerate(segments)], repeat)
+    lookup = measure(lambda: [index.count(first, last, 0, 1, i % 100) for i, (first, last) in enumerate(segments)], repeat)
+
+    # Every formula counts a half of the column, changing a cell in the middle recalculates all of them
+    start = perf_counter()
+    for i, (first, last) in enumerate(segments):
+        spreadsheet.edit_cell(f'{target_col}{i + 1}', f'=COUNTIF(A{first + 1}, A{last}, {i % 100})')
+    write = perf_counter() - start
+
+    start = perf_counter()
+    spreadsheet.edit_cell(f'A{rows // 2}', '1000')
+    update = perf_counter() - start
+
+    print(f'{rows:>11,} rows  build {build * 1e3:8.2f}ms  {formulas} counts: scan {scan / formulas * 1e3:8.3f}ms  index {lookup / formulas * 1e3:8.4f}ms  '
+          f'speedup {scan / lookup:7.1f}x  write {write / formulas * 1e3:7.3f}ms/formula  update {update * 1e3:8.2f}ms  '
+          f'index memory {index.memory_usage() / 2**20:.1f}MB  hits {index.hits}  builds {index.builds}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='COUNTIF over column segments by scanning and by the values index')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10 ** 4, 2 * 10 ** 5, 10 ** 6])
+    parser.add_argument('--formulas', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.formulas, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
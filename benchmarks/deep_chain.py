@@ -0,0 +1,44 @@
+import argparse
+from time import perf_counter
+
+from spreadsheet import Spreadsheet
+
+
+def run(length: int) -> None:
+    """
+    Function run
+    Builds a chain of references of the given length through edit_cell, then updates its head, and prints the times
+
+    Parameters:
+        * length: int - number of cells in the chain
+    """
+
+    spreadsheet = Spreadsheet(rows=length, cols=1)
+
+    start = perf_counter()
+    spreadsheet.edit_cell('A1', '1')
+    for row in range(2, length + 1):
+        spreadsheet.edit_cell(f'A{row}', f'=A{row - 1}+1')
+    build = perf_counter() - start
+
+    # Updating the head of the chain recalculates every cell in it
+    start = perf_counter()
+    spreadsheet.edit_cell('A1', '2')
+    update = perf_counter() - start
+
+    assert spreadsheet.get_value_from_cell(f'A{length}') == str(length + 1)
+
+    print(f'{length:>9} cells  build {build:8.3f}s ({build / length * 1e6:6.1f} us/cell)  update head {update:8.3f}s ({update / length * 1e6:6.1f} us/cell)')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Build and update time of long chains of references')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    for length in args.sizes:
+        run(length)
+
+
+if __name__ == '__main__':
+    main()
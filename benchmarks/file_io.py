@@ -0,0 +1,251 @@
+"""
+Throughput of exporting and importing files - every file type with every export type, and every import mode.
+Every operation runs in a new process, so its peak memory is not mixed with the memory of other operations.
+
+Usage:
+    python -m benchmarks.file_io --sizes 1000 10000 100000 --json file_io.json
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+from typing import Dict, List
+
+from spreadsheet import Spreadsheet
+from file_manager import FileManager
+from spreadsheet_types import FileType, ExportType, ImportType
+
+# Repository root, the operations run from it
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLS = 10
+
+# Every export type of every file type, csv and pdf export values only
+EXPORTS = [(file_type, export_type) for file_type in FileType for export_type in ExportType
+           if export_type is ExportType.VALUES_ONLY or file_type not in (FileType.CSV, FileType.PDF)]
+
+# Every import mode, with the export that creates the file it imports
+IMPORTS = [(FileType.JSON, ImportType.FORMULAS, ExportType.INCLUDE_INFO),
+           (FileType.JSON, ImportType.VALUES_ONLY, ExportType.VALUES_ONLY),
+           (FileType.EXCEL, ImportType.FORMULAS, ExportType.INCLUDE_INFO)]
+
+MB = 1024 * 1024
+
+
+def build_sheet(cells: int) -> Spreadsheet:
+    """
+    Function build_sheet
+    Creates a sheet of ten columns - six of numbers, one of texts and three of formulas, one of them depends on another formula.
+    The first and the formulas column of every fifth row have colors.
+
+    Parameters:
+        * cells: int - amount of populated cells, rounded down to full rows
+
+    Return Value: Spreadsheet
+    """
+
+    rows = max(cells // COLS, 1)
+    spreadsheet = Spreadsheet(rows=rows, cols=COLS)
+
+    values = {}
+    for row in range(1, rows + 1):
+        values.update({f'{column}{row}': str((row * 7 + index) % 1000) for index, column in enumerate('ABCDEF')})
+        values[f'G{row}'] = f'item-{row}'
+        values[f'H{row}'] = f'=A{row}+B{row}'
+        values[f'I{row}'] = f'=SUM(C{row}, D{row}, E{row})'
+        values[f'J{row}'] = f'=H{row}*2'
+
+    spreadsheet.edit_cells(values)
+
+    for row in range(5, rows + 1, 5):
+        spreadsheet.set_cell_design(f'A{row}', bg='#ffff00', fg='#0000ff')
+        spreadsheet.set_cell_design(f'H{row}', bg='#00ff00')
+
+    return spreadsheet
+
+
+def current_rss() -> int:
+    """
+    Function current_rss
+    Returns the resident memory of the process in bytes, 0 where /proc is not available
+    """
+
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return 0
+
+
+def peak_rss() -> int:
+    """
+    Function peak_rss
+    Returns the peak resident memory of the process in bytes
+    """
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def warm_up(case: Dict) -> None:
+    """
+    Function warm_up
+    Exports a tiny sheet in the operation's file type, and imports it back for an import, so the dependencies of the file type
+    are imported before the operation is measured - they are imported on their first use
+    """
+
+    file_type = FileType[case['file_type']]
+    path = case['path'] + '.warm' + file_type.value
+    export_type = ExportType[case['source_mode']] if case['operation'] == 'import' else ExportType[case['mode']]
+
+    try:
+        FileManager(build_sheet(COLS)).export_to_file(path, file_type, export_type)
+
+        if case['operation'] == 'import':
+            FileManager(Spreadsheet()).import_file(path, file_type, ImportType[case['mode']])
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def run_operation(case: Dict) -> Dict:
+    """
+    Function run_operation
+    Runs a single export or import and measures it, called in the process of the operation
+
+    Parameters:
+        * case: Dict - operation ('export' or 'import'), file_type, mode (names of the enums), cells and path.
+                       Imports also have source_mode, the export type the file was written with
+
+    Return Value: Dict - seconds, bytes of the file, cells, peak RSS and RSS before the operation in bytes
+    """
+
+    file_type = FileType[case['file_type']]
+    warm_up(case)
+
+    if case['operation'] == 'export':
+        spreadsheet = build_sheet(case['cells'])
+        file_manager = FileManager(spreadsheet)
+        operation = lambda: file_manager.export_to_file(case['path'], file_type, ExportType[case['mode']])
+    else:
+        spreadsheet = Spreadsheet()
+        file_manager = FileManager(spreadsheet)
+        operation = lambda: file_manager.import_file(case['path'], file_type, ImportType[case['mode']])
+
+    gc.collect()
+    rss_before = current_rss()
+
+    start = perf_counter()
+    operation()
+    seconds = perf_counter() - start
+
+    return {'seconds': seconds, 'bytes': os.path.getsize(case['path']), 'cells': len(spreadsheet.cells),
+            'peak_rss': peak_rss(), 'rss_before': rss_before}
+
+
+def measure(case: Dict, timeout: float) -> Dict:
+    """
+    Function measure
+    Runs an operation in a new process and returns the case with its measurements, or with the error it failed with
+    """
+
+    try:
+        process = subprocess.run([sys.executable, '-m', 'benchmarks.file_io', '--operation', json.dumps(case)],
+                                 cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return dict(case, error=f'timeout after {timeout:.0f}s')
+
+    if process.returncode != 0:
+        return dict(case, error=process.stderr.strip().splitlines()[-1])
+
+    return dict(case, **json.loads(process.stdout.splitlines()[-1]))
+
+
+def show(result: Dict) -> None:
+    """
+    Function show
+    Prints a line of a result - throughput in MB/s of the file and cells/s, the file's size and the memory of the operation
+    """
+
+    name = f"{result['cells_asked']:>9,}  {result['operation']:<6} {result['file_type']:<5} {result['mode']:<12}"
+
+    if 'error' in result:
+        print(f"{name}  failed: {result['error']}")
+        return
+
+    seconds, size = result['seconds'], result['bytes'] / MB
+    print(f"{name}  {seconds:8.3f}s  {result['cells'] / seconds:>10,.0f} cells/s  {size:8.2f}MB  {size / seconds:7.2f}MB/s  "
+          f"peak RSS {result['peak_rss'] / MB:7.1f}MB (+{max(result['peak_rss'] - result['rss_before'], 0) / MB:.1f}MB)")
+
+
+def run(sizes: List[int], directory: str, timeout: float) -> List[Dict]:
+    """
+    Function run
+    Exports a sheet of every size to every file type and export type, then imports the exported files in every import mode
+
+    Parameters:
+        * sizes: List[int] - amounts of populated cells
+        * directory: str - where the files are written
+        * timeout: float - seconds an operation may take before it is stopped
+
+    Return Value: List[Dict] - the results
+    """
+
+    results = []
+
+    for cells in sizes:
+        for file_type, export_type in EXPORTS:
+            path = os.path.join(directory, f'{cells}_{export_type.name.lower()}{file_type.value}')
+            case = {'operation': 'export', 'file_type': file_type.name, 'mode': export_type.name, 'cells': cells, 'path': path}
+
+            results.append(dict(measure(case, timeout), cells_asked=cells))
+            show(results[-1])
+
+        for file_type, import_type, export_type in IMPORTS:
+            path = os.path.join(directory, f'{cells}_{export_type.name.lower()}{file_type.value}')
+            case = {'operation': 'import', 'file_type': file_type.name, 'mode': import_type.name, 'source_mode': export_type.name,
+                    'cells': cells, 'path': path}
+
+            if not os.path.exists(path):
+                results.append(dict(case, cells_asked=cells, error='the file to import was not exported'))
+            else:
+                results.append(dict(measure(case, timeout), cells_asked=cells))
+
+            show(results[-1])
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Time, memory and throughput of exporting and importing files')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='populated cells, up to 1000000')
+    parser.add_argument('--timeout', type=float, default=900, help='seconds an operation may take')
+    parser.add_argument('--dir', help='keep the files in this directory, by defult they are deleted')
+    parser.add_argument('--json', metavar='PATH', help='write the results to a json file')
+    parser.add_argument('--operation', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Running a single operation, in its own process
+    if args.operation:
+        print(json.dumps(run_operation(json.loads(args.operation))))
+        return
+
+    if args.dir:
+        os.makedirs(args.dir, exist_ok=True)
+        results = run(args.sizes, args.dir, args.timeout)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            results = run(args.sizes, directory, args.timeout)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
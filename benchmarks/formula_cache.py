@@ -0,0 +1,67 @@
+import argparse
+from time import perf_counter
+
+from spreadsheet import Spreadsheet
+
+
+def build_sheet(rows: int) -> Spreadsheet:
+    """
+    Function build_sheet
+    Creates a sheet with a column of numbers and two columns of formulas that refer to them
+
+    Parameters:
+        * rows: int
+
+    Return Value: Spreadsheet
+    """
+
+    spreadsheet = Spreadsheet(rows=rows, cols=3)
+
+    for row in range(1, rows + 1):
+        spreadsheet.edit_cell(f'A{row}', str(row))
+        spreadsheet.edit_cell(f'B{row}', f'=A{row} * 2 + SQRT(A{row})')
+        spreadsheet.edit_cell(f'C{row}', f'=SUM(A{row}, B{row}, 1) / 2')
+
+    return spreadsheet
+
+
+def recalc(spreadsheet: Spreadsheet, cold: bool) -> float:
+    """
+    Function recalc
+    Evaluates every formula cell in the sheet once and returns the time it took.
+
+    Parameters:
+        * spreadsheet: Spreadsheet
+        * cold: bool - when True the formulas cache is emptied before every evaluation, so every formula is parsed again
+
+    Return Value: float - seconds
+    """
+
+    formulas = [(cell.name, cell.formula) for cell in spreadsheet.iter_cells() if spreadsheet.is_formula(cell.formula)]
+    compiler = spreadsheet.formula_compiler
+
+    start = perf_counter()
+    for name, formula in formulas:
+        if cold:
+            compiler.clear()
+        spreadsheet.evaluate_cell_value(formula, name)
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Recalc throughput with and without the compiled formulas cache')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    spreadsheet = build_sheet(args.rows)
+    formulas_amount = args.rows * 2
+
+    for label, cold in (('parse every time', True), ('compiled cache', False)):
+        best = min(recalc(spreadsheet, cold) for _ in range(args.repeat))
+        print(f'{label:<18} {formulas_amount:>8} formulas  {best:8.3f}s  {formulas_amount / best:12.0f} cells/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import tkinter as tk
+from statistics import median
+from time import perf_counter
+from types import SimpleNamespace
+
+from spreadsheet import Spreadsheet
+from spreadsheet_gui import SpreadsheetGui
+from main import SpreadsheetApp
+
+# Grid size in pixels, the same for every spreadsheet so only the spreadsheet's size changes
+GRID_SIZE = SimpleNamespace(width=900, height=500)
+
+# Allowed ratio between the median latency on the biggest and on the smallest spreadsheet
+MAX_RATIO = 2.0
+
+
+def run(rows: int, cols: int, events: int) -> float:
+    """
+    Function run
+    Opens the GUI on a spreadsheet, drives arrow keys events from its middle through the navigation handler and prints the latency
+    of every event, including the grid scrolling it causes
+
+    Parameters:
+        * rows, cols: int - size of the spreadsheet
+        * events: int - amount of navigation events
+
+    Return Value: float - the median latency in seconds
+    """
+
+    spreadsheet = Spreadsheet(rows, cols, sparse=rows * cols > SpreadsheetApp.SPARSE_CELLS)
+    start_row = rows // 2
+    spreadsheet.edit_cells({f'{column}{row}': str(row) for row in range(start_row + 1, start_row + events + 1) for column in 'ABC'})
+
+    gui = SpreadsheetGui(spreadsheet)
+    gui.root.withdraw()
+    gui.resize_grid(GRID_SIZE)
+    gui.scroll_to(start_row, 0)
+
+    row, col = start_row, 0
+    latencies = []
+
+    try:
+        for i in range(events):
+            keysym = 'Right' if i % 10 == 9 else 'Down'
+            event = SimpleNamespace(widget=gui.cells_entries[spreadsheet.columns_names[col] + str(row + 1)], keysym=keysym)
+
+            start = perf_counter()
+            gui.navigate(event)
+            gui.root.update_idletasks()
+            latencies.append(perf_counter() - start)
+
+            row, col = (row + 1, col) if keysym == 'Down' else (row, min(col + 1, cols - 1))
+    finally:
+        gui.recalc.stop()
+        gui.root.destroy()
+
+    latencies.sort()
+    p50 = median(latencies)
+
+    print(f'{rows:>11,} rows  {len(gui.pool)}x{len(gui.pool[0]) if gui.pool else 0} entries  {events} events  '
+          f'p50 {p50 * 1e3:7.3f}ms  p95 {latencies[int(len(latencies) * 0.95)] * 1e3:7.3f}ms  max {latencies[-1] * 1e3:7.3f}ms')
+
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Latency of keyboard navigation in the GUI as the spreadsheet grows, needs a display')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--cols', type=int, default=26)
+    parser.add_argument('--events', type=int, default=300)
+    args = parser.parse_args()
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print(f'The GUI can not be opened here: {e}')
+        return
+
+    medians = [run(rows, args.cols, args.events) for rows in args.rows]
+
+    # Navigation should not depend on the size of the spreadsheet
+    ratio = medians[-1] / medians[0]
+    print(f'p50 ratio {args.rows[-1]:,} / {args.rows[0]:,} rows: {ratio:.2f}x (allowed {MAX_RATIO}x)')
+    assert ratio <= MAX_RATIO, 'navigation latency grows with the size of the spreadsheet'
+
+
+if __name__ == '__main__':
+    main()
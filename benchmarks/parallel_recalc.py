@@ -0,0 +1,70 @@
+import argparse
+import os
+from time import perf_counter
+
+from spreadsheet import Spreadsheet
+
+
+def build_sheet(rows: int, workers: int) -> Spreadsheet:
+    """
+    Function build_sheet
+    Creates a sheet of a column of values and three columns of formulas - B depends on A, C and D depend on B.
+    Every column of formulas is a single level of the recalculation.
+    """
+
+    spreadsheet = Spreadsheet(rows=rows, cols=4, workers=workers)
+
+    cells = {f'A{row}': str(row) for row in range(1, rows + 1)}
+    cells.update({f'B{row}': f'=SQRT(A{row})*POWER(A{row}, 2)+A{row}/7' for row in range(1, rows + 1)})
+    cells.update({f'C{row}': f'=SUM(B{row}, A{row}, 3)*2' for row in range(1, rows + 1)})
+    cells.update({f'D{row}': f'=AVERAGE(B{row}, A{row})-B{row}/3' for row in range(1, rows + 1)})
+
+    spreadsheet.edit_cells(cells)
+    return spreadsheet
+
+
+def run(rows: int, workers_counts: list, threshold: int) -> None:
+    """
+    Function run
+    Recalculates the same sheet with different amounts of workers, and prints the times
+
+    Parameters:
+        * rows: int - rows of the sheet, every level has this amount of formulas
+        * workers_counts: list - amounts of workers to measure, 1 is serial
+        * threshold: int - smallest level that is evaluated in parallel
+    """
+
+    serial = None
+    expected = None
+
+    for workers in workers_counts:
+        spreadsheet = build_sheet(rows, workers)
+        spreadsheet.parallel_recalc.threshold = threshold
+
+        start = perf_counter()
+        spreadsheet.recalculate()
+        elapsed = perf_counter() - start
+
+        values = spreadsheet.cells_df.values.tolist()
+        if expected is None:
+            serial, expected = elapsed, values
+        assert values == expected
+
+        print(f'{rows * 3:>9,} formulas  workers {workers:>2}  recalculate {elapsed:8.3f}s  speedup {serial / elapsed:5.2f}x  '
+              f'parallel levels {spreadsheet.parallel_recalc.levels}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Recalculating levels of independent formulas serially and in a processes pool')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 50_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--threshold', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} cores')
+    for rows in args.rows:
+        run(rows, args.workers, args.threshold)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import argparse
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from spreadsheet import Spreadsheet
+from spreadsheet_types import ValueKind
+from value_store import ValueStore
+
+
+COLS = 10
+
+
+def build_sheet(cells: int, sparse: bool, **options) -> Spreadsheet:
+    """
+    Function build_sheet
+    Creates a sheet of ten columns full of integers. The values are written to the values store directly,
+    writing millions of cells through edit_cell would take much longer than the functions that are measured.
+
+    Parameters:
+        * cells: int - amount of cells with values
+        * sparse: bool - storage mode
+        * options - more options for the spreadsheet
+
+    Return Value: Spreadsheet
+    """
+
+    rows = cells // COLS
+    spreadsheet = Spreadsheet(rows=rows + 1, cols=COLS + 1, sparse=sparse, **options)
+    numbers = np.arange(rows * COLS, dtype=np.float64).reshape(rows, COLS) % 100
+
+    if sparse:
+        # All of the columns are in the first column of tiles
+        values = spreadsheet.values
+        for tile_start in range(0, rows, values.tile_rows):
+            tile_stop = min(tile_start + values.tile_rows, rows)
+            tile = ValueStore(values.tile_rows, values.tile_cols)
+            tile.numbers[:tile_stop - tile_start, :COLS] = numbers[tile_start:tile_stop]
+            tile.kinds[:tile_stop - tile_start, :COLS] = ValueKind.INT
+            values.tiles[(tile_start // values.tile_rows, 0)] = tile
+    else:
+        spreadsheet.values.numbers[:rows, :COLS] = numbers
+        spreadsheet.values.kinds[:rows, :COLS] = ValueKind.INT
+
+    return spreadsheet
+
+
+def pandas_sum(spreadsheet: Spreadsheet, rows: int) -> int:
+    """
+    Function pandas_sum
+    SUM_BY_RANGE the way it was calculated before the range kernels - a dataframe of strings, converted on every call
+    """
+
+    range_df = spreadsheet.cells_df.iloc[:rows, :COLS]
+    range_df = range_df.replace('', '0').infer_objects().apply(pd.to_numeric)
+    return range_df.sum().sum()
+
+
+def measure(func, repeat: int) -> float:
+    """
+    Function measure
+    Returns the best time of calling func repeat times
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Time of the range functions over big ranges')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--sparse', action='store_true', help='use the sparse storage mode')
+    parser.add_argument('--baseline-limit', type=int, default=10 ** 6, help='biggest range to measure the dataframe sum on')
+    args = parser.parse_args()
+
+    for cells in args.sizes:
+        spreadsheet = build_sheet(cells, args.sparse)
+        last = spreadsheet.columns_names[COLS - 1] + str(cells // COLS)
+        target = spreadsheet.columns_names[COLS] + '1'
+
+        line = f'{cells:>11,} cells'
+        for func in ['SUM_BY_RANGE', 'AVERAGE_BY_RANGE', 'COUNTNUMS']:
+            formula = f'={func}(A1, {last})'
+            seconds = measure(lambda: spreadsheet.evaluate_cell_value(formula, target), args.repeat)
+            line += f'  {func} {seconds * 1e3:9.2f}ms'
+
+        formula = f'=COUNTIF(A1, {last}, 7)'
+        seconds = measure(lambda: spreadsheet.evaluate_cell_value(formula, target), args.repeat)
+        line += f'  COUNTIF {seconds * 1e3:9.2f}ms'
+
+        if cells <= args.baseline_limit:
+            seconds = measure(lambda: pandas_sum(spreadsheet, cells // COLS), 1)
+            line += f'  dataframe sum (before) {seconds * 1e3:10.2f}ms'
+
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
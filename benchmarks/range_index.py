@@ -0,0 +1,61 @@
+import argparse
+from time import perf_counter
+
+from benchmarks.range_functions import build_sheet, COLS
+
+
+def run(cells: int, formulas: int, span: int, range_index: bool) -> None:
+    """
+    Function run
+    Writes many sums over big overlapping ranges, then changes a cell that all of them cover, and prints the times
+
+    Parameters:
+        * cells: int - amount of cells with values
+        * formulas: int - amount of SUM_BY_RANGE formulas
+        * span: int - rows in every range
+        * range_index: bool - whether the spreadsheet uses the prefix sums index
+    """
+
+    spreadsheet = build_sheet(cells, False, range_index=range_index)
+    rows = cells // COLS
+    last_col = spreadsheet.columns_names[COLS - 1]
+    target_col = spreadsheet.columns_names[COLS]
+    step = max((rows - span) // formulas, 1)
+
+    # Every formula sums all of the columns over span rows, the ranges overlap
+    start = perf_counter()
+    for i in range(formulas):
+        first = 1 + (i * step) % max(rows - span, 1)
+        spreadsheet.edit_cell(f'{target_col}{i + 1}', f'=SUM_BY_RANGE(A{first}, {last_col}{first + span - 1})')
+    write = perf_counter() - start
+
+    # Changing a cell in the middle recalculates every formula
+    start = perf_counter()
+    spreadsheet.edit_cell(f'A{rows // 2}', '1000')
+    update = perf_counter() - start
+
+    mode = 'index' if range_index else 'scan'
+    line = f'{cells:>11,} cells {mode:>5}  {formulas} sums of {span * COLS:,} cells  write {write / formulas * 1e3:8.3f}ms/formula  update {update * 1e3:9.2f}ms'
+
+    if range_index:
+        index = spreadsheet.range_index
+        line += f'  regions {len(index.regions)}  index memory {index.memory_usage() / 2**20:.1f}MB'
+
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Sums over big overlapping ranges with and without the prefix sums index')
+    parser.add_argument('--cells', type=int, nargs='+', default=[10 ** 6, 10 ** 7])
+    parser.add_argument('--formulas', type=int, default=200)
+    parser.add_argument('--span', type=int, default=50_000, help='rows in every range')
+    args = parser.parse_args()
+
+    for cells in args.cells:
+        span = min(args.span, cells // COLS)
+        run(cells, args.formulas, span, False)
+        run(cells, args.formulas, span, True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from spreadsheet import Spreadsheet
+
+
+def run(rows: int, cols: int, sparse: bool, populated: int) -> None:
+    """
+    Function run
+    Creates a spreadsheet of the given size, writes values to some of its cells, and prints the time and memory each step takes
+
+    Parameters:
+        * rows, cols: int - declared size of the spreadsheet
+        * sparse: bool - storage mode
+        * populated: int - number of cells to write, spread over the whole sheet
+    """
+
+    tracemalloc.start()
+
+    start = perf_counter()
+    spreadsheet = Spreadsheet(rows=rows, cols=cols, sparse=sparse)
+    construct = perf_counter() - start
+    construct_memory = tracemalloc.get_traced_memory()[0]
+
+    # Writing values on a diagonal-like pattern, so they are spread over many tiles
+    step = max(rows * cols // populated, 1)
+    start = perf_counter()
+    for i in range(populated):
+        position = (i * step) % (rows * cols)
+        row, col = divmod(position, cols)
+        spreadsheet.edit_cell(spreadsheet.columns_names[col] + str(row + 1), str(i))
+    populate = perf_counter() - start
+    populate_memory = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    mode = 'sparse' if sparse else 'dense'
+    print(f'{rows * cols:>11,} cells {mode:>6}  construct {construct:8.3f}s {construct_memory / 2**20:9.1f}MB  '
+          f'+{populated:,} values {populate:7.3f}s {populate_memory / 2**20:9.1f}MB')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Construction time and memory of dense and sparse spreadsheets')
+    parser.add_argument('--sizes', type=int, nargs=2, action='append', metavar=('ROWS', 'COLS'), help='declared sizes, defult 10000x100 and 100000x100')
+    parser.add_argument('--populated', type=int, default=10_000, help='number of cells to write')
+    parser.add_argument('--dense-limit', type=int, default=1_000_000, help='biggest sheet to create in dense mode, in cells')
+    args = parser.parse_args()
+
+    for rows, cols in args.sizes or [(10_000, 100), (100_000, 100)]:
+        if rows * cols <= args.dense_limit:
+            run(rows, cols, False, args.populated)
+        run(rows, cols, True, args.populated)
+
+
+if __name__ == '__main__':
+    main()
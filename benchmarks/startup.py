@@ -0,0 +1,123 @@
+import argparse
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+# Repository root, the scenarios import its modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Opens the GUI's window and closes it once it was drawn, without a display only the imports of the GUI are measured
+GUI_LAUNCH = '''
+import tkinter as tk
+from main import SpreadsheetApp
+from spreadsheet import Spreadsheet
+from spreadsheet_gui import SpreadsheetGui
+try:
+    tk.Tk().destroy()
+except tk.TclError:
+    raise SystemExit(3)
+gui = SpreadsheetGui(Spreadsheet())
+gui.root.update()
+gui.recalc.stop()
+gui.root.destroy()
+'''
+
+# Scenario -> code that is run in a new interpreter, and its budget in milliseconds on top of the interpreter's own startup
+SCENARIOS = {
+    'core': ('import spreadsheet', 300),
+    'cli': ('import cli', 350),
+    'gui': (GUI_LAUNCH, 600),
+}
+
+# Exit code of the gui scenario when there is no display
+NO_DISPLAY = 3
+
+
+def run_once(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """
+    Function run_once
+    Runs code in a new interpreter from the repository root, and returns the finished process
+    """
+
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    return subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+
+
+def wall_time(code: str, runs: int) -> float:
+    """
+    Function wall_time
+    Returns the median time in seconds of running code in a new interpreter, from starting the process until it ends
+    """
+
+    times = []
+
+    for i in range(runs):
+        start = perf_counter()
+        process = run_once(code)
+        times.append(perf_counter() - start)
+
+        if process.returncode not in (0, NO_DISPLAY):
+            raise RuntimeError(process.stderr)
+
+    return median(times)
+
+
+def heaviest_imports(code: str, amount: int) -> list:
+    """
+    Function heaviest_imports
+    Runs code with -X importtime and returns the packages, out of the repository, that took the longest to import as (milliseconds, package)
+    """
+
+    packages = {}
+
+    for line in run_once(code, importtime=True).stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+
+        # The first import of a package includes the imports of all of its modules
+        if not os.path.exists(os.path.join(ROOT, package + '.py')):
+            packages[package] = max(packages.get(package, 0), int(cumulative) / 1e3)
+
+    return sorted(((milliseconds, package) for package, milliseconds in packages.items()), reverse=True)[:amount]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Startup time of the core engine, the headless command and the GUI, against their budgets')
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--top', type=int, default=5, help='amount of the heaviest imports to show of every scenario')
+    args = parser.parse_args()
+
+    # The interpreter's own startup is not part of the budgets
+    interpreter = wall_time('pass', args.runs)
+    print(f'interpreter startup {interpreter * 1e3:7.1f}ms')
+
+    over_budget = []
+
+    for scenario in args.scenarios:
+        code, budget = SCENARIOS[scenario]
+
+        if scenario == 'gui' and run_once(code).returncode == NO_DISPLAY:
+            print('gui: no display, measuring the imports of the GUI only')
+            code = 'import main'
+
+        elapsed = (wall_time(code, args.runs) - interpreter) * 1e3
+        status = 'ok' if elapsed <= budget else 'OVER BUDGET'
+        print(f'{scenario:>5}  {elapsed:7.1f}ms  budget {budget}ms  {status}')
+
+        for milliseconds, module in heaviest_imports(code, args.top):
+            print(f'       {milliseconds:7.1f}ms  {module}')
+
+        if elapsed > budget:
+            over_budget.append(scenario)
+
+    assert not over_budget, f'startup over budget: {", ".join(over_budget)}'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+The engine's benchmark suite - builds every synthetic workbook and times loading it, editing the cell most of its formulas
+depend on, recalculating all of it and evaluating its range formulas on their own.
+The results can be written to a json file and compared with the results of an earlier run.
+
+Usage:
+    python -m benchmarks.suite --json before.json
+    python -m benchmarks.suite --json after.json --compare before.json
+    python -m benchmarks.suite --compare before.json after.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.workbooks import WORKBOOKS, SyntheticWorkbook
+
+# Size of every workbook at scale 1, about a second of work each
+DEFULT_SIZES = {'chain': 10_000, 'fanout': 10_000, 'diamond': 5_000, 'ranges': 1_000, 'countif': 20_000, 'text': 10_000}
+
+# Measured operations, in the order they are shown
+METRICS = ('build', 'edit_cell', 'recalc', 'range_functions')
+
+# Slowdowns smaller than this are timer noise, not regressions, whatever their percent is
+MIN_SLOWDOWN = 0.001
+
+# Format of the results file, changes when its fields change
+RESULTS_VERSION = 1
+
+
+def measure(func, repeat: int) -> List[float]:
+    """
+    Function measure
+    Returns the times in seconds of calling func repeat times.
+    The garbage collector is stopped while measuring, like timeit does, so collections of earlier garbage are not timed.
+    """
+
+    times = []
+    gc.collect()
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = perf_counter()
+            func()
+            times.append(perf_counter() - start)
+    finally:
+        gc.enable()
+
+    return times
+
+
+def run_workbook(workbook: SyntheticWorkbook, repeat: int, **options) -> Dict[str, Optional[float]]:
+    """
+    Function run_workbook
+    Times the operations of the suite on a workbook
+
+    Parameters:
+        * workbook: SyntheticWorkbook
+        * repeat: int - amount of times every operation is measured, except for building the workbook
+        * options - options of the spreadsheet
+
+    Return Value: Dict - the size of the workbook and the time in seconds of every metric, None if the workbook has no range formulas.
+                  Edits are measured by their median, the rest by their best time.
+    """
+
+    start = perf_counter()
+    spreadsheet = workbook.build(**options)
+    build = perf_counter() - start
+
+    # Every edit changes the value, so all of the cells that depend on it are evaluated again
+    original = workbook.cells[workbook.edit]
+    values = iter([str(i) for i in range(2, repeat + 2)])
+    edits = measure(lambda: spreadsheet.edit_cell(workbook.edit, next(values)), repeat)
+    spreadsheet.edit_cell(workbook.edit, original)
+
+    recalc = measure(spreadsheet.recalculate, repeat)
+
+    range_functions = None
+    if workbook.range_formulas:
+        def evaluate_ranges():
+            for formula in workbook.range_formulas:
+                spreadsheet.evaluate_cell_value(formula, workbook.spare_cell)
+
+        range_functions = min(measure(evaluate_ranges, repeat))
+
+    return {'cells': len(workbook.cells), 'formulas': workbook.formulas,
+            'build': build, 'edit_cell': median(edits), 'recalc': min(recalc), 'range_functions': range_functions}
+
+
+def environment() -> Dict[str, str]:
+    """
+    Function environment
+    Returns the details of the machine and of the code the results were measured on
+    """
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'cpus': str(os.cpu_count()), 'commit': commit}
+
+
+def compare(baseline: Dict, results: Dict, threshold: float) -> List[str]:
+    """
+    Function compare
+    Prints the change of every metric that both results have, and returns the metrics that got slower by more than the threshold
+    and by more than a millisecond
+
+    Parameters:
+        * baseline, results: Dict - contents of results files, the results are compared to the baseline
+        * threshold: float - allowed slowdown, 0.25 is 25%
+
+    Return Value: List[str] - the regressions, as 'workbook metric'
+    """
+
+    regressions = []
+    print(f"\ncompared to {baseline['environment'].get('commit') or 'baseline'}, regressions are slower by more than {threshold:.0%}")
+
+    for name, metrics in results['results'].items():
+        old_metrics = baseline['results'].get(name)
+
+        if old_metrics is None:
+            continue
+
+        if (old_metrics['cells'], old_metrics['formulas']) != (metrics['cells'], metrics['formulas']):
+            print(f'{name:>8}  not compared, the workbook has a different size')
+            continue
+
+        for metric in METRICS:
+            old, new = old_metrics.get(metric), metrics.get(metric)
+
+            if not old or new is None:
+                continue
+
+            change = new / old - 1
+            regressed = change > threshold and new - old > MIN_SLOWDOWN
+            print(f"{name:>8}  {metric:<16} {old * 1e3:10.2f}ms -> {new * 1e3:10.2f}ms  {change:+7.1%}{'  REGRESSION' if regressed else ''}")
+
+            if regressed:
+                regressions.append(f'{name} {metric}')
+
+    return regressions
+
+
+def load_results(path: str) -> Dict:
+    """
+    Function load_results
+    Reads a results file, and makes sure it was written in the current format
+    """
+
+    with open(path) as file:
+        results = json.load(file)
+
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path} has results of version {results.get('version')}, expected version {RESULTS_VERSION}")
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark suite of the engine over synthetic workbooks')
+    parser.add_argument('--workbooks', nargs='+', default=list(WORKBOOKS), choices=list(WORKBOOKS))
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplies the size of every workbook')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sparse', action='store_true', help='use the sparse storage mode')
+    parser.add_argument('--range-index', action='store_true', help='use the prefix sums index')
+    parser.add_argument('--json', metavar='PATH', help='write the results to a json file')
+    parser.add_argument('--compare', nargs='+', metavar='PATH',
+                        help='results file to compare with, or two results files to compare without running the suite')
+    parser.add_argument('--threshold', type=float, default=0.25, help='slowdown that counts as a regression, 0.25 is 25%%')
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error('--compare takes one or two results files')
+
+    if args.compare and len(args.compare) == 2:
+        results = load_results(args.compare[1])
+
+    else:
+        options = {'sparse': args.sparse, 'range_index': args.range_index}
+        results = {'version': RESULTS_VERSION, 'environment': environment(),
+                   'options': dict(options, scale=args.scale, repeat=args.repeat), 'results': {}}
+
+        for name in args.workbooks:
+            workbook = WORKBOOKS[name](max(int(DEFULT_SIZES[name] * args.scale), 1))
+            metrics = run_workbook(workbook, args.repeat, **options)
+            results['results'][name] = metrics
+
+            times = '  '.join(f'{metric} {metrics[metric] * 1e3:9.2f}ms' for metric in METRICS if metrics[metric] is not None)
+            print(f"{name:>8}  {metrics['cells']:>9,} cells  {metrics['formulas']:>7,} formulas  {times}")
+
+        if args.json:
+            with open(args.json, 'w') as file:
+                json.dump(results, file, indent=4)
+
+    if args.compare:
+        regressions = compare(load_results(args.compare[0]), results, args.threshold)
+
+        if regressions:
+            print(f"{len(regressions)} regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Synthetic workbooks for the benchmarks, every one of them stresses a different part of the engine.
+A workbook is a size and a dictionary of cells, it is loaded into a spreadsheet through edit_cells.
+
+Usage:
+    workbook = WORKBOOKS['chain'](10_000)
+    spreadsheet = workbook.build()
+"""
+from typing import Callable, Dict, List, Optional
+
+from spreadsheet import Spreadsheet
+
+
+# Labels of the text columns, none of them looks like a cell name
+LABELS = ('NORTH', 'SOUTH', 'EAST', 'WEST', 'CENTER')
+
+# Columns of numbers in the ranges workbook, and the amount of aggregates over growing ranges
+RANGE_COLS = 'ABCDEFGHIJ'
+RANGE_AGGREGATES = 50
+
+
+class SyntheticWorkbook:
+    """
+    Class SyntheticWorkbook: the cells of a generated workbook and the cells that are used to measure it -
+    the cell whose edit reaches the most formulas, and range formulas to evaluate on their own.
+    """
+
+    def __init__(self, name: str, rows: int, cols: int, cells: Dict[str, str], edit: str, range_formulas: Optional[List[str]] = None) -> None:
+        """
+        Parameters:
+            * name: str - the kind of the workbook
+            * rows, cols: int - size of the spreadsheet, up to 26 columns. The last column is left empty for evaluating range formulas
+            * cells: Dict[str, str] - cell name -> value or formula
+            * edit: str - name of a cell with a number, most of the formulas depend on it
+            * range_formulas: List[str] - optional, range formulas over the cells of the workbook
+        """
+
+        self.name = name
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.edit = edit
+        self.range_formulas = range_formulas or []
+
+        # The cell range formulas are evaluated for, no cell refers to it
+        self.spare_cell = f'{chr(ord("A") + cols - 1)}{rows}'
+
+
+    @property
+    def formulas(self) -> int:
+        """
+        Property formulas
+        The amount of formulas in the workbook
+        """
+        return sum(1 for value in self.cells.values() if value.startswith('='))
+
+
+    def build(self, **options) -> Spreadsheet:
+        """
+        Function build
+        Creates a spreadsheet of the workbook's size and loads the workbook's cells into it
+
+        Parameters:
+            * options - more options for the spreadsheet, like sparse or range_index
+
+        Return Value: Spreadsheet
+        """
+
+        spreadsheet = Spreadsheet(rows=self.rows, cols=self.cols, **options)
+        errors = spreadsheet.edit_cells(self.cells)
+
+        assert not errors, f'{self.name} workbook has errors: {dict(list(errors.items())[:3])}'
+        return spreadsheet
+
+
+def chain(size: int) -> SyntheticWorkbook:
+    """
+    Function chain
+    A column of references, every cell adds one to the cell above it - A1, =A1+1, =A2+1, ...
+    Every cell is its own level of the recalculation.
+    """
+
+    cells = {'A1': '1'}
+    cells.update({f'A{row}': f'=A{row - 1}+1' for row in range(2, size + 1)})
+
+    return SyntheticWorkbook('chain', size, 2, cells, 'A1')
+
+
+def fanout(size: int) -> SyntheticWorkbook:
+    """
+    Function fanout
+    A single cell that every other cell depends on - A1 and size formulas in column B, all of them a single level of the recalculation
+    """
+
+    cells = {'A1': '1'}
+    cells.update({f'B{row}': f'=A1*2+{row}' for row in range(1, size + 1)})
+
+    return SyntheticWorkbook('fanout', size, 3, cells, 'A1')
+
+
+def diamond(size: int) -> SyntheticWorkbook:
+    """
+    Function diamond
+    A chain of diamonds - every row splits into two cells that both depend on it, and the next row joins them again:
+    B = A+1, C = A-1, the next A = AVERAGE(B, C). The values stay the same all along the chain.
+    """
+
+    cells = {'A1': '1'}
+
+    for row in range(1, size + 1):
+        cells[f'B{row}'] = f'=A{row}+1'
+        cells[f'C{row}'] = f'=A{row}-1'
+
+        if row < size:
+            cells[f'A{row + 1}'] = f'=AVERAGE(B{row}, C{row})'
+
+    return SyntheticWorkbook('diamond', size, 4, cells, 'A1')
+
+
+def ranges(size: int) -> SyntheticWorkbook:
+    """
+    Function ranges
+    A block of numbers, size rows of ten columns, with heavy aggregates over it - the sum and average of every column,
+    and sums over growing ranges from the first cell that all overlap
+    """
+
+    rows = size + 3
+    cells = {f'{column}{row}': str((row * 7 + index) % 100) for row in range(1, size + 1) for index, column in enumerate(RANGE_COLS)}
+
+    last = RANGE_COLS[-1]
+    for column in RANGE_COLS:
+        cells[f'{column}{size + 1}'] = f'=SUM_BY_RANGE({column}1, {column}{size})'
+        cells[f'{column}{size + 2}'] = f'=AVERAGE_BY_RANGE({column}1, {column}{size})'
+
+    step = max(size // RANGE_AGGREGATES, 1)
+    for row in range(step, size + 1, step):
+        cells[f'L{row}'] = f'=SUM_BY_RANGE(A1, {last}{row})'
+
+    range_formulas = [f'=SUM_BY_RANGE(A1, {last}{size})', f'=AVERAGE_BY_RANGE(A1, {last}{size})', f'=COUNTNUMS(A1, {last}{size})']
+
+    return SyntheticWorkbook('ranges', rows, 13, cells, 'A1', range_formulas)
+
+
+def countif(size: int) -> SyntheticWorkbook:
+    """
+    Function countif
+    A dashboard of COUNTIF formulas over a table of size rows - a column of numbers from 0 to 9 and a column of labels,
+    the dashboard counts every number and every label, and the numbers that equal a cell of the dashboard
+    """
+
+    cells = {}
+
+    for row in range(1, size + 1):
+        cells[f'A{row}'] = str(row % 10)
+        cells[f'B{row}'] = LABELS[row % len(LABELS)]
+
+    for number in range(10):
+        cells[f'D{number + 1}'] = str(number)
+        cells[f'E{number + 1}'] = f'=COUNTIF(A1, A{size}, {number})'
+        cells[f'F{number + 1}'] = f'=COUNTIF(A1, A{size}, D{number + 1})'
+
+    for index, label in enumerate(LABELS):
+        cells[f'G{index + 1}'] = f'=COUNTIF(B1, B{size}, {label})'
+
+    range_formulas = [f'=COUNTIF(A1, A{size}, 7)', f'=COUNTIF(B1, B{size}, {LABELS[0]})', f'=COUNTNUMS(A1, B{size})']
+
+    return SyntheticWorkbook('countif', size, 8, cells, 'A1', range_formulas)
+
+
+def text(size: int) -> SyntheticWorkbook:
+    """
+    Function text
+    A sheet that is mostly text - size rows of a column of labels, three columns of longer texts and a column of numbers,
+    with counts over all of them
+    """
+
+    cells = {}
+
+    for row in range(1, size + 1):
+        cells[f'A{row}'] = LABELS[row % len(LABELS)]
+        for index, column in enumerate('BCD'):
+            cells[f'{column}{row}'] = f'{LABELS[(row + index) % len(LABELS)].lower()} item-{row}'
+        cells[f'E{row}'] = str(row)
+
+    cells['G1'] = f'=COUNTNUMS(A1, E{size})'
+    cells['G2'] = f'=SUM_BY_RANGE(E1, E{size})'
+    cells['G3'] = f'=COUNTIF(E1, E{size}, E1)'
+
+    range_formulas = [f'=COUNTNUMS(A1, E{size})', f'=COUNTIF(A1, A{size}, WEST)', f'=COUNTIF(B1, D{size}, B1)']
+
+    return SyntheticWorkbook('text', size, 8, cells, 'E1', range_formulas)
+
+
+# Workbook kind -> generator of the kind, by a size
+WORKBOOKS: Dict[str, Callable[[int], SyntheticWorkbook]] = {
+    'chain': chain,
+    'fanout': fanout,
+    'diamond': diamond,
+    'ranges': ranges,
+    'countif': countif,
+    'text': text,
+}
@@ -1,33 +1,99 @@
 from libraries import *
 from copy import deepcopy
+from cell_address import CellRef, ADDRESSES
 
 class Cell:
     """
     Class Cell: representation of cell in a spreadsheet. has its own attributes such as name, color, font, etc.
+    Cells are kept small - the location is packed into a single integer, the name is shared with the cell's reference, the default style
+    is shared by every cell and the dependents container is created only when the first dependent is added.
     """
 
+    __slots__ = ('position', 'name', 'formula', 'value', 'style', 'dependent_cells')
+
     # Class Constants
     ASCII_A = 65
     EMPTY_CELL = ''
 
+    # Bits of the packed position that hold the column index, packed positions are the same as CellRef's
+    COL_BITS = CellRef.COL_BITS
+    COL_MASK = (1 << COL_BITS) - 1
+
     # Defult values
     DEFULT_BG_COLOR = 'white'
     DEFULT_FG_COLOR = 'black'
+    DEFULT_STYLE = (DEFULT_BG_COLOR, DEFULT_FG_COLOR)
 
 
     def __init__(self, row: int, col: int, name='', formula=EMPTY_CELL, value=EMPTY_CELL, bg=DEFULT_BG_COLOR, fg=DEFULT_FG_COLOR) -> None:
+        """
+        Parameters:
+            * row, col: int - rows start from 0 and columns start from 1
+            * name: str - optional, the name of the cell's location (the spreadsheet passes the name of the cell's reference, so the
+                    string is shared). Calculated from the location if it is not given. Cells outside of the columns (col 0) have no name.
+            * formula, value, bg, fg: str
+
+        Exceptions: ValueError if the name is not the name of the location
+        """
+
+        # Setting up cell location and name
+        self.position: int = Cell.pack(row, col)
+        location_name = Cell.location_name(row, col)
+
+        if name and name.upper() != location_name:
+            raise ValueError(f'Cell name {name} does not match its location {[row, col]}, expected {location_name or "no name"}')
 
-        # Setting up cell name and location
-        self.index: List[int] = [row, col]
-        self.name: str = name
+        # Keeping the given string when it is the same name, so the cell does not hold a copy of its reference's name
+        self.name: str = name if name == location_name else location_name
 
-        # Setting up background color, text color and font
+        # Setting up background color and text color
         self.set_design(bg=bg, fg=fg)
 
-        # Setting values
+        # Setting values, no dependents yet
         self.value = value
         self.formula = formula
-        self.dependent_cells: List[str] = []
+        self.dependent_cells: Optional[Dict[str, None]] = None
+
+
+    @staticmethod
+    def pack(row: int, col: int) -> int:
+        """
+        Function pack
+        Returns the packed position of a cell by its (row, col) index
+        """
+        return (row << Cell.COL_BITS) | col
+
+
+    @property
+    def index(self) -> List[int]:
+        """
+        Property index
+        The index of the cell in the form [row, col], rows start from 0 and columns start from 1
+        """
+        return [self.position >> Cell.COL_BITS, self.position & Cell.COL_MASK]
+
+
+    @staticmethod
+    def location_name(row: int, col: int) -> str:
+        """
+        Function location_name
+        Returns the name of a location in the form: col_name row_number, for example: A3. Locations outside of the columns (col 0) have no name.
+        """
+
+        col_name = ADDRESSES.column_name(col)
+
+        return col_name + str(row + 1) if col_name else ''
+
+
+    @property
+    def bg(self) -> str:
+        return self.style[0]
+
+
+    @property
+    def fg(self) -> str:
+        return self.style[1]
+
 
     def get_info(self) -> Dict[str, str]:
         """
@@ -44,10 +110,10 @@ class Cell:
         """
         return self.name
 
-    def get_index(self) -> Tuple[int, int]:
+    def get_index(self) -> List[int]:
         """
         Function get_index
-        Getter function for cell's class - returns the index of the cell in the form (row, col)
+        Getter function for cell's class - returns the index of the cell in the form [row, col]
         """
 
         return self.index
@@ -66,15 +132,35 @@ class Cell:
         Returns the list of cells names of cells who depend on the current cell's value
         """
 
-        return self.dependent_cells[:]
+        return list(self.dependent_cells) if self.dependent_cells else []
+
+    def has_dependent_cell(self, cell_name: str) -> bool:
+        """
+        Function has_dependent_cell
+        Returns whether the given cell depends on the current cell's value
+        """
+        return bool(self.dependent_cells) and cell_name in self.dependent_cells
 
     def add_dependent_cell(self, cell_name: str):
         """
         Function add_dependent_cell
-        
+        Adds a cell to the cells that depend on the current cell's value
+        """
+        if self.dependent_cells is None:
+            self.dependent_cells = {}
+
+        self.dependent_cells[cell_name.upper()] = None
+
+    def remove_dependent_cell(self, cell_name: str):
+        """
+        Function remove_dependent_cell
+        Removes a cell from the cells that depend on the current cell's value, if it is there
         """
-        if cell_name.upper() not in self.dependent_cells:
-            self.dependent_cells.append(cell_name.upper())
+        if self.dependent_cells:
+            self.dependent_cells.pop(cell_name.upper(), None)
+
+            if not self.dependent_cells:
+                self.dependent_cells = None
 
 
     def set_formula(self, formula: str) -> None:
@@ -106,16 +192,16 @@ class Cell:
         Parameters:
             * bg: str - background color of cell
             * fg: str - text color of cell
-            * fnt: font - font of the text of the cell (bold or normal)
         
         Return Value: None
         """
 
-        self.bg = bg
-        self.fg = fg
-
-        if not self.bg:
-            self.bg = Cell.DEFULT_BG_COLOR
+        if not bg:
+            bg = Cell.DEFULT_BG_COLOR
         
-        if not self.fg:
-            self.fg = Cell.DEFULT_BG_COLOR
+        if not fg:
+            fg = Cell.DEFULT_BG_COLOR
+
+        # Cells with the defult design share the same style
+        self.style = Cell.DEFULT_STYLE if (bg, fg) == Cell.DEFULT_STYLE else (bg, fg)
+
@@ -0,0 +1,216 @@
+from libraries import *
+from spreadsheet_errors import *
+from collections import OrderedDict
+from re import compile as compile_regex
+from threading import Lock
+
+
+class CellRef:
+    """
+    Class CellRef: an immutable reference to a cell by its location. Rows start from 0 and columns start from 1, like the cell's index.
+    References are interned by AddressResolver, so the same cell is usually the same object and comparing references is cheap.
+    """
+
+    __slots__ = ('row', 'col', 'name', 'position')
+
+    # Bits of the packed position that hold the column index, columns start from 1 so the last one is the biggest index that fits
+    COL_BITS = 16
+    MAX_COLS = (1 << COL_BITS) - 1
+
+    def __init__(self, row: int, col: int, name: str) -> None:
+
+        self.row = row
+        self.col = col
+        self.name = name
+
+        # Row and column packed into a single integer, ordered by rows and then by columns
+        self.position = (row << CellRef.COL_BITS) | col
+
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CellRef) and other.position == self.position
+
+
+    def __hash__(self) -> int:
+        return hash(self.position)
+
+
+    def __str__(self) -> str:
+        return self.name
+
+
+    def __repr__(self) -> str:
+        return f'CellRef({self.name})'
+
+
+class AddressResolver:
+    """
+    Class AddressResolver: converts cells names to locations and back.
+    Columns names and indexes are kept in tables that grow to the biggest column that was needed, parsed names are kept
+    in a bounded cache, so resolving a name that was already seen is a single dictionary lookup.
+    The resolver is shared by every thread (the GUI and its recalculation thread), the cache and the tables are changed under a lock.
+    """
+
+    # Class's constants
+    ASCII_A = 65
+    ALPHBET_LETTERS = 26
+    DEFULT_CACHE_SIZE = 100_000
+
+    def __init__(self, cache_size=DEFULT_CACHE_SIZE) -> None:
+
+        # Column index -> column name and back, index 0 has no name
+        self.__columns_names: List[str] = ['']
+        self.__columns_indexes: Dict[str, int] = {}
+
+        # Cell name as written -> reference, ordered by last use
+        self.cache_size = cache_size
+        self.__refs: OrderedDict[str, CellRef] = OrderedDict()
+
+        # Guards the cache's order and the columns tables, reading a name and moving it to the end must not be split by an eviction
+        self.__lock = Lock()
+
+        self.name_pattern = compile_regex(r'([A-Za-z]+)(\d+)')
+
+
+    def column_name(self, col: int) -> str:
+        """
+        Function column_name
+        Returns the name of a column by its index, for example - 1 turns into A and 28 into AB
+
+        Parameters:
+            * col: int - column index, starting from 1
+
+        Return Value: str
+        """
+
+        if col >= len(self.__columns_names):
+            with self.__lock:
+                self.__extend_columns__(col)
+
+        return self.__columns_names[col]
+
+
+    def columns_names(self, cols: int) -> List[str]:
+        """
+        Function columns_names
+        Returns the names of the first cols columns by their order
+        """
+
+        if cols >= len(self.__columns_names):
+            with self.__lock:
+                self.__extend_columns__(cols)
+
+        return self.__columns_names[1:cols + 1]
+
+
+    def column_index(self, col_name: str) -> int:
+        """
+        Function column_index
+        Returns the index of a column by its name (in capital letters), for example - A turns into 1
+
+        Parameters:
+            * col_name: str
+
+        Return Value: int
+        """
+
+        col = self.__columns_indexes.get(col_name)
+
+        if col is None:
+            # Calculating columns that are not in the table yet
+            col = 0
+            for letter in col_name:
+                col = col * AddressResolver.ALPHBET_LETTERS + ord(letter) - AddressResolver.ASCII_A + 1
+
+        return col
+
+
+    def ref(self, row: int, col: int) -> CellRef:
+        """
+        Function ref
+        Returns the reference of a cell by its location
+
+        Parameters:
+            * row: int - starting from 0
+            * col: int - starting from 1
+
+        Return Value: CellRef
+        """
+        return self.parse(self.column_name(col) + str(row + 1))
+
+
+    def parse(self, cell_name: Union[str, CellRef]) -> CellRef:
+        """
+        Function parse
+        The function returns the reference of a cell by its name, from the cache if the name was already parsed.
+        Names are not case sensitive. The function does not check the cell is inside a spreadsheet.
+
+        Parameters:
+            * cell_name: str or CellRef - a reference is returned as is
+
+        Return Value: CellRef
+
+        Exceptions: CellLocationError if the name is not a valid cell name
+        """
+
+        if isinstance(cell_name, CellRef):
+            return cell_name
+
+        with self.__lock:
+            ref = self.__refs.get(cell_name)
+
+            if ref is not None:
+                self.__refs.move_to_end(cell_name)
+                return ref
+
+        match = self.name_pattern.fullmatch(cell_name)
+        if match is None or int(match.group(2)) < 1:
+            raise CellLocationError("Cell Does not exist")
+
+        col_name = match.group(1).upper()
+        row = int(match.group(2)) - 1
+
+        # Different ways to write the same name share a single reference
+        name = col_name + str(row + 1)
+        col = self.column_index(col_name)
+
+        with self.__lock:
+            ref = self.__refs.get(name) if name != cell_name else None
+            if ref is None:
+                ref = CellRef(row, col, name)
+                self.__cache_ref__(name, ref)
+
+            self.__cache_ref__(cell_name, ref)
+
+        return ref
+
+
+    def __cache_ref__(self, cell_name: str, ref: CellRef) -> None:
+        """
+        Function __cache_ref__
+        An auxiliary function that adds a parsed name to the cache while keeping it in its size limit, called under the lock
+        """
+
+        self.__refs[cell_name] = ref
+        if len(self.__refs) > self.cache_size:
+            self.__refs.popitem(last=False)
+
+
+    def __extend_columns__(self, cols: int) -> None:
+        """
+        Function __extend_columns__
+        An auxiliary function that adds columns to the columns tables, up to the given column index, called under the lock
+        """
+
+        for col in range(len(self.__columns_names), cols + 1):
+
+            # Every column name is the name of the column 26 places before it with one more letter, A-Z are the first ones
+            prefix, remainder = divmod(col - 1, AddressResolver.ALPHBET_LETTERS)
+            name = self.__columns_names[prefix] + chr(AddressResolver.ASCII_A + remainder)
+
+            self.__columns_names.append(name)
+            self.__columns_indexes[name] = col
+
+
+# Resolver shared by all of the spreadsheets, names do not depend on a spreadsheet's size
+ADDRESSES = AddressResolver()
@@ -0,0 +1,61 @@
+from libraries import *
+
+
+class Changeset:
+    """
+    Class Changeset: the cells that changed in one change of a spreadsheet - an edit, a batch, a recalculation or a part of it.
+    Cells are kept by their names, a cell is in values only if the value it shows has actually changed.
+    """
+
+    def __init__(self) -> None:
+
+        # Names of the cells whose shown value, formula or colors changed
+        self.values: Set[str] = set()
+        self.formulas: Set[str] = set()
+        self.styles: Set[str] = set()
+
+        # The whole spreadsheet was replaced (and may have a new size), every cell may have changed
+        self.reset = False
+
+
+    @property
+    def cells(self) -> Set[str]:
+        """
+        Property cells
+        Names of all of the cells that changed in any way
+        """
+        return self.values | self.formulas | self.styles
+
+
+    def __bool__(self) -> bool:
+        return self.reset or bool(self.values or self.formulas or self.styles)
+
+
+class ChangeNotifier:
+    """
+    Class ChangeNotifier: collects the changes of a spreadsheet and calls its observers with them.
+    Used as a context manager around every change - changes can be inside other changes, and the observers are called once,
+    with all of the changes, when the outermost change ends. Changes are collected only while there are observers.
+    """
+
+    def __init__(self) -> None:
+
+        # Functions to call with the changes, the changes collected so far and the amount of changes in progress
+        self.observers: List[Callable[[Changeset], None]] = []
+        self.changes = Changeset()
+        self.depth = 0
+
+
+    def __enter__(self) -> Changeset:
+        self.depth += 1
+        return self.changes
+
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.depth -= 1
+
+        if self.depth == 0 and self.changes:
+            changes, self.changes = self.changes, Changeset()
+
+            for observer in list(self.observers):
+                observer(changes)
@@ -0,0 +1,194 @@
+from libraries import *
+import argparse
+import os
+import sys
+from time import perf_counter
+from spreadsheet import Spreadsheet
+from file_manager import FileManager
+from spreadsheet_types import FileType, ExportType, ImportType
+from spreadsheet_errors import *
+from engine_metrics import EngineMetrics
+
+
+class SpreadsheetCli:
+    """
+    Class SpreadsheetCli: the headless entry point of the spreadsheet engine, it never imports the GUI.
+    Every input file is loaded through the file manager, recalculated and written to its outputs, all of them in the same process.
+
+    Usage:
+        python -m spreadsheet recalc in.json --out out.xlsx
+        python -m spreadsheet recalc a.json b.xlsx --out-dir results --format json xlsx
+        python -m spreadsheet recalc a.json --metrics metrics.prom
+    """
+
+    # Import types of the input files by their extension
+    INPUT_TYPES = {FileType.JSON.value: FileType.JSON, FileType.EXCEL.value: FileType.EXCEL}
+
+    # Output types that can be written with the cells info, the rest are written by values only
+    INFO_TYPES = (FileType.JSON, FileType.YAML, FileType.EXCEL)
+
+    def __init__(self, argv: Optional[List[str]] = None) -> None:
+        self.args = self.handle_args(argv)
+
+        # Metrics of the engine for all of the files, only if they are asked for
+        self.metrics: Optional[EngineMetrics] = EngineMetrics() if self.args.metrics else None
+
+
+    def handle_args(self, argv: Optional[List[str]] = None) -> argparse.Namespace:
+        """
+        Function handle_args
+        The function creates the command line arguments and returns the arguments from the user
+
+        Parameters:
+            * argv: List[str] - optional, by defult the arguments of the process
+
+        Return Value: argparse.Namespace
+        """
+
+        parser = argparse.ArgumentParser(prog='python -m spreadsheet', description='Headless spreadsheet engine')
+        commands = parser.add_subparsers(dest='command', required=True)
+
+        recalc = commands.add_parser('recalc', help='Load files, recalculate them and write the results')
+        recalc.add_argument('inputs', nargs='+', metavar='INPUT', help='json or xlsx files, as exported by the app')
+        recalc.add_argument('--out', metavar='PATH', help='output file of a single input, its type is chosen by its extension')
+        recalc.add_argument('--out-dir', metavar='DIR', help='directory for the outputs of every input, named like the input')
+        recalc.add_argument('--format', nargs='+', default=[], choices=[file_type.value[1:] for file_type in FileType], help='types of the outputs in --out-dir')
+        recalc.add_argument('--values', action='store_true', help='write values only, without formulas and colors')
+        recalc.add_argument('--values-input', action='store_true', help='json inputs are values only files')
+        recalc.add_argument('--sparse', action='store_true', help='keep the values in sparse mode, for big sheets that are mostly empty')
+        recalc.add_argument('--range-index', action='store_true', help='use the prefix sums index for SUM_BY_RANGE and AVERAGE_BY_RANGE')
+        recalc.add_argument('--workers', type=int, default=1, help='processes for recalculating big levels in parallel')
+        recalc.add_argument('--metrics', metavar='PATH', help='write the metrics of the engine to a file, in the Prometheus text format for .prom and as json otherwise')
+
+        args = parser.parse_args(argv)
+
+        if args.out and len(args.inputs) > 1:
+            parser.error('--out can be used with a single input only, use --out-dir for many inputs')
+
+        if args.format and not args.out_dir:
+            parser.error('--format needs --out-dir')
+
+        return args
+
+
+    def run(self) -> int:
+        """
+        Function run
+        Recalculates every input file and prints the timing of every file and of all of them
+
+        Return Value: int - the exit code, 1 if any file could not be handled
+        """
+
+        failed = 0
+        total_cells = 0
+        start = perf_counter()
+
+        for input_path in self.args.inputs:
+            # Any error of a file, including errors of the file formats libraries, fails that file only
+            try:
+                total_cells += self.recalc_file(input_path, self.__outputs__(input_path))
+            except Exception as error:
+                print(f'{input_path}: failed - {type(error).__name__}: {error}', file=sys.stderr)
+                failed += 1
+
+        elapsed = perf_counter() - start
+
+        if self.metrics is not None:
+            self.metrics.dump(self.args.metrics)
+
+        print(f'{len(self.args.inputs) - failed} of {len(self.args.inputs)} files, {total_cells:,} cells in {elapsed:.3f}s '
+              f'({total_cells / elapsed if elapsed else 0:,.0f} cells/s)')
+
+        return 1 if failed else 0
+
+
+    def recalc_file(self, input_path: str, outputs: List[str]) -> int:
+        """
+        Function recalc_file
+        The function loads a file, recalculates all of its formulas, writes its outputs and prints the time of every phase
+
+        Parameters:
+            * input_path: str
+            * outputs: List[str] - paths of the output files
+
+        Return Value: int - the amount of cells that were loaded
+        """
+
+        input_type = SpreadsheetCli.INPUT_TYPES.get(os.path.splitext(input_path)[1])
+        if input_type is None:
+            raise FileTypeError(f"Input must be one of: {', '.join(SpreadsheetCli.INPUT_TYPES)}")
+
+        import_type = ImportType.VALUES_ONLY if self.args.values_input and input_type is FileType.JSON else ImportType.FORMULAS
+
+        spreadsheet = Spreadsheet(sparse=self.args.sparse, range_index=self.args.range_index, workers=self.args.workers)
+        spreadsheet.metrics = self.metrics
+        file_manager = FileManager(spreadsheet)
+
+        # Loading, the loaded cells are evaluated once on the way
+        start = perf_counter()
+        load_errors = file_manager.import_file(input_path, input_type, import_type)
+        load_time = perf_counter() - start
+
+        cells = len(spreadsheet.cells)
+        formulas = sum(1 for cell in spreadsheet.iter_cells() if spreadsheet.is_formula(cell.formula))
+
+        # Recalculating every formula
+        start = perf_counter()
+        errors = spreadsheet.recalculate()
+        recalc_time = perf_counter() - start
+
+        # Writing the outputs
+        start = perf_counter()
+        for output_path in outputs:
+            output_type = self.__output_type__(output_path)
+            export_type = ExportType.INCLUDE_INFO if output_type in SpreadsheetCli.INFO_TYPES and not self.args.values else ExportType.VALUES_ONLY
+            file_manager.export_to_file(output_path, output_type, export_type)
+        write_time = perf_counter() - start
+
+        print(f'{input_path}: {spreadsheet.rows:,}x{spreadsheet.cols:,} sheet, {cells:,} cells, {formulas:,} formulas, '
+              f'{len(set(errors) | set(load_errors)):,} errors  load {load_time:.3f}s ({cells / load_time if load_time else 0:,.0f} cells/s)  '
+              f'recalc {recalc_time:.3f}s ({formulas / recalc_time if recalc_time else 0:,.0f} formulas/s)  '
+              f'write {write_time:.3f}s ({len(outputs)} files)')
+
+        return cells
+
+
+    def __outputs__(self, input_path: str) -> List[str]:
+        """
+        Function __outputs__
+        An auxiliary function that returns the paths of the outputs of an input file
+        """
+
+        if self.args.out:
+            return [self.args.out]
+
+        if not self.args.out_dir:
+            return []
+
+        os.makedirs(self.args.out_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(input_path))[0]
+
+        return [os.path.join(self.args.out_dir, f'{name}.{extension}') for extension in self.args.format or ['json']]
+
+
+    def __output_type__(self, output_path: str) -> FileType:
+        """
+        Function __output_type__
+        An auxiliary function that returns the type of an output file by its extension
+        """
+
+        extension = os.path.splitext(output_path)[1]
+
+        for file_type in FileType:
+            if file_type.value == extension:
+                return file_type
+
+        raise FileTypeError(f"Output must be one of: {', '.join(file_type.value for file_type in FileType)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return SpreadsheetCli(argv).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
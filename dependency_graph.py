@@ -0,0 +1,283 @@
+from libraries import *
+from spreadsheet_errors import *
+from cell import Cell
+from cell_address import ADDRESSES
+
+
+class DependencyGraph:
+    """
+    Class DependencyGraph: the precedents and dependents of every cell in a spreadsheet.
+    A cell's precedents are the cells its formula refers to, its dependents are the cells whose formulas refer to it.
+    Dependents are stored in the cells themselves, ranges (for example SUM_BY_RANGE(A1, B10)) are stored per block of cells
+    so a range dependency costs about the same no matter how many cells it covers, and a cell is checked only against the ranges of its blocks.
+    """
+
+    # Sizes (rows, cols) of the blocks ranges are stored by, small ranges are stored by small blocks and large ranges by large blocks
+    BLOCKS_SIZES = ((64, 8), (4096, 128))
+
+    # Most blocks a range is stored by, unless it is larger than that even in the largest blocks
+    MAX_RANGE_BLOCKS = 64
+
+    # Graph traversal states
+    __UNVISITED = 0
+    __VISITING = 1
+    __VISITED = 2
+
+    def __init__(self, get_cell: Callable[[str], Cell], find_cell: Callable[[int], Optional[Cell]]) -> None:
+
+        # Function that returns a cell object by its name, and function that returns an existing cell object by its position or None
+        self.get_cell = get_cell
+        self.find_cell = find_cell
+
+        # Cells names each formula refers to, and ranges as (start row, stop row, start col, stop col) in cells indexes
+        self.__precedents: Dict[str, Tuple[str, ...]] = {}
+        self.__ranges: Dict[str, Tuple[Tuple[int, int, int, int], ...]] = {}
+
+        # Block (blocks size index, row // block rows, col // block cols) -> cells that have a range over that block -> their ranges over the block
+        self.__range_dependents: Dict[Tuple[int, int, int], Dict[str, List[Tuple[int, int, int, int]]]] = {}
+
+
+    def get_precedents(self, cell_name: str) -> Tuple[str, ...]:
+        """
+        Function get_precedents
+        Returns the names of the cells that the given cell's formula refers to directly, not including ranges
+        """
+        return self.__precedents.get(cell_name, ())
+
+
+    def get_ranges(self, cell_name: str) -> Tuple[Tuple[int, int, int, int], ...]:
+        """
+        Function get_ranges
+        Returns the ranges that the given cell's formula refers to, as (start row, stop row, start col, stop col)
+        """
+        return self.__ranges.get(cell_name, ())
+
+
+    def set_precedents(self, cell_name: str, references: Iterable[str] = (), ranges: Iterable[Tuple[int, int, int, int]] = ()) -> None:
+        """
+        Function set_precedents
+        The function replaces the precedents of a cell. Edges to cells the formula does not refer to anymore are removed.
+
+        Parameters:
+            * cell_name: str
+            * references: Iterable[str] - names of the cells the formula refers to
+            * ranges: Iterable of (start row, stop row, start col, stop col) - ranges the formula refers to
+
+        Return Value: None
+        """
+
+        references = tuple(dict.fromkeys(references))
+        ranges = tuple(ranges)
+
+        old_references = self.__precedents.pop(cell_name, ())
+
+        # Removing edges that are not needed anymore and adding the new ones
+        for reference in old_references:
+            if reference not in references:
+                self.get_cell(reference).remove_dependent_cell(cell_name)
+
+        for reference in references:
+            self.get_cell(reference).add_dependent_cell(cell_name)
+
+        if references:
+            self.__precedents[cell_name] = references
+
+        # Replacing ranges
+        for rng in self.__ranges.pop(cell_name, ()):
+            for block in self.__blocks__(rng):
+                block_dependents = self.__range_dependents.get(block)
+
+                if block_dependents is not None:
+                    block_dependents.pop(cell_name, None)
+                    if not block_dependents:
+                        del self.__range_dependents[block]
+
+        ranges = tuple(rng for rng in ranges if rng[0] <= rng[1] and rng[2] <= rng[3])
+
+        for rng in ranges:
+            for block in self.__blocks__(rng):
+                self.__range_dependents.setdefault(block, {}).setdefault(cell_name, []).append(rng)
+
+        if ranges:
+            self.__ranges[cell_name] = ranges
+
+
+    def get_dependents(self, cell_name: str) -> List[str]:
+        """
+        Function get_dependents
+        Returns the names of the cells that depend directly on the given cell, by reference or by range
+
+        Parameters:
+            * cell_name: str
+
+        Return Value: List[str]
+        """
+
+        # Reading only, a cell that was never used has no dependents by reference and is not created
+        ref = ADDRESSES.parse(cell_name)
+        cell = self.find_cell(ref.position)
+        dependents = cell.get_dependent_cell() if cell is not None else []
+
+        # Adding cells that have a range that contains the cell
+        for dependent in self.get_range_dependents(ref.row, ref.col):
+            if cell is None or not cell.has_dependent_cell(dependent):
+                dependents.append(dependent)
+
+        return dependents
+
+
+    def get_range_dependents(self, row: int, col: int) -> List[str]:
+        """
+        Function get_range_dependents
+        Returns the names of the cells that have a range that contains the given location. Only the ranges over the location's block are checked.
+
+        Parameters:
+            * row: int - row index, from 0
+            * col: int - column index, from 1
+
+        Return Value: List[str]
+        """
+
+        # A cell with ranges of different sizes can be found in more than one block
+        dependents: Dict[str, None] = {}
+
+        for size, (block_rows, block_cols) in enumerate(DependencyGraph.BLOCKS_SIZES):
+            block_dependents = self.__range_dependents.get((size, row // block_rows, col // block_cols))
+
+            if block_dependents:
+                dependents.update((dependent, None) for dependent, ranges in block_dependents.items()
+                                  if any(start_row <= row <= stop_row and start_col <= col <= stop_col for start_row, stop_row, start_col, stop_col in ranges))
+
+        return list(dependents)
+
+
+    @staticmethod
+    def __blocks__(rng: Tuple[int, int, int, int]) -> List[Tuple[int, int, int]]:
+        """
+        Function __blocks__
+        An auxiliary function that returns the blocks a range (start row, stop row, start col, stop col) is stored by -
+        the smallest blocks that cover it with no more than MAX_RANGE_BLOCKS blocks, or the largest blocks
+        """
+
+        start_row, stop_row, start_col, stop_col = rng
+
+        for size, (block_rows, block_cols) in enumerate(DependencyGraph.BLOCKS_SIZES):
+            rows_blocks = range(start_row // block_rows, stop_row // block_rows + 1)
+            cols_blocks = range(start_col // block_cols, stop_col // block_cols + 1)
+
+            if len(rows_blocks) * len(cols_blocks) <= DependencyGraph.MAX_RANGE_BLOCKS or size == len(DependencyGraph.BLOCKS_SIZES) - 1:
+                return [(size, row_block, col_block) for row_block in rows_blocks for col_block in cols_blocks]
+
+        return []
+
+
+    def get_recalc_order(self, cells_names: Iterable[str]) -> List[str]:
+        """
+        Function get_recalc_order
+        The function returns the given cells and all the cells that depend on them (directly or not) in topological order,
+        so every cell comes after all of the cells it depends on and appears only once.
+
+        Parameters:
+            * cells_names: Iterable[str]
+
+        Return Value: List[str]
+
+        Exceptions: CircularReferenceError if the cells depend on each other in a circle
+        """
+
+        order, circle = self.topological_sort(cells_names)
+
+        if circle:
+            raise CircularReferenceError(f"Circular Reference at cell: {circle[0]}")
+
+        return order
+
+
+    def find_circle(self, cells_names: Iterable[str]) -> List[str]:
+        """
+        Function find_circle
+        The function looks for a circle among the given cells and all the cells that depend on them
+
+        Parameters:
+            * cells_names: Iterable[str]
+
+        Return Value: List[str] - the cells of the first circle that was found, each one depends on the one before it. Empty if there is none.
+        """
+        return self.topological_sort(cells_names)[1]
+
+
+    def get_recalc_levels(self, order: List[str]) -> List[List[str]]:
+        """
+        Function get_recalc_levels
+        The function groups the cells of a recalculation order into levels - every cell depends only on cells of the levels before it,
+        so the cells of a level can be evaluated in any order, or at the same time.
+
+        Parameters:
+            * order: List[str] - cells in topological order, as returned by get_recalc_order
+
+        Return Value: List[List[str]] - the levels by their order, cells keep their order inside a level
+        """
+
+        cells_levels = dict.fromkeys(order, 0)
+        levels: List[List[str]] = []
+
+        for cell_name in order:
+            level = cells_levels[cell_name]
+
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(cell_name)
+
+            # Cells come after all of the cells they depend on, so a cell's level is final once it is reached
+            for dependent in self.get_dependents(cell_name):
+                if cells_levels.get(dependent, level + 1) <= level:
+                    cells_levels[dependent] = level + 1
+
+        return levels
+
+
+    def topological_sort(self, cells_names: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Function topological_sort
+        The function goes over the given cells and all the cells that depend on them, and stops at the first circle
+
+        Parameters:
+            * cells_names: Iterable[str]
+
+        Return Value: Tuple of the cells in topological order, and the cells of the circle that was found (empty if there is none)
+        """
+
+        state: Dict[str, int] = {}
+        post_order: List[str] = []
+
+        for root in cells_names:
+            if state.get(root, DependencyGraph.__UNVISITED) != DependencyGraph.__UNVISITED:
+                continue
+
+            # Iterative depth first search, every stack item is a cell and an iterator over its dependents
+            state[root] = DependencyGraph.__VISITING
+            stack = [(root, iter(self.get_dependents(root)))]
+
+            while stack:
+                cell_name, dependents = stack[-1]
+                next_cell = next(dependents, None)
+
+                if next_cell is None:
+                    stack.pop()
+                    state[cell_name] = DependencyGraph.__VISITED
+                    post_order.append(cell_name)
+                    continue
+
+                next_state = state.get(next_cell, DependencyGraph.__UNVISITED)
+
+                # The cells on the stack from the next cell and on are a circle
+                if next_state == DependencyGraph.__VISITING:
+                    names = [name for name, _ in stack]
+                    return post_order, names[names.index(next_cell):]
+
+                if next_state == DependencyGraph.__UNVISITED:
+                    state[next_cell] = DependencyGraph.__VISITING
+                    stack.append((next_cell, iter(self.get_dependents(next_cell))))
+
+        post_order.reverse()
+        return post_order, []
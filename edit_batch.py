@@ -0,0 +1,43 @@
+from libraries import *
+from spreadsheet_errors import *
+
+
+class EditBatch:
+    """
+    Class EditBatch: the cells that were edited in a batch of edits, and the errors that occured.
+    Cells of a batch are written at once, and recalculated together in dependency order when the batch ends.
+    """
+
+    def __init__(self, keep_formulas: bool = False) -> None:
+        """
+        Parameters:
+            * keep_formulas: bool - by defult False, an edited cell that fails is set to the error like edit_cell does.
+                             True when a sheet is loaded - a cell that fails keeps its formula and only its value is the error,
+                             like a cell that depends on an edited cell, so the formula can recover later
+        """
+
+        self.keep_formulas = keep_formulas
+
+        # Names of the edited cells by the order they were first edited, values are not used
+        self.cells: Dict[str, None] = {}
+
+        # Cell name -> the error its value has after the batch, for edited cells and the cells that depend on them
+        self.errors: Dict[str, SpreadsheetError] = {}
+
+
+    def add_cell(self, cell_name: str) -> None:
+        """
+        Function add_cell
+        Marks a cell as edited in the batch, an error from an earlier edit of the cell does not count anymore
+        """
+
+        self.cells[cell_name] = None
+        self.errors.pop(cell_name, None)
+
+
+    def add_error(self, cell_name: str, error: SpreadsheetError) -> None:
+        """
+        Function add_error
+        Keeps the error that occured in a cell
+        """
+        self.errors[cell_name] = error
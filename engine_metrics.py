@@ -0,0 +1,258 @@
+from libraries import *
+from bisect import bisect_left
+
+
+class Counter:
+    """
+    Class Counter: a value that only goes up, for example the amount of errors. Every value of the metric's label has its own count.
+    """
+
+    TYPE = 'counter'
+
+    def __init__(self, name: str, help: str, label: Optional[str] = None) -> None:
+        """
+        Parameters:
+            * name: str - name of the metric
+            * help: str - description of the metric
+            * label: str - optional, name of the label the counts are split by
+        """
+
+        self.name = name
+        self.help = help
+        self.label = label
+
+        # Label value -> count, '' when there is no label
+        self.values: Dict[str, float] = {}
+
+
+    def inc(self, amount: float = 1, label: str = '') -> None:
+        """
+        Function inc
+        Adds an amount to the count of a label's value
+        """
+        self.values[label] = self.values.get(label, 0) + amount
+
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Function snapshot
+        Returns the counts by the label's values
+        """
+        return dict(self.values)
+
+
+class Histogram:
+    """
+    Class Histogram: the distribution of measurements, for example latency in seconds. Measurements are counted in buckets by their
+    upper bounds, like Prometheus histograms, and their sum and amount are kept. Every value of the metric's label has its own buckets.
+    """
+
+    TYPE = 'histogram'
+
+    # Bounds for latency in seconds
+    SECONDS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = SECONDS_BUCKETS, label: Optional[str] = None) -> None:
+        """
+        Parameters:
+            * name: str - name of the metric
+            * help: str - description of the metric
+            * buckets: Iterable[float] - upper bounds of the buckets, a last bucket for bigger measurements is added
+            * label: str - optional, name of the label the measurements are split by
+        """
+
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+
+        # Label value -> [counts of the buckets without accumulating them, sum, amount of measurements]
+        self.series: Dict[str, List[Any]] = {}
+
+
+    def observe(self, value: float, label: str = '') -> None:
+        """
+        Function observe
+        Adds a measurement, it is counted in the first bucket its upper bound is not smaller than the value
+        """
+
+        series = self.series.get(label)
+        if series is None:
+            series = self.series[label] = [[0] * (len(self.buckets) + 1), 0, 0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Function snapshot
+        Returns the measurements by the label's values - their amount, their sum, and the amount of measurements up to every bound
+
+        Return Value: Dict[str, Dict] - label's value -> {'count': int, 'sum': float, 'buckets': {bound: int, ..., '+Inf': int}}
+        """
+
+        snapshot = {}
+
+        for label, (counts, total, count) in self.series.items():
+            cumulative = 0
+            buckets = {}
+
+            for bound, bucket_count in zip([*map(str, self.buckets), '+Inf'], counts):
+                cumulative += bucket_count
+                buckets[bound] = cumulative
+
+            snapshot[label] = {'count': count, 'sum': total, 'buckets': buckets}
+
+        return snapshot
+
+
+class MetricsRegistry:
+    """
+    Class MetricsRegistry: a group of metrics, that can be read as a dictionary, written as json or in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+
+        # Metrics by their names, by the order they were added
+        self.metrics: Dict[str, Union[Counter, Histogram]] = {}
+
+
+    def counter(self, name: str, help: str, label: Optional[str] = None) -> Counter:
+        """
+        Function counter
+        Adds a counter to the registry and returns it
+        """
+        return self.__register__(Counter(name, help, label))
+
+
+    def histogram(self, name: str, help: str, buckets: Iterable[float] = Histogram.SECONDS_BUCKETS, label: Optional[str] = None) -> Histogram:
+        """
+        Function histogram
+        Adds a histogram to the registry and returns it
+        """
+        return self.__register__(Histogram(name, help, buckets, label))
+
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Function snapshot
+        Returns all of the metrics as a dictionary
+
+        Return Value: Dict - metric's name -> {'type': str, 'help': str, 'label': str or None, 'values': the metric's snapshot}
+        """
+        return {name: {'type': metric.TYPE, 'help': metric.help, 'label': metric.label, 'values': metric.snapshot()} for name, metric in self.metrics.items()}
+
+
+    def to_json(self) -> str:
+        """
+        Function to_json
+        Returns all of the metrics as a json string, see snapshot
+        """
+        return json.dumps(self.snapshot(), indent=4)
+
+
+    def to_prometheus(self) -> str:
+        """
+        Function to_prometheus
+        Returns all of the metrics in the Prometheus text exposition format
+        """
+
+        lines = []
+
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+
+            if isinstance(metric, Counter):
+                for label, value in metric.values.items():
+                    lines.append(f'{metric.name}{self.__labels__(metric, label)} {self.__number__(value)}')
+                continue
+
+            for label, values in metric.snapshot().items():
+                for bound, count in values['buckets'].items():
+                    lines.append(f'{metric.name}_bucket{self.__labels__(metric, label, le=bound)} {count}')
+
+                lines.append(f"{metric.name}_sum{self.__labels__(metric, label)} {self.__number__(values['sum'])}")
+                lines.append(f"{metric.name}_count{self.__labels__(metric, label)} {values['count']}")
+
+        return '\n'.join(lines) + '\n'
+
+
+    def dump(self, path: str) -> None:
+        """
+        Function dump
+        Writes all of the metrics to a file - in the Prometheus text format if its extension is .prom or .txt, as json otherwise
+
+        Parameters:
+            * path: str
+        """
+
+        with open(path, 'w') as file:
+            file.write(self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json())
+
+
+    def __register__(self, metric: Union[Counter, Histogram]) -> Union[Counter, Histogram]:
+        """
+        Function __register__
+        An auxiliary function that adds a metric to the registry, names of metrics are unique
+        """
+
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} already exists')
+
+        self.metrics[metric.name] = metric
+        return metric
+
+
+    def __number__(self, value: float) -> str:
+        """
+        Function __number__
+        An auxiliary function that writes a sample's value without losing precision, whole numbers without a fraction
+        """
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+    def __labels__(self, metric: Union[Counter, Histogram], label: str, **more: str) -> str:
+        """
+        Function __labels__
+        An auxiliary function that returns the labels of a sample in the Prometheus format, {name="value",...} or nothing
+        """
+
+        labels = dict({metric.label: label} if metric.label else {}, **more)
+
+        if not labels:
+            return ''
+
+        escaped = (f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"' for name, value in labels.items())
+        return '{' + ','.join(escaped) + '}'
+
+
+class EngineMetrics(MetricsRegistry):
+    """
+    Class EngineMetrics: the metrics of a spreadsheet's calculation engine.
+        * edits - edits by their kind: edit_cell, batch (and edit_cells), staged (edits of the background scheduler) and recalculate
+        * edit seconds - time of every edit by its kind, including the evaluation of every cell that depends on it (except for staged edits)
+        * propagation cells - cells evaluated by every propagation - the cells that depend on an edited cell, the cells of a batch
+          and their dependents, a full recalculation or a part of the background scheduler's recalculation
+        * propagation depth - levels of every propagation, the longest chain of cells that depend on each other in it
+        * errors - errors set to cells, by their type
+        * range function seconds - time of every range function call by the function, in this process only
+    """
+
+    # Bounds for amounts of cells and for depths
+    CELLS_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+    DEPTH_BUCKETS = (1, 2, 5, 10, 100, 1_000, 10_000, 100_000)
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.edits = self.counter('spreadsheet_edits_total', 'Edits of the spreadsheet', label='kind')
+        self.edit_seconds = self.histogram('spreadsheet_edit_seconds', 'Time of every edit with the cells that depend on it', label='kind')
+        self.propagation_cells = self.histogram('spreadsheet_propagation_cells', 'Cells evaluated by every propagation of changes',
+                                                EngineMetrics.CELLS_BUCKETS)
+        self.propagation_depth = self.histogram('spreadsheet_propagation_depth', 'Levels of cells that depend on each other in every propagation',
+                                                EngineMetrics.DEPTH_BUCKETS)
+        self.errors = self.counter('spreadsheet_errors_total', 'Errors set to cells', label='type')
+        self.range_seconds = self.histogram('spreadsheet_range_function_seconds', 'Time of every range function call', label='function')
@@ -0,0 +1,60 @@
+from libraries import *
+from spreadsheet_errors import *
+from threading import Event
+from contextlib import nullcontext
+
+
+class FileJob:
+    """
+    Class FileJob: progress and cancellation of an import or an export, which usually runs on another thread.
+    The file manager reports its steps to the job, and stops with FileJobCancelledError at the next step once the job is cancelled.
+    """
+
+    # Items (cells or rows) handled between progress reports, and between releases of the lock
+    STEP = 1000
+
+    def __init__(self, progress: Optional[Callable[[str, int, int], None]] = None, lock: Optional[Any] = None) -> None:
+        """
+        Parameters:
+            * progress: Callable(stage, done, total) - called on the job's thread every STEP items of a stage and when it is done
+            * lock: optional, held while the current spreadsheet is read, so it is not changed in the middle of a read
+        """
+
+        self.progress = progress
+        self.lock = lock
+        self.cancelled = Event()
+
+
+    def cancel(self) -> None:
+        """
+        Function cancel
+        Asks the job to stop, it can be called from any thread
+        """
+        self.cancelled.set()
+
+
+    def step(self, stage: str, done: int, total: int) -> None:
+        """
+        Function step
+        Marks the progress of a stage of the job
+
+        Parameters:
+            * stage: str - what is being done, for example 'Importing cells'
+            * done, total: int - items done so far out of all of the stage's items
+
+        Exceptions: FileJobCancelledError if the job was cancelled
+        """
+
+        if self.cancelled.is_set():
+            raise FileJobCancelledError("The file job was cancelled")
+
+        if self.progress is not None and (done % FileJob.STEP == 0 or done == total):
+            self.progress(stage, done, total)
+
+
+    def reading(self) -> Any:
+        """
+        Function reading
+        Returns a context manager that holds the lock while the current spreadsheet is read
+        """
+        return self.lock if self.lock is not None else nullcontext()
@@ -1,16 +1,12 @@
 from libraries import *
 from spreadsheet import Spreadsheet
 from cell import Cell
-from fpdf import FPDF
-from tabulate import tabulate
 
 from spreadsheet_types import FileType, ExportType, ImportType
 from spreadsheet_errors import *
+from file_job import FileJob
 from copy import deepcopy
 
-import openpyxl
-from openpyxl.worksheet.worksheet import Worksheet
-
 
 
 class FileManager:
@@ -21,19 +17,25 @@ class FileManager:
         self.spreadsheet = spreadsheet
 
 
-    def export_to_file(self, file_name: str, file_type: FileType, mode: ExportType) -> None:
+    def export_to_file(self, file_name: str, file_type: FileType, mode: ExportType, job: Optional[FileJob] = None) -> None:
         """
         Function export_to_file
-        The function handles the exporting of the current spreadsheet to an external file
+        The function handles the exporting of the current spreadsheet to an external file.
+        The spreadsheet is read in steps, holding the job's lock for every step.
 
         Parameters:
             * file_name: str
             * file_type: FileType - can be JSON, YAML, EXCEL, CSV, PDF.
             * mode: ExportType - can be FORMULAS, VALUES_ONLY
+            * job: FileJob - optional, progress and cancellation of the export
 
         Return Value: None
+
+        Exceptions: FileJobCancelledError if the job was cancelled, nothing is written then
         """
 
+        job = job if job is not None else FileJob()
+
         # Gettoing extension of the file - filetype
         splitted_name = file_name.split('.')
         extension = '.'+splitted_name[-1].strip()
@@ -62,37 +64,69 @@ class FileManager:
                 raise FileTypeError("File type can export values only, no cells info")
 
             # Export in order to reload - info export
-            info_dict = {"rows": self.spreadsheet.rows, "cols": self.spreadsheet.cols, "cells": []}
+            with job.reading():
+                info_dict = {"rows": self.spreadsheet.rows, "cols": self.spreadsheet.cols, "cells": []}
+                cells = list(self.spreadsheet.iter_cells())
+
+            # Creating info dict, cells are read a step at a time
+            for start in range(0, len(cells), FileJob.STEP):
+                job.step('Collecting cells', start, len(cells))
 
-            # Creating info dict
-            for row in self.spreadsheet.cells_objs:
-                for cell in row:
-                    info = cell.get_info()
-                    info_dict["cells"].append(deepcopy(info))
+                with job.reading():
+                    info_dict["cells"].extend(cell.get_info() for cell in cells[start:start + FileJob.STEP])
+
+            job.step('Collecting cells', len(cells), len(cells))
 
             # Exporting
             export_function(file_name, info=info_dict)
 
         elif mode is ExportType.VALUES_ONLY:
             # Exporting values only
-            export_function(file_name)
+            export_function(file_name, values=self.__values_df__(job))
         
         else:
             raise ExportTypeError("No such exporting exist")
 
 
-    def import_file(self, file_name: str, file_type: FileType, mode: ExportType) -> None:
+    def import_file(self, file_name: str, file_type: FileType, mode: ExportType, job: Optional[FileJob] = None) -> Dict[str, SpreadsheetError]:
         """
-        Function export_to_file
-        The function handles the exporting of the current spreadsheet to an external file
+        Function import_file
+        The function imports a file into the current spreadsheet. The file is loaded into a staging spreadsheet first,
+        so the current spreadsheet is not changed if the import fails or is cancelled.
 
         Parameters:
             * file_name: str
-            * file_type: FileType - can be JSON, YAML, EXCEL, CSV, PDF.
+            * file_type: FileType - can be JSON, EXCEL.
             * mode: ExportType - can be FORMULAS, VALUES_ONLY
+            * job: FileJob - optional, progress and cancellation of the import
 
-        Return Value: None
+        Return Value: Dict[str, SpreadsheetError] - errors of cells that could not be evaluated, by the cells names
+        """
+
+        staging, errors = self.load_file(file_name, file_type, mode, job)
+        self.spreadsheet.load_sheet(staging)
+
+        return errors
+
+
+    def load_file(self, file_name: str, file_type: FileType, mode: ExportType, job: Optional[FileJob] = None) -> Tuple[Spreadsheet, Dict[str, SpreadsheetError]]:
         """
+        Function load_file
+        The function loads a file into a new staging spreadsheet, with the same storage options as the current one.
+        The current spreadsheet is not read nor changed, so the file can be loaded on another thread.
+
+        Parameters:
+            * file_name: str
+            * file_type: FileType - can be JSON, EXCEL.
+            * mode: ExportType - can be FORMULAS, VALUES_ONLY
+            * job: FileJob - optional, progress and cancellation of the import
+
+        Return Value: Tuple of the staging spreadsheet and the errors of cells that could not be evaluated, by the cells names
+
+        Exceptions: FileJobCancelledError if the job was cancelled
+        """
+
+        job = job if job is not None else FileJob()
 
         # Gettoing extension of the file - filetype
         splitted_name = file_name.split('.')
@@ -113,7 +147,10 @@ class FileManager:
 
         # Getting needed function
         import_func = import_functions[file_type]
-        data = import_func(file_name, mode)
+        data = import_func(file_name, mode, job)
+
+        # Cells are evaluated together once all of them are loaded, errors of cells do not stop the import and cells that fail keep their formulas
+        errors: Dict[str, SpreadsheetError] = {}
 
         if isinstance(data, Dict):
             try:
@@ -122,54 +159,108 @@ class FileManager:
                 rows = data['rows']
                 cols = data['cols']
 
-                self.spreadsheet.reset_sheet(rows, cols)
+                staging = self.__staging_sheet__(rows, cols)
+                formulas = {}
+
+                # Colors are set right away, formulas are evaluated together once all of them are loaded
+                for i, cell in enumerate(cells):
+                    job.step('Importing cells', i, len(cells))
 
-                for cell in cells:
                     index = cell['index']
-                    curr_cell = self.spreadsheet.__get_cell_by_name__(cell['name'])
+                    ref = staging.cell_ref(cell['name'])
 
-                    if curr_cell.index == index:
-                        curr_cell.set_design(bg=cell['bg color'], fg=cell['fg color'])
-                        self.spreadsheet.edit_cell(cell['name'], cell['formula'])
+                    if [ref.row, ref.col] == index:
+                        staging.set_cell_design(ref, bg=cell['bg color'], fg=cell['fg color'])
+                        formulas[ref] = cell['formula']
                     else:
-                        self.spreadsheet.undo_reset()
                         raise FileFormatError("File is formatted incorrectly, index must be matched to cell's name. No file loaded.")
 
+                job.step('Importing cells', len(cells), len(cells))
+
+            except FileJobCancelledError as error:
+                raise error
+
             except Exception as e:
-                self.spreadsheet.undo_reset()
                 raise FileFormatError("File Not formatted correctly, should be: {'rows': int, 'cols': int, 'cells': [Dicts of information per cell]}")
-        elif isinstance(data, List):
+
+            errors = staging.edit_cells(formulas, keep_formulas=True)
+
+        else:
             
             rows: int = data[0]
             cols: int = data[1]
             cells: Dict[str, Dict[str, str]] = data[2]
             
-            self.spreadsheet.reset_sheet(rows, cols)
-            
-            for col in cells.keys():                
-                for row, value in cells[col].items():                    
-                    cell_id = col+row
-                    new_val = value
+            staging = self.__staging_sheet__(rows, cols)
+            values = {}
+
+            for i, col in enumerate(cells.keys()):
+                job.step('Importing columns', i, len(cells))
+                values.update((staging.cell_ref(col+row), value) for row, value in cells[col].items())
+
+            job.step('Importing columns', len(cells), len(cells))
+
+            errors = staging.edit_cells(values, keep_formulas=True)
+
+        return staging, errors
+
+
+    def __staging_sheet__(self, rows: int, cols: int) -> Spreadsheet:
+        """
+        Function __staging_sheet__
+        An auxiliary function that creates an empty spreadsheet to load a file into, with the storage options of the current spreadsheet.
+        The staging spreadsheet shares the metrics of the current spreadsheet, so loading the file is measured in them.
+        """
+        staging = Spreadsheet(rows, cols, sparse=self.spreadsheet.sparse, range_index=self.spreadsheet.use_range_index, workers=self.spreadsheet.parallel_recalc.workers)
+        staging.metrics = self.spreadsheet.metrics
+
+        return staging
+
 
-                    try:
-                        self.spreadsheet.edit_cell(cell_id, new_val)
-                    except SpreadsheetError as error:
-                        self.spreadsheet.undo_reset()
-                        raise error
+    def __values_df__(self, job: FileJob) -> 'pd.DataFrame':
+        """
+        Function __values_df__
+        An auxiliary function that reads the values of the spreadsheet as they are shown, a step of rows at a time
 
+        Parameters:
+            * job: FileJob
 
-    def __export_to_json__(self, file_name: str, info={}) -> None:
+        Return Value: pd.DataFrame - like Spreadsheet.cells_df
+        """
+
+        with job.reading():
+            rows, cols = self.spreadsheet.rows, self.spreadsheet.cols
+            columns_names = self.spreadsheet.columns_names
+
+        blocks = []
+        for start in range(0, rows, FileJob.STEP):
+            job.step('Collecting rows', start, rows)
+
+            with job.reading():
+                blocks.append(self.spreadsheet.values.text_block(start, min(start + FileJob.STEP, rows), 0, cols))
+
+        job.step('Collecting rows', rows, rows)
+
+        values_df = pd.DataFrame(np.concatenate(blocks) if blocks else None, index=[str(i + 1) for i in range(rows)], columns=columns_names)
+        values_df.index.name = 'Row'
+        values_df.columns.name = 'Column'
+
+        return values_df
+
+
+    def __export_to_json__(self, file_name: str, info={}, values: Optional['pd.DataFrame'] = None) -> None:
         """
         Exports current spreadsheet to json file
 
         parameters:
             * file_name: str
             * info: dict, optional and just in case file being exported with info
+            * values: pd.DataFrame, the values to export if there is no info
         """
 
         if not info:
             # No formulas
-            self.spreadsheet.cells_df.to_json(file_name)
+            values.to_json(file_name)
 
         else:
             # Including formulas and values
@@ -177,18 +268,19 @@ class FileManager:
                 json.dump(info, json_file, indent=2)
 
 
-    def __export_to_yaml__(self, file_name: str, info={}) -> None:
+    def __export_to_yaml__(self, file_name: str, info={}, values: Optional['pd.DataFrame'] = None) -> None:
         """
         Exports current spreadsheet to yaml file
 
         parameters:
             * file_name: str
             * info: dict, optional and just in case file being exported with info
+            * values: pd.DataFrame, the values to export if there is no info
         """
 
         if not info:
             # Writing values only
-            df_dict = self.spreadsheet.cells_df.to_dict()
+            df_dict = values.to_dict()
             with open(file_name, 'w') as yaml_file:
                 yaml.dump(df_dict, yaml_file, default_flow_style=False)
         
@@ -198,13 +290,14 @@ class FileManager:
                 yaml.dump(info, yaml_file, default_flow_style=False)
 
 
-    def __export_to_excel__(self, file_name: str, info={}) -> None:
+    def __export_to_excel__(self, file_name: str, info={}, values: Optional['pd.DataFrame'] = None) -> None:
         """
         Exports current spreadsheet to excel file
 
         parameters:
             * file_name: str
             * info: dict, optional and just in case file being exported with info
+            * values: pd.DataFrame, the values to export if there is no info
         """
         
         if info:
@@ -212,7 +305,7 @@ class FileManager:
             cells: List[Dict] = info["cells"]
 
             # Creating new excel file
-            workbook = Workbook(file_name)
+            workbook = xlsxwriter.Workbook(file_name)
             worksheet = workbook.add_worksheet("sheet1")
 
             
@@ -234,15 +327,20 @@ class FileManager:
 
                 self.__value_to_excel__(worksheet, row, col, cell, format_with_color)
 
+            # Only used cells are exported, an empty formatted cell at the last row and column keeps the size of the spreadsheet
+            last_row, last_col = info['rows'] - 1, info['cols']
+            if not any(cell['index'] == [last_row, last_col] for cell in cells):
+                worksheet.write_blank(last_row, last_col - 1, None, workbook.add_format())
+
             # Closing file
             workbook.close()
 
         else:
             # Coping values only
-            self.spreadsheet.cells_df.to_excel(file_name, index=False, header=False)
+            values.to_excel(file_name, index=False, header=False)
 
 
-    def __value_to_excel__(self, worksheet: Workbook.worksheet_class, row, col, cell_info: Dict, cell_format) -> str:        
+    def __value_to_excel__(self, worksheet: 'xlsxwriter.worksheet.Worksheet', row, col, cell_info: Dict, cell_format) -> str:        
         """
         Function __value_to_excel__
         An auxiliary function that writes the cell's value to the excel sheet
@@ -266,32 +364,34 @@ class FileManager:
             worksheet.write(row, col - 1, value, cell_format)
 
 
-    def __export_to_csv__(self, file_name: str) -> None:
+    def __export_to_csv__(self, file_name: str, values: 'pd.DataFrame') -> None:
         """
         Exports current spreadsheet to csv file - only by values, not by cell info
 
         parameters:
             * file_name: str
+            * values: pd.DataFrame
         """
 
-        self.spreadsheet.cells_df.to_csv(file_name)
+        values.to_csv(file_name)
 
 
-    def __export_to_pdf__(self, file_name: str) -> None:
+    def __export_to_pdf__(self, file_name: str, values: 'pd.DataFrame') -> None:
         """
         Exports current spreadsheet to pdf file - only by values, no cell info
 
         parameters:
             * file_name: str
+            * values: pd.DataFrame
         """
 
-        df = self.spreadsheet.cells_df
+        df = values
 
         # Convert DataFrame to a formatted table
-        table = tabulate(df, headers='keys', tablefmt='grid')
+        table = tabulate.tabulate(df, headers='keys', tablefmt='grid')
 
         # Create PDF file
-        pdf = FPDF()
+        pdf = fpdf.FPDF()
         pdf.add_page()
         pdf.set_font('Arial', size=12)
 
@@ -303,7 +403,7 @@ class FileManager:
         pdf.output(file_name)
     
 
-    def __import_from_json__(self, filename: str, mode: ImportType) -> Union[Dict, List]:
+    def __import_from_json__(self, filename: str, mode: ImportType, job: Optional[FileJob] = None) -> Union[Dict, List]:
         """
         Function __import_from_json__
         Imports from json file information based on the import type the user rquests.
@@ -311,6 +411,7 @@ class FileManager:
         Parameters:
             * filename: str
             * mode - FORMULAS for full info or VALUES ONLY
+            * job: FileJob - optional, not used - the file is read at once
         
         Return value: or a dict with all of the information, or a List of cells and their values
         """
@@ -357,7 +458,7 @@ class FileManager:
             raise ImportTypeError('Import type used does not exist')
 
 
-    def __import_from_excel__(self, filename: str, mode: ImportType) -> Dict:
+    def __import_from_excel__(self, filename: str, mode: ImportType, job: Optional[FileJob] = None) -> Dict:
         """
         Function __import_from_excel__
         Imports from excel file information, not including colors, but including all formulas
@@ -365,6 +466,7 @@ class FileManager:
         Parameters:
             * filename: str
             * mode - FORMULAS for full info Only. cannot accept any other type
+            * job: FileJob - optional, progress and cancellation of reading the rows
         
         Return value: or a dict with all of the information, or a List of cells and their values
         """
@@ -380,7 +482,7 @@ class FileManager:
         
 
         # Getting info for dictionary
-        worksheet: Worksheet = workbook.active
+        worksheet: 'openpyxl.worksheet.worksheet.Worksheet' = workbook.active
         total_rows = worksheet.max_row
         total_cols = worksheet.max_column
 
@@ -388,13 +490,16 @@ class FileManager:
         info_dict = {'rows': total_rows, 'cols': total_cols, 'cells': []}
         dict_fill = False
 
+        job = job if job is not None else FileJob()
+
         # Getting cells information from the excel file
-        for row in worksheet.iter_rows(values_only=False):
+        for row_number, row in enumerate(worksheet.iter_rows(values_only=False)):
+            job.step('Reading rows', row_number, total_rows)
             
             for cell in row:
                 
-                # Getting values
-                cell_value = cell.value if cell.value is not None else Cell.EMPTY_CELL
+                # Getting values, numbers are read as numbers and cells hold strings
+                cell_value = str(cell.value) if cell.value is not None else Cell.EMPTY_CELL
                 cell_index = [cell.row-1, cell.column]
                 cell_formula = cell_value # If it is a formula it already has the '=' prefix
 
@@ -0,0 +1,252 @@
+from libraries import *
+from spreadsheet_errors import *
+from collections import OrderedDict
+from types import CodeType
+from re import compile as compile_regex
+
+
+class RangeCall:
+    """
+    Class RangeCall: a single call to a range function (SUM_BY_RANGE, COUNTIF...) found inside a formula.
+    The call is replaced in the compiled code by a placeholder name, its value is calculated before the code runs.
+    """
+
+    def __init__(self, func: str, placeholder: str, start: str, stop: str, condition: Optional[str] = None, condition_ref: Optional[str] = None) -> None:
+
+        # Function's name and the name it has inside the compiled code
+        self.func = func
+        self.placeholder = placeholder
+
+        # Range edges - cells names
+        self.start = start
+        self.stop = stop
+
+        # COUNTIF only - the condition and the cell name it refers to if any
+        self.condition = condition
+        self.condition_ref = condition_ref
+
+
+class CompiledFormula:
+    """
+    Class CompiledFormula: the result of parsing a formula once - the code object to evaluate and everything it refers to.
+    """
+
+    def __init__(self, expression: str, code: Optional[CodeType], tokens: List[str], range_calls: List[RangeCall]) -> None:
+
+        # Normalized formula text - uppercased, without '=' and spaces
+        self.expression = expression
+
+        # Code object to evaluate, None if the formula is not a valid python expression
+        self.code = code
+
+        # Cells names in the formula by order of appearance (duplicates included), and without duplicates
+        self.tokens = tokens
+        self.references: Tuple[str, ...] = tuple(dict.fromkeys(tokens))
+
+        # Range functions calls in the formula
+        self.range_calls = range_calls
+
+        # Every cell the formula's value depends on besides its ranges - the references and the cells of COUNTIF conditions
+        self.precedents: Tuple[str, ...] = tuple(dict.fromkeys([*self.references, *(call.condition_ref for call in range_calls if call.condition_ref)]))
+
+        # A formula that is only a reference to another cell, for example: '=A1'
+        self.is_reference = len(tokens) == 1 and expression == tokens[0]
+
+
+class FormulaCompiler:
+    """
+    Class FormulaCompiler: parses formulas into CompiledFormula objects and keeps them in a cache by their text,
+    so every distinct formula is parsed only once.
+    """
+
+    # Class's constants
+    FORMULA_PREFIX = '='
+    PLACEHOLDER_PREFIX = 'range_'
+    DEFULT_CACHE_SIZE = 100_000
+
+    def __init__(self, cell_name_regex: str, range_functions: Iterable[str], cache_size=DEFULT_CACHE_SIZE) -> None:
+
+        self.cell_name_regex = cell_name_regex
+        self.cell_name_pattern = compile_regex(cell_name_regex)
+        self.full_cell_name_pattern = compile_regex(rf'{cell_name_regex}$')
+
+        # Pattern that finds the start of every range function call
+        self.range_call_pattern = compile_regex(r'(' + '|'.join(range_functions) + r')\(')
+
+        # Compiled formulas cache, ordered by last use
+        self.cache_size = cache_size
+        self.__cache: OrderedDict[str, CompiledFormula] = OrderedDict()
+
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+
+
+    def compile(self, formula: str) -> CompiledFormula:
+        """
+        Function compile
+        The function returns the compiled version of the given formula, from the cache if it was already compiled.
+
+        Parameters:
+            * formula: str - the formula as the user wrote it, starting with '='
+
+        Return Value: CompiledFormula
+
+        Exceptions: FormulaValueError, FunctionSyntaxError if a range function is not called correctly
+        """
+
+        compiled = self.__cache.get(formula)
+
+        if compiled is not None:
+            self.hits += 1
+            self.__cache.move_to_end(formula)
+            return compiled
+
+        self.misses += 1
+        compiled = self.__parse__(formula)
+
+        # Adding to cache while keeping it in its size limit
+        self.__cache[formula] = compiled
+        if len(self.__cache) > self.cache_size:
+            self.__cache.popitem(last=False)
+
+        return compiled
+
+
+    def clear(self) -> None:
+        """
+        Function clear
+        Empties the compiled formulas cache and its statistics
+        """
+        self.__cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+
+    def __parse__(self, formula: str) -> CompiledFormula:
+        """
+        Function __parse__
+        The function parses a formula - replaces range functions calls with placeholders, collects cells names and compiles the code.
+
+        Parameters:
+            * formula: str
+
+        Return Value: CompiledFormula
+        """
+
+        # Uppering and getting rid of any spaces and of the '=' sign
+        expression = formula.upper()
+        if expression.startswith(FormulaCompiler.FORMULA_PREFIX):
+            expression = expression[1:]
+        expression = expression.replace(' ', '')
+
+        # Extracting range functions calls
+        range_calls: List[RangeCall] = []
+        parts: List[str] = []
+        tokens: List[str] = []
+        position = 0
+
+        for match in self.range_call_pattern.finditer(expression):
+
+            # Skipping calls that are nested in a call that was already handled
+            if match.start() < position:
+                continue
+
+            func = match.group(1)
+            args, end = self.__split_call_args__(expression, match.end())
+
+            placeholder = FormulaCompiler.PLACEHOLDER_PREFIX + str(len(range_calls))
+            range_calls.append(self.__create_range_call__(func, placeholder, args))
+
+            # Keeping the text before the call and its cells names
+            before = expression[position:match.start()]
+            tokens.extend(self.cell_name_pattern.findall(before))
+            parts.append(before)
+            parts.append(placeholder)
+
+            position = end
+
+        rest = expression[position:]
+        tokens.extend(self.cell_name_pattern.findall(rest))
+        parts.append(rest)
+
+        code_text = ''.join(parts)
+
+        # Compiling the code, invalid syntax is raised only when the formula is evaluated
+        try:
+            code = compile(code_text, '<formula>', 'eval')
+        except (SyntaxError, ValueError):
+            code = None
+
+        return CompiledFormula(code_text, code, tokens, range_calls)
+
+
+    def __split_call_args__(self, expression: str, start: int) -> Tuple[List[str], int]:
+        """
+        Function __split_call_args__
+        An auxiliary function that splits the arguments of a function call by the top level commas
+
+        Parameters:
+            * expression: str
+            * start: int - index of the first character after the opening bracket
+
+        Return Value: Tuple of the arguments list and the index after the closing bracket
+        """
+
+        depth = 0
+        args = []
+        arg_start = start
+
+        for i in range(start, len(expression)):
+            char = expression[i]
+
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                if depth == 0:
+                    args.append(expression[arg_start:i])
+                    return args, i + 1
+                depth -= 1
+            elif char == ',' and depth == 0:
+                args.append(expression[arg_start:i])
+                arg_start = i + 1
+
+        # No closing bracket
+        raise FormulaValueError("Function not being called correctly")
+
+
+    def __create_range_call__(self, func: str, placeholder: str, args: List[str]) -> RangeCall:
+        """
+        Function __create_range_call__
+        An auxiliary function that validates the arguments of a range function and creates its RangeCall
+
+        Parameters:
+            * func: str - range function name
+            * placeholder: str
+            * args: List[str]
+
+        Return Value: RangeCall
+        """
+
+        # COUNTIF gets a condition as well as the range
+        args_amount = 3 if func == 'COUNTIF' else 2
+
+        if len(args) != args_amount or not all(self.full_cell_name_pattern.match(arg) for arg in args[:2]):
+            raise FormulaValueError("Function not being called correctly")
+
+        if func != 'COUNTIF':
+            return RangeCall(func, placeholder, args[0], args[1])
+
+        condition = args[2]
+        condition_tokens = self.cell_name_pattern.findall(condition)
+
+        if len(condition_tokens) > 1:
+            raise FunctionSyntaxError('Wrong useage in COUNTIF function. Correct one: COUNTIF(start, stop, condition), condition can be only one cell name or a value')
+
+        condition_ref = condition_tokens[0] if condition_tokens else None
+
+        return RangeCall(func, placeholder, args[0], args[1], condition, condition_ref)
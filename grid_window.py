@@ -0,0 +1,158 @@
+from libraries import *
+
+
+class GridWindow:
+    """
+    Class GridWindow: the part of a spreadsheet that a grid of entries shows - the size of the grid, and the cell at its top left corner.
+    It holds the grid's arithmetic apart from the widgets: which cell every entry shows, which entry shows a cell,
+    where the grid scrolls to and where navigation moves. Rows and columns of the spreadsheet and places in the grid start from 0.
+    """
+
+    def __init__(self, rows: int, cols: int) -> None:
+        """
+        Parameters:
+            * rows, cols: int - size of the spreadsheet
+        """
+
+        self.rows = rows
+        self.cols = cols
+
+        # Size of the grid in entries, and the sheet row and column shown at the top left corner of the grid
+        self.pool_rows = 0
+        self.pool_cols = 0
+        self.first_row = 0
+        self.first_col = 0
+
+
+    def resize(self, pool_rows: int, pool_cols: int) -> bool:
+        """
+        Function resize
+        Sets the size of the grid - as many entries as given, at least one and never more than the spreadsheet has
+
+        Parameters:
+            * pool_rows, pool_cols: int - rows and columns of entries that fit in the window
+
+        Return Value: bool - whether the size has changed
+        """
+
+        pool_rows = min(max(pool_rows, 1), self.rows)
+        pool_cols = min(max(pool_cols, 1), self.cols)
+
+        if (pool_rows, pool_cols) == (self.pool_rows, self.pool_cols):
+            return False
+
+        self.pool_rows, self.pool_cols = pool_rows, pool_cols
+        return True
+
+
+    def scroll_to(self, first_row: int, first_col: int) -> None:
+        """
+        Function scroll_to
+        Sets the cell at the top left corner of the grid. The last row and column of the spreadsheet may be shown at the bottom and right edges at most.
+        """
+
+        self.first_row = min(max(first_row, 0), max(self.rows - self.pool_rows + 1, 0))
+        self.first_col = min(max(first_col, 0), max(self.cols - self.pool_cols + 1, 0))
+
+
+    def cell_of(self, i: int, j: int) -> Optional[Tuple[int, int]]:
+        """
+        Function cell_of
+        Returns the cell (row, col) that the entry at a place in the grid shows, or None if the place is after the end of the spreadsheet
+        """
+
+        row, col = self.first_row + i, self.first_col + j
+
+        if row >= self.rows or col >= self.cols:
+            return None
+
+        return row, col
+
+
+    def place_of(self, row: int, col: int) -> Optional[Tuple[int, int]]:
+        """
+        Function place_of
+        Returns the place (i, j) in the grid of the entry that shows a cell, or None if the cell is not shown
+        """
+
+        i, j = row - self.first_row, col - self.first_col
+
+        if not (0 <= i < self.pool_rows and 0 <= j < self.pool_cols) or row >= self.rows or col >= self.cols:
+            return None
+
+        return i, j
+
+
+    def move(self, row: int, col: int, keysym: str) -> Optional[Tuple[int, int]]:
+        """
+        Function move
+        Returns the cell that a navigation key moves to from a cell, it stays at the edges of the spreadsheet
+
+        Parameters:
+            * row, col: int - the cell that is focused
+            * keysym: str - the key's name, arrows and tabs
+
+        Return Value: Tuple[int, int], None if the key does not move
+        """
+
+        if keysym == 'Right' or keysym == 'Tab':
+            return row, min(col + 1, self.cols - 1)
+
+        if keysym == 'Left' or keysym == 'Shift-Tab' or keysym == 'ISO_Left_Tab':
+            return row, max(col - 1, 0)
+
+        if keysym == 'Up':
+            return max(row - 1, 0), col
+
+        if keysym == 'Down':
+            return min(row + 1, self.rows - 1), col
+
+        return None
+
+
+    def follow(self, row: int, col: int) -> bool:
+        """
+        Function follow
+        Scrolls the least needed so a cell is shown entirely, the last row and column of the grid may be cut
+
+        Return Value: bool - whether the grid has scrolled
+        """
+
+        first = (self.first_row, self.first_col)
+
+        self.scroll_to(min(max(self.first_row, row - self.pool_rows + 2), row), min(max(self.first_col, col - self.pool_cols + 2), col))
+
+        return (self.first_row, self.first_col) != first
+
+
+    @staticmethod
+    def scroll_position(args: Tuple, first: int, total: int, shown: int) -> int:
+        """
+        Function scroll_position
+        Returns the first row or column to show after a scrollbar's command
+
+        Parameters:
+            * args: Tuple - the command - ('moveto', fraction) or ('scroll', amount, 'units' or 'pages')
+            * first: int - the first row or column that is shown
+            * total: int - amount of rows or columns in the spreadsheet
+            * shown: int - amount of rows or columns in the grid
+
+        Return Value: int
+        """
+
+        if args[0] == 'moveto':
+            return int(float(args[1]) * total)
+
+        amount = int(args[1])
+
+        return first + (amount * max(shown - 1, 1) if args[2] == 'pages' else amount)
+
+
+    def scrollbars(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """
+        Function scrollbars
+        Returns the shown parts of the rows and of the columns, as fractions (first, last) for the vertical and the horizontal scrollbars
+        """
+
+        return ((self.first_row / self.rows, min((self.first_row + self.pool_rows) / self.rows, 1)),
+                (self.first_col / self.cols, min((self.first_col + self.pool_cols) / self.cols, 1)))
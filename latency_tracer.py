@@ -0,0 +1,189 @@
+from libraries import *
+from collections import deque
+from time import perf_counter
+
+
+class RollingHistogram:
+    """
+    Class RollingHistogram: the latest samples of a latency, for percentiles over a rolling window.
+    Adding a sample takes constant time, percentiles are calculated only when they are asked for.
+    """
+
+    def __init__(self, window: int) -> None:
+
+        # Latest samples in seconds, and the amount of samples that were ever added
+        self.samples: deque = deque(maxlen=window)
+        self.count = 0
+
+
+    def add(self, seconds: float) -> None:
+        """
+        Function add
+        Adds a sample, the oldest sample is dropped once the window is full
+        """
+
+        self.samples.append(seconds)
+        self.count += 1
+
+
+    def percentiles(self, *percents: float) -> List[float]:
+        """
+        Function percentiles
+        Returns the percentiles of the samples in the window, by the nearest rank. 0 if there are no samples.
+
+        Parameters:
+            * percents: float - percents between 0 and 100
+
+        Return Value: List[float] - seconds, by the order of the percents
+        """
+
+        samples = sorted(self.samples)
+
+        if not samples:
+            return [0.0 for percent in percents]
+
+        return [samples[min(max(int(len(samples) * percent / 100 + 0.5) - 1, 0), len(samples) - 1)] for percent in percents]
+
+
+class LatencyTracer:
+    """
+    Class LatencyTracer: measures the time from an input event until the GUI has shown all of its results, in phases:
+        * evaluate - from the event until the first results are ready, the edit is written and its first cells are evaluated
+        * propagate - from the first results until all of the cells that depend on the edit are evaluated
+        * idle - time results waited for the GUI's event loop, from the oldest waiting result until the loop handled them
+        * repaint - time the GUI spent showing results
+        * total - from the event until its last result was shown
+    Evaluation runs on another thread while the GUI waits and repaints, so the phases overlap and total is not their sum.
+    Every phase keeps a rolling histogram. All of the functions are called from the GUI's thread, timestamps of other threads are
+    passed to them. When the tracer is disabled its functions return at once.
+    """
+
+    # Class's constants
+    PHASES = ('evaluate', 'propagate', 'idle', 'repaint', 'total')
+    PERCENTS = (50, 95, 99)
+    DEFULT_WINDOW = 1000
+
+    def __init__(self, window=DEFULT_WINDOW, enabled=True) -> None:
+
+        self.enabled = enabled
+        self.histograms: Dict[str, RollingHistogram] = {phase: RollingHistogram(window) for phase in LatencyTracer.PHASES}
+
+        # Events that were not fully shown yet, by their generation - the event's time, the first result's time, idle and repaint time
+        self.traces: Dict[int, List[Any]] = {}
+
+
+    def start(self, generation: int) -> None:
+        """
+        Function start
+        Starts measuring an input event
+
+        Parameters:
+            * generation: int - the generation of the edit the event caused, its results are known by it
+        """
+
+        if self.enabled:
+            self.traces[generation] = [perf_counter(), None, 0.0, 0.0]
+
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """
+        Function add_time
+        Adds idle or repaint time to every event that was not fully shown yet, all of them were waiting for it
+
+        Parameters:
+            * phase: str - 'idle' or 'repaint'
+            * seconds: float
+        """
+
+        index = 2 if phase == 'idle' else 3
+
+        for trace in self.traces.values():
+            trace[index] += seconds
+
+
+    def result(self, generation: int, timestamp: float) -> None:
+        """
+        Function result
+        Marks the first results of the events up to a generation
+
+        Parameters:
+            * generation: int - the generation the results include
+            * timestamp: float - perf_counter time the results were ready at
+        """
+
+        for trace_generation, trace in self.traces.items():
+            if trace_generation <= generation and trace[1] is None:
+                trace[1] = timestamp
+
+
+    def finish(self, generation: int, timestamp: float) -> None:
+        """
+        Function finish
+        Ends the events up to a generation - all of their results are ready and were shown
+
+        Parameters:
+            * generation: int - the generation the results include
+            * timestamp: float - perf_counter time the last results were ready at
+        """
+
+        done = [trace_generation for trace_generation in self.traces if trace_generation <= generation]
+        now = perf_counter()
+
+        for trace_generation in done:
+            start, first, idle, repaint = self.traces.pop(trace_generation)
+            first = timestamp if first is None else first
+
+            self.histograms['evaluate'].add(first - start)
+            self.histograms['propagate'].add(timestamp - first)
+            self.histograms['idle'].add(idle)
+            self.histograms['repaint'].add(repaint)
+            self.histograms['total'].add(now - start)
+
+
+    def clear(self) -> None:
+        """
+        Function clear
+        Drops the events that were not fully shown, for example when their recalculation was cancelled
+        """
+        self.traces = {}
+
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Function summary
+        Returns the percentiles of every phase in milliseconds, and the amount of events measured
+
+        Return Value: Dict[str, Dict[str, float]] - phase -> {'p50': ms, 'p95': ms, 'p99': ms, 'count': events}
+        """
+
+        summary = {}
+
+        for phase, histogram in self.histograms.items():
+            summary[phase] = {f'p{percent}': round(seconds * 1e3, 3) for percent, seconds in zip(LatencyTracer.PERCENTS, histogram.percentiles(*LatencyTracer.PERCENTS))}
+            summary[phase]['count'] = histogram.count
+
+        return summary
+
+
+    def status_text(self) -> str:
+        """
+        Function status_text
+        Returns a short line with the total latency percentiles, for a status bar
+        """
+
+        total = self.summary()['total']
+
+        return f"Latency p50 {total['p50']:.1f}ms  p95 {total['p95']:.1f}ms  p99 {total['p99']:.1f}ms  ({total['count']} edits)"
+
+
+    def dump(self, path: str) -> None:
+        """
+        Function dump
+        Writes the summary to a json file
+
+        Parameters:
+            * path: str
+        """
+
+        with open(path, 'w') as file:
+            json.dump(self.summary(), file, indent=4)
@@ -1,15 +1,52 @@
-from typing import Dict, List, Any, Tuple, Optional, Union
-from xlsxwriter.workbook import Workbook
+from typing import Dict, List, Set, Any, Tuple, Optional, Union, Iterable, Iterator, Callable, Container
+from importlib import import_module
+import sys
 
-import pandas as pd
+# The engine - the values store is made of numpy arrays, so numpy is needed by every spreadsheet
 import numpy as np
 
-# GUI related importing
-import tkinter as tk
-import tkinter.font as font
-
-# files importing
+# files importing, standard library
 import json
-import yaml
 import csv
 
+
+class LazyModule:
+    """
+    Class LazyModule: a module that is imported on its first use - the first time any of its attributes is read.
+    Heavy dependencies of a single file format or feature are only loaded when that file format or feature is used,
+    annotations that name them must be strings so they are not read when a module is imported.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.module_name = name
+        self.module = None
+
+
+    def __getattr__(self, attribute: str) -> Any:
+        if self.module is None:
+            self.module = import_module(self.module_name)
+
+        return getattr(self.module, attribute)
+
+
+    def is_loaded(self) -> bool:
+        """
+        Function is_loaded
+        Returns whether the module was imported already, by this object or by anyone else
+        """
+        return self.module is not None or self.module_name in sys.modules
+
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self.module_name}'{' (loaded)' if self.is_loaded() else ''}>"
+
+
+# Dataframes - cells_df and values only exports and imports
+pd = LazyModule('pandas')
+
+# files exporting and importing, by file format
+yaml = LazyModule('yaml')
+xlsxwriter = LazyModule('xlsxwriter')
+openpyxl = LazyModule('openpyxl')
+fpdf = LazyModule('fpdf')
+tabulate = LazyModule('tabulate')
@@ -5,7 +5,12 @@ from spreadsheet_gui import SpreadsheetGui
 
 
 class SpreadsheetApp:
+
+    # Spreadsheets with more cells than this keep their values in sparse mode
+    SPARSE_CELLS = 1_000_000
+
     def __init__(self):
+        self.args = None
         self.spreadsheet = self.get_spreadsheet()
 
     def handle_args(self) -> Optional[Tuple[int, int]]:
@@ -26,6 +31,9 @@ class SpreadsheetApp:
         Option 2: main.py
                   Will open an empty sheet with defult size - 50x26
 
+        Latency: main.py --status-bar --latency-file latency.json
+                  Shows the p50, p95 and p99 latency of the edits in a status bar, and writes every phase of it to a json file when the app is closed
+
         Notice:     ----  You Cannot Change File Size While Editing  ----
 
 
@@ -115,12 +123,17 @@ class SpreadsheetApp:
         # Adding sheet dimention option
         parser.add_argument("-s", "--size", nargs=2, metavar=("Rows", "Columns"), help="Create a new spreadsheet with specified dimensions: rows columns - Must be integers")
 
+        # Latency of the edits - p50, p95 and p99 of every phase from an edit until its results are shown
+        parser.add_argument("--status-bar", action="store_true", help="Show the latency of the edits in a status bar")
+        parser.add_argument("--latency-file", metavar="Path", help="Write the latency of the edits to a json file when the app is closed")
+
         try:
             args = parser.parse_args()
         except argparse.ArgumentError as e:
             print("Please check your commnad line arguments and try again. type main.py --help for help.")
 
         if args:
+            self.args = args
             return args.size
         else:
             return None
@@ -146,7 +159,7 @@ class SpreadsheetApp:
                     rows = int(args[0])
                     cols = int(args[1])
 
-                    spreadsheet = Spreadsheet(rows, cols)
+                    spreadsheet = Spreadsheet(rows, cols, sparse=rows * cols > SpreadsheetApp.SPARSE_CELLS)
 
             except Exception as e:
                 print(f"{e}\nLoading empty spreadsheet instead")
@@ -158,7 +171,10 @@ class SpreadsheetApp:
 
 
     def run(self):
-        self.gui = SpreadsheetGui(self.spreadsheet)
+        if self.args:
+            self.gui = SpreadsheetGui(self.spreadsheet, status_bar=self.args.status_bar, latency_file=self.args.latency_file)
+        else:
+            self.gui = SpreadsheetGui(self.spreadsheet)
         self.gui.run()
 
 
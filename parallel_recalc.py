@@ -0,0 +1,89 @@
+from libraries import *
+from spreadsheet_errors import *
+import multiprocessing
+
+
+class ParallelRecalc:
+    """
+    Class ParallelRecalc: evaluates big levels of a recalculation in a pool of processes.
+    Cells of the same level do not depend on each other, so they are split between the workers and evaluated at the same time.
+    Workers are forked for every level, so they start with the values of all of the levels before it and nothing is sent to them.
+    Parallel recalculation needs the fork start method (Linux), elsewhere every level is evaluated serially.
+    """
+
+    # Class's constants
+    DEFULT_THRESHOLD = 2000
+    CHUNKS_PER_WORKER = 4
+
+    # Spreadsheet and values of the level that is being evaluated, the forked workers inherit them
+    forked_state: Optional[Tuple[Any, Dict[str, Any]]] = None
+
+    def __init__(self, workers=1, threshold=DEFULT_THRESHOLD) -> None:
+
+        # Amount of processes, 1 means serial recalculation, and the smallest level that is worth a pool
+        self.workers = workers
+        self.threshold = threshold
+
+        # Statistics - levels and cells that were evaluated in parallel
+        self.levels = 0
+        self.cells = 0
+
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Property enabled
+        Whether recalculations may run in parallel at all
+        """
+        return self.workers > 1 and 'fork' in multiprocessing.get_all_start_methods()
+
+
+    def should_run(self, cells: int) -> bool:
+        """
+        Function should_run
+        Returns whether a level with the given amount of formula cells should be evaluated in parallel
+        """
+        return self.enabled and cells >= self.threshold
+
+
+    def evaluate(self, spreadsheet: Any, names: List[str], evaluated: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """
+        Function evaluate
+        The function evaluates cells that do not depend on each other in the pool's workers. The spreadsheet is not changed,
+        the caller stores the results.
+
+        Parameters:
+            * spreadsheet: Spreadsheet
+            * names: List[str] - names of formula cells of a single level
+            * evaluated: Dict[str, Any] - values of the cells that were already evaluated in this recalculation
+
+        Return Value: List[Tuple[str, Any]] - the name of every cell and its value, or the SpreadsheetError that occured
+        """
+
+        self.levels += 1
+        self.cells += len(names)
+
+        chunk_size = -(-len(names) // (self.workers * ParallelRecalc.CHUNKS_PER_WORKER))
+        chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+
+        ParallelRecalc.forked_state = (spreadsheet, evaluated)
+
+        try:
+            with multiprocessing.get_context('fork').Pool(self.workers) as pool:
+                results = pool.map(ParallelRecalc.__evaluate_chunk__, chunks)
+        finally:
+            ParallelRecalc.forked_state = None
+
+        return [result for chunk in results for result in chunk]
+
+
+    @staticmethod
+    def __evaluate_chunk__(names: List[str]) -> List[Tuple[str, Any]]:
+        """
+        Function __evaluate_chunk__
+        An auxiliary function that runs in a worker and evaluates some of the cells of a level
+        """
+
+        spreadsheet, evaluated = ParallelRecalc.forked_state
+
+        return [(name, spreadsheet.__evaluate_cell__(name, evaluated)) for name in names]
@@ -0,0 +1,244 @@
+from libraries import *
+from spreadsheet_types import ValueKind
+from value_store import ValueStore, ChunkedValueStore, RangeValues
+
+
+class PrefixSumRegion:
+    """
+    Class PrefixSumRegion: prefix sums of one region of the spreadsheet. The rows are kept in a Fenwick tree, and every node of the tree
+    holds the prefix sums of its rows over the columns, so the sum of any rectangle in the region and a change of a cell take O(log rows).
+    Only integers are summed, their sums are exact. Cells that can not be summed exactly (floats, texts, errors and very big integers)
+    are only counted. Rows and columns start from 0.
+    """
+
+    def __init__(self, range_values: RangeValues, int_limit: int) -> None:
+
+        self.rows = range_values.stop_row - range_values.start_row
+        self.cols = range_values.stop_col - range_values.start_col
+        self.int_limit = int_limit
+
+        # Values of the cells - integers, and counts of the cells that can not be summed
+        ints = np.zeros((self.rows, self.cols), dtype=np.int64)
+        counts = np.zeros((self.rows, self.cols), dtype=np.int64)
+
+        for block in range_values.blocks:
+            kinds = block.kinds
+            numbers = block.numbers
+            rows = slice(block.row_offset, block.row_offset + kinds.shape[0])
+            cols = slice(block.col_offset, block.col_offset + kinds.shape[1])
+
+            is_int = (kinds == ValueKind.INT) & (np.abs(numbers) <= int_limit)
+
+            ints[rows, cols] = np.where(is_int, numbers, 0)
+            counts[rows, cols] = (kinds != ValueKind.EMPTY) & ~is_int
+
+        self.ints = self.__build_tree__(ints)
+        self.counts = self.__build_tree__(counts)
+
+
+    def range_sum(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> Tuple[int, int]:
+        """
+        Function range_sum
+        Returns the sums of a rectangle of the region. Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int - inside the region
+
+        Return Value: Tuple of the integers sum and the counts sum
+        """
+
+        ints_sum = 0
+        counts_sum = 0
+
+        # Sum of the rows before stop_row minus the sum of the rows before start_row
+        for row, sign in ((stop_row, 1), (start_row, -1)):
+            while row > 0:
+                ints_sum += sign * (self.ints.item(row - 1, stop_col) - self.ints.item(row - 1, start_col))
+                counts_sum += sign * (self.counts.item(row - 1, stop_col) - self.counts.item(row - 1, start_col))
+                row -= row & -row
+
+        return ints_sum, counts_sum
+
+
+    def add(self, row: int, col: int, int_value: int, count: int) -> None:
+        """
+        Function add
+        Adds values to a cell of the region, negative values remove them
+
+        Parameters:
+            * row, col: int - inside the region
+            * int_value, count: the changes of the cell's sums
+        """
+
+        # Every tree node that contains the row holds prefix sums, so all of the columns after the cell change
+        node = row + 1
+        while node <= self.rows:
+            if int_value:
+                self.ints[node - 1, col + 1:] += int_value
+            if count:
+                self.counts[node - 1, col + 1:] += count
+            node += node & -node
+
+
+    def memory_usage(self) -> int:
+        """
+        Function memory_usage
+        Returns the memory the region's trees take, in bytes
+        """
+        return self.ints.nbytes + self.counts.nbytes
+
+
+    def __build_tree__(self, values: np.ndarray) -> np.ndarray:
+        """
+        Function __build_tree__
+        An auxiliary function that builds the tree of a 2D array at once - prefix sums over the columns, and every tree node
+        is the difference of two prefix sums over the rows.
+
+        Parameters:
+            * values: np.ndarray - 2D array of the cells values
+
+        Return Value: np.ndarray - the tree, with one more column for the empty prefix
+        """
+
+        prefix = np.zeros((self.rows + 1, self.cols + 1), dtype=values.dtype)
+        np.cumsum(values, axis=1, out=prefix[1:, 1:])
+        np.cumsum(prefix[1:], axis=0, out=prefix[1:])
+
+        # Node k holds the rows (k - lowbit(k), k]
+        nodes = np.arange(1, self.rows + 1)
+        return prefix[nodes] - prefix[nodes - (nodes & -nodes)]
+
+
+class PrefixSumIndex:
+    """
+    Class PrefixSumIndex: an optional index that answers SUM_BY_RANGE and AVERAGE_BY_RANGE without reading the whole range.
+    It answers ranges of integers only, so its sums are exact - a difference of float prefix sums loses small values next to big ones.
+    The spreadsheet is split into regions, and a region's prefix sums are built the first time a range over it is summed.
+    Every change of a cell in a built region updates it. Rows and columns start from 0.
+    """
+
+    # Defult regions size - tall regions fit the common sums over columns
+    REGION_ROWS = 16384
+    REGION_COLS = 16
+
+    def __init__(self, store: Union[ValueStore, ChunkedValueStore], region_rows=REGION_ROWS, region_cols=REGION_COLS) -> None:
+
+        self.store = store
+        self.region_rows = region_rows
+        self.region_cols = region_cols
+
+        # Bigger integers are not summed by the index, so a region's integers sum always fits an int64
+        self.int_limit = (2 ** 62) // (region_rows * region_cols)
+
+        # (region row, region col) -> region
+        self.regions: Dict[Tuple[int, int], PrefixSumRegion] = {}
+
+        # Index statistics
+        self.builds = 0
+        self.queries = 0
+
+
+    def range_sum(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> Optional[int]:
+        """
+        Function range_sum
+        The function returns the sum of a range of cells, building the regions it covers if needed. Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+
+        Return Value: int - the sum, or None if the range has cells that are not integers (floats, texts...) and must be summed one by one
+        """
+
+        self.queries += 1
+
+        ints_sum = 0
+        counts_sum = 0
+
+        for region_row in range(start_row // self.region_rows, (stop_row - 1) // self.region_rows + 1 if stop_row > start_row else 0):
+            for region_col in range(start_col // self.region_cols, (stop_col - 1) // self.region_cols + 1 if stop_col > start_col else 0):
+                region = self.__get_region__(region_row, region_col)
+
+                region_start_row = region_row * self.region_rows
+                region_start_col = region_col * self.region_cols
+
+                region_sums = region.range_sum(max(start_row - region_start_row, 0), min(stop_row - region_start_row, region.rows),
+                                               max(start_col - region_start_col, 0), min(stop_col - region_start_col, region.cols))
+
+                ints_sum += region_sums[0]
+                counts_sum += region_sums[1]
+
+        return None if counts_sum else ints_sum
+
+
+    def remove_cell(self, row: int, col: int) -> None:
+        """
+        Function remove_cell
+        Removes the current value of a cell from the index, called before the value changes
+        """
+        self.__update_cell__(row, col, -1)
+
+
+    def add_cell(self, row: int, col: int) -> None:
+        """
+        Function add_cell
+        Adds the current value of a cell to the index, called after the value has changed
+        """
+        self.__update_cell__(row, col, 1)
+
+
+    def memory_usage(self) -> int:
+        """
+        Function memory_usage
+        Returns the memory the built regions take, in bytes
+        """
+        return sum(region.memory_usage() for region in self.regions.values())
+
+
+    def __get_region__(self, region_row: int, region_col: int) -> PrefixSumRegion:
+        """
+        Function __get_region__
+        An auxiliary function that returns a region, building it from the values store the first time it is needed
+        """
+
+        region = self.regions.get((region_row, region_col))
+
+        if region is None:
+            start_row = region_row * self.region_rows
+            start_col = region_col * self.region_cols
+            range_values = self.store.range_values(start_row, min(start_row + self.region_rows, self.store.rows),
+                                                   start_col, min(start_col + self.region_cols, self.store.cols))
+
+            region = self.regions[(region_row, region_col)] = PrefixSumRegion(range_values, self.int_limit)
+            self.builds += 1
+
+        return region
+
+
+    def __update_cell__(self, row: int, col: int, sign: int) -> None:
+        """
+        Function __update_cell__
+        An auxiliary function that adds or removes the value a cell has in the store to its region, if the region was built
+
+        Parameters:
+            * row, col: int
+            * sign: int - 1 to add, -1 to remove
+        """
+
+        region_row, local_row = divmod(row, self.region_rows)
+        region_col, local_col = divmod(col, self.region_cols)
+        region = self.regions.get((region_row, region_col))
+
+        if region is None:
+            return
+
+        kind = self.store.get_kind(row, col)
+
+        if kind == ValueKind.EMPTY:
+            return
+
+        value = self.store.get(row, col)
+
+        if kind == ValueKind.INT and abs(value) <= self.int_limit:
+            region.add(local_row, local_col, sign * value, 0)
+        else:
+            region.add(local_row, local_col, 0, sign)
@@ -0,0 +1,323 @@
+from libraries import *
+from spreadsheet_errors import *
+from threading import Thread, Condition, RLock
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right
+
+
+class RecalcScheduler:
+    """
+    Class RecalcScheduler: recalculates a spreadsheet on a background thread.
+    Edits are queued and return at once, the thread writes them and evaluates the cells that depend on them in small chunks.
+    Between chunks it takes the newer edits, so a newer edit supersedes the recalculation in progress - the cells that were not
+    evaluated yet are evaluated together with the cells of the new edit, and none of them is evaluated twice.
+    Cells of the priority region (for example, the cells that are visible) and the cells they depend on are evaluated first,
+    the rest of the cells are evaluated after them. Changing the region reorders the cells that were not evaluated yet.
+    Every result is handed to the post function (for example, a GUI's event loop) with the generation of the edits it includes.
+    While the scheduler runs, the spreadsheet may only be changed through it or while holding its lock.
+    """
+
+    # Cells evaluated between checks for newer edits
+    DEFULT_CHUNK_SIZE = 256
+
+    def __init__(self, spreadsheet: Any, post: Optional[Callable[[Callable[[], None]], None]] = None,
+                 on_pending: Optional[Callable[[int, List[str]], None]] = None,
+                 on_values: Optional[Callable[[int, Dict[str, str]], None]] = None,
+                 on_error: Optional[Callable[[str, SpreadsheetError], None]] = None,
+                 on_idle: Optional[Callable[[int], None]] = None,
+                 chunk_size=DEFULT_CHUNK_SIZE) -> None:
+        """
+        Parameters:
+            * spreadsheet: Spreadsheet
+            * post: Callable - runs a function on the thread that shows the results. By defult, results are handled on the scheduler's thread
+            * on_pending: Callable(generation, names) - cells of the priority region that are about to be evaluated, by their order.
+              Called after edits and after the priority region changes
+            * on_values: Callable(generation, values) - values of cells that were evaluated, as they are shown to the user
+            * on_error: Callable(cell name, error) - an edited cell could not be evaluated
+            * on_idle: Callable(generation) - all of the edits up to the generation are evaluated
+            * chunk_size: int - cells evaluated between checks for newer edits
+        """
+
+        self.spreadsheet = spreadsheet
+        self.post = post
+        self.on_pending = on_pending
+        self.on_values = on_values
+        self.on_error = on_error
+        self.on_idle = on_idle
+        self.chunk_size = chunk_size
+
+        # Held while the spreadsheet is being changed
+        self.lock = RLock()
+
+        # Guards the queued edits and the scheduler's state
+        self.condition = Condition()
+        self.edits: Dict[str, str] = {}
+        self.generation = 0
+        self.busy = False
+        self.cancelled = False
+        self.stopped = False
+
+        # Names of the cells to evaluate first, and whether they changed since the cells were last ordered
+        self.priority: Set[str] = set()
+        self.priority_changed = False
+
+        self.thread = Thread(target=self.__run__, name='recalc', daemon=True)
+        self.thread.start()
+
+
+    def submit(self, cell_name: str, new_val: str) -> int:
+        """
+        Function submit
+        Queues an edit of a cell, a later edit of the same cell replaces it if it was not taken yet
+
+        Parameters:
+            * cell_name: str
+            * new_val: str
+
+        Return Value: int - the generation of the edit, results of this generation or later include it
+        """
+
+        with self.condition:
+            self.edits[cell_name.upper()] = new_val
+            self.generation += 1
+            self.busy = True
+            self.condition.notify_all()
+
+            return self.generation
+
+
+    def set_priority(self, cells_names: Iterable[str]) -> None:
+        """
+        Function set_priority
+        Sets the cells to evaluate first, the cells that were not evaluated yet are ordered again before the next chunk
+
+        Parameters:
+            * cells_names: Iterable[str] - names of the cells, in capital letters
+        """
+
+        with self.condition:
+            self.priority = set(cells_names)
+            self.priority_changed = True
+            self.condition.notify_all()
+
+
+    def cancel(self) -> int:
+        """
+        Function cancel
+        Drops the queued edits and the cells that were not evaluated yet. Once it returns, the scheduler does not touch the spreadsheet
+        until the next edit, so the spreadsheet can be replaced while holding the lock. Edits that were already written stay written.
+
+        Return Value: int - the generation of the cancellation
+        """
+
+        with self.lock:
+            with self.condition:
+                self.edits = {}
+                self.cancelled = True
+                self.generation += 1
+                self.condition.notify_all()
+
+                return self.generation
+
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Function wait_idle
+        Waits until every edit that was submitted is evaluated
+
+        Parameters:
+            * timeout: float - seconds to wait, by defult there is no limit
+
+        Return Value: bool - False if the timeout has passed first
+        """
+
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.busy, timeout)
+
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """
+        Function paused
+        A context manager that cancels the recalculation and holds the lock, for replacing the spreadsheet's content
+        """
+
+        with self.lock:
+            self.cancel()
+            yield
+
+
+    def stop(self) -> None:
+        """
+        Function stop
+        Stops the scheduler's thread once the chunk in progress is done
+        """
+
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+        self.thread.join()
+
+
+    def __run__(self) -> None:
+        """
+        Function __run__
+        The scheduler's thread - takes edits and evaluates cells chunk by chunk until it is stopped
+        """
+
+        # Cells to evaluate by their order and how many of them are evaluated, edited cells that were not evaluated yet
+        order: List[str] = []
+        position = 0
+        edited: Set[str] = set()
+        evaluated: Dict[str, Any] = {}
+        generation = 0
+
+        while True:
+            with self.condition:
+                while not self.edits and not self.cancelled and position >= len(order) and not self.stopped:
+                    self.priority_changed = False
+
+                    if self.busy:
+                        self.busy = False
+                        self.condition.notify_all()
+                        self.__post__(self.on_idle, generation)
+
+                    self.condition.wait()
+
+                if self.stopped:
+                    return
+
+            with self.lock:
+
+                # State is checked again while holding the lock, a cancellation may have happened in between
+                with self.condition:
+                    edits, self.edits = self.edits, {}
+                    cancelled, self.cancelled = self.cancelled, False
+                    generation = self.generation
+                    priority = self.priority if self.priority_changed or edits else None
+                    self.priority_changed = False
+
+                if cancelled:
+                    order, position, edited = [], 0, set()
+
+                # Newer edits supersede the current recalculation, the cells that are left are evaluated with the new ones
+                if edits:
+                    pending = order[position:]
+                    batch, order = self.spreadsheet.stage_cells(edits, pending)
+                    position = 0
+                    edited = (edited & set(pending)) | set(batch.cells)
+                    evaluated = {}
+
+                    for cell_name, error in batch.errors.items():
+                        self.__post__(self.on_error, cell_name, error)
+
+                if priority and position < len(order):
+                    order = self.__prioritize__(order[position:], priority)
+                    position = 0
+
+                    # Only the cells of the priority region are reported, the whole order can be far larger than what is shown
+                    pending = [cell_name for cell_name in order if cell_name in priority]
+                    if pending:
+                        self.__post__(self.on_pending, generation, pending)
+
+                chunk = order[position:position + self.chunk_size]
+                position += len(chunk)
+
+                if chunk:
+                    errors = self.spreadsheet.evaluate_order(chunk, evaluated, edited)
+                    values = {name: self.spreadsheet.get_value_from_cell(name) for name in chunk}
+
+                    for cell_name, error in errors.items():
+                        if cell_name in edited:
+                            self.__post__(self.on_error, cell_name, error)
+
+                    edited.difference_update(chunk)
+                    self.__post__(self.on_values, generation, values)
+
+
+    def __prioritize__(self, order: List[str], priority: Set[str]) -> List[str]:
+        """
+        Function __prioritize__
+        An auxiliary function that moves the priority cells and the cells they depend on to the start of a recalculation order.
+        Both parts keep their order, so every cell still comes after all of the cells it depends on.
+
+        Parameters:
+            * order: List[str] - cells that were not evaluated yet, in recalculation order
+            * priority: Set[str] - cells to evaluate first
+
+        Return Value: List[str] - the new order
+        """
+
+        graph = self.spreadsheet.dependency_graph
+        pending = set(order)
+
+        # Pending cells by column, sorted by row, so the cells in a range are found by rows intervals. Built on the first range.
+        columns: Optional[Dict[int, Tuple[List[int], List[str]]]] = None
+
+        # Going from the priority cells to the cells they depend on, only cells that were not evaluated yet are needed
+        needed = set()
+        stack = [cell_name for cell_name in priority if cell_name in pending]
+
+        while stack:
+            cell_name = stack.pop()
+
+            if cell_name in needed:
+                continue
+            needed.add(cell_name)
+
+            stack.extend(precedent for precedent in graph.get_precedents(cell_name) if precedent in pending)
+
+            for start_row, stop_row, start_col, stop_col in graph.get_ranges(cell_name):
+                if columns is None:
+                    columns = self.__pending_columns__(pending)
+
+                # Going over the columns of the range, or over the columns of the pending cells if there are fewer of them
+                cols = range(start_col, stop_col + 1) if stop_col - start_col < len(columns) else list(columns)
+
+                for col in cols:
+                    if start_col <= col <= stop_col and col in columns:
+                        rows, names = columns[col]
+                        stack.extend(names[bisect_left(rows, start_row):bisect_right(rows, stop_row)])
+
+        if not needed:
+            return order
+
+        return [cell_name for cell_name in order if cell_name in needed] + [cell_name for cell_name in order if cell_name not in needed]
+
+
+    def __pending_columns__(self, pending: Iterable[str]) -> Dict[int, Tuple[List[int], List[str]]]:
+        """
+        Function __pending_columns__
+        An auxiliary function that groups cells by their columns
+
+        Parameters:
+            * pending: Iterable[str] - cells names
+
+        Return Value: Dict[int, Tuple[List[int], List[str]]] - column index -> rows of the cells in the column in ascending order, and their names
+        """
+
+        locations = sorted((ref.col, ref.row, ref.name) for ref in map(self.spreadsheet.cell_ref, pending))
+        columns: Dict[int, Tuple[List[int], List[str]]] = {}
+
+        for col, row, name in locations:
+            rows, names = columns.setdefault(col, ([], []))
+            rows.append(row)
+            names.append(name)
+
+        return columns
+
+
+    def __post__(self, callback: Optional[Callable], *args: Any) -> None:
+        """
+        Function __post__
+        An auxiliary function that hands a result to its callback through the post function
+        """
+
+        if callback is None:
+            return
+
+        if self.post is None:
+            callback(*args)
+        else:
+            self.post(lambda: callback(*args))
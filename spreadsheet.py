@@ -1,8 +1,21 @@
 from libraries import *
 from spreadsheet_errors import *
 from cell import Cell
-from re import findall
+from cell_address import CellRef, ADDRESSES
+from formula_compiler import FormulaCompiler, CompiledFormula, RangeCall
+from dependency_graph import DependencyGraph
+from value_cache import ValueCache
+from value_store import ValueStore, ChunkedValueStore, RangeValues
+from prefix_sum_index import PrefixSumIndex
+from value_index import ValueIndex
+from edit_batch import EditBatch
+from parallel_recalc import ParallelRecalc
+from changeset import Changeset, ChangeNotifier
+from engine_metrics import EngineMetrics
+from spreadsheet_types import ValueKind
 from math import sqrt, pow
+from contextlib import contextmanager
+from time import perf_counter
 
 
 class Spreadsheet:
@@ -11,32 +24,70 @@ class Spreadsheet:
     __FORMULA_PREFIX = '='
     __CELL_NAME_RGULAR_EXPRESSION = r'[A-Za-z]+[1-9]\d*'
 
-    def __init__(self, rows=50, cols=26) -> None:
+    def __init__(self, rows=50, cols=26, sparse=False, range_index=False, workers=1, metrics=False) -> None:
         
         # Size of the spreadsheet
+        self.__check_cols__(cols)
         self.rows = rows
         self.cols = cols
 
-        # Dataframe representation of the spreadsheet
-        self.cells_df = pd.DataFrame(index=[str(i + 1) for i in range(rows)], columns=[self.__int_to_letter__(i) for i in range(1, self.cols+1)])
-        self.cells_df.index.name = 'Row'
-        self.cells_df.columns.name = 'Column'
+        # Sparse mode - for very large sheets that are mostly empty, only cells that are used take memory
+        self.sparse = sparse
 
-        # Making sure no Nan values are in initial dataframe
-        self.cells_df.fillna('', inplace=True)
+        # Prefix sums index for SUM_BY_RANGE and AVERAGE_BY_RANGE - for sheets with many sums over big ranges
+        self.use_range_index = range_index
 
-        # Cells objects list
-        self.cells_objs: List[List[Cell]] = [[Cell(row, col, name=(self.__int_to_letter__(col)+str(row+1))) for col in range(1, self.cols+1)] for row in range(rows)]
+        # Cells names resolver and columns names by their order
+        self.addresses = ADDRESSES
+        self.columns_names = self.addresses.columns_names(self.cols)
+
+        # Typed values of the cells and cells objects
+        self.__create_storage__()
 
         # Supported functions
         self.SUPPORTED_FUNCTIONS = {"SUM": self.__sum__, "AVERAGE": self.__mean__, "SQRT": self.__sqrt__, "POWER": self.__pow__}
         self.RANGE_FUNCTIONS = {"SUM_BY_RANGE": self.__sum_by_range__, "AVERAGE_BY_RANGE": self.__mean_by_range__, "COUNTNUMS": self.__countnums__, "COUNTIF": self.__count_if__}
 
+        # Compiled formulas cache, every distinct formula is parsed only once
+        self.formula_compiler = FormulaCompiler(Spreadsheet.__CELL_NAME_RGULAR_EXPRESSION, self.RANGE_FUNCTIONS.keys())
+
+        # Precedents and dependents of every cell
+        self.dependency_graph = DependencyGraph(self.__get_cell_by_name__, self.__cell_at__)
+
+        # Computed values of formula cells, reused until a cell they depend on changes
+        self.value_cache = ValueCache()
+
+        # Batch of edits in progress, its cells are evaluated together when it ends
+        self.current_batch: Optional[EditBatch] = None
 
-        self.original_vals = {'rows': rows, 'cols': cols, 'df': self.cells_df, 'cells': self.cells_objs[:]}
+        # Processes pool for big recalculations - levels of cells that do not depend on each other are evaluated in parallel
+        self.parallel_recalc = ParallelRecalc(workers)
 
+        # Observers of the changes of every edit and recalculation
+        self.notifier = ChangeNotifier()
 
-    def get_cells_info(self, cell_id: str) -> Dict:
+        # Counters and latency histograms of the engine, nothing is measured when there are none
+        self.metrics: Optional[EngineMetrics] = EngineMetrics() if metrics else None
+
+        self.original_vals = {'rows': rows, 'cols': cols, 'values': self.values, 'cells': dict(self.cells)}
+
+
+    @property
+    def cells_df(self) -> 'pd.DataFrame':
+        """
+        Property cells_df
+        Dataframe representation of the spreadsheet - the values of the cells as strings, rows names as index and columns names as columns.
+        The dataframe is created from the values store every time, changing it does not change the spreadsheet.
+        """
+
+        cells_df = pd.DataFrame(self.values.text_block(0, self.rows, 0, self.cols), index=[str(i + 1) for i in range(self.rows)], columns=self.columns_names)
+        cells_df.index.name = 'Row'
+        cells_df.columns.name = 'Column'
+
+        return cells_df
+
+
+    def get_cells_info(self, cell_id: Union[str, CellRef]) -> Dict:
         """
         Function get_cell_info
         The function returns the wanted cell's information dictionary
@@ -46,7 +97,7 @@ class Spreadsheet:
         Return value: Dict
         """
         # Getting cell's object
-        cell = self. __get_cell_by_name__(cell_id)
+        cell = self.__find_cell__(cell_id)
 
         return cell.get_info()
 
@@ -62,134 +113,356 @@ class Spreadsheet:
         Return Value: str - the converted string value of the column name
         """
 
-        # Constants values
-        CAPITAL_A_ASCII = 65
-        ALPHBET_LETTERS = 26
+        # Columns names are kept in a table
+        return self.addresses.column_name(n)
 
-        result = ''
 
-        # Run until n is 0
-        while n:
+    def get_value_from_cell(self, cell_id: Union[str, CellRef]) -> Union[str, int]:
+        """
+        Function get_value_from_cell
+        The function returns the value of a given cell by its id
 
-            # Calculate quotient and remainder using divmod, subtract 1 from n to handle 0-indexing
-            n, remainder = divmod(n-1, ALPHBET_LETTERS)
+        Parameters:
+            * cell_id: str or CellRef - string represented by a capital letter and number, for example A4
+        
+        Return Value: string, the value of the cell as it is shown to the user
+        """
 
-            # Convert remainder to corresponding capital letter and prepend to result
-            result = chr(CAPITAL_A_ASCII + remainder) + result
+        # Getting index from cell id
+        row, col = self.__cell_location__(cell_id)
         
-        return result
+        return self.values.get_text(row, col - 1)
 
 
-    def get_value_from_cell(self, cell_id: str) -> Union[str, int]:
+    def get_cell_formula(self, cell_name: Union[str, CellRef]) -> str:
         """
-        Function get_value_from_cell
-        The function returns the value of a given cell by its id
+        Function get_cell_formula
+        The function returns a given cell's formula using it's id
 
         Parameters:
-            * cell_id: str - string represented by a capital letter and number, for example A4
+            * cell_name: str
         
-        Return Value: string or int, depends on cell's value stored in the class's dataframe
+        Return Value: str - the formula of the cell, usually starts with '=', unless user just put a value and then its just the value
         """
-
-        # Getting index from cell id
-        row, col = self.__cell_name_tuple__(cell_id)
         
-        return self.cells_df.at[row, col]
+        # Getting cell by it's id
+        cell = self.__find_cell__(cell_name)
+
+        return cell.get_formula()
 
 
-    def __cell_name_tuple__(self, cell_id: str) -> Tuple[str, str]:
+    def __update_cell_dependencies__(self, cell: Cell, evaluated: Optional[Dict[str, Any]] = None) -> Dict[str, SpreadsheetError]:
         """
-        Function __cell_name_tuple__
-        The function seperates row and column value from a given cell id and returns a tuple with those values
+        Function __update_cell_dependencies__
+        The function recives a cell and updates every cell that depends on its value, directly or not. Every dependent cell is
+        evaluated exactly once, after all of the cells it depends on.
+        In case of an error, it changes the dependent cell's value to the corresponding error value and moves on to the next one.
 
         Parameters:
-            * cell_id: str
+            * cell: Cell - an actual cell object
+            * evaluated: Dict[str, Any] - optional, values of cells that were already evaluated in this recalculation
         
-        Return Value: Tuple containing row and column values as strings (row, col)
+        Return value: Dict[str, SpreadsheetError] - the errors that occured, by the name of the cell they occured in
         """
 
-        # Getting index for seperation
-        for i, char in enumerate(cell_id):
-            if char.isdigit():
-                break
+        # Values of the cells that were evaluated in this update, shared by all of the dependent cells
+        if evaluated is None:
+            evaluated = {}
+        evaluated[cell.name] = self.__get_stored_value__(cell)
 
-        # Seperating row and column value
-        col = cell_id[:i]
-        row = cell_id[i:]
+        # Getting the cells that depend on current cell in the order they should be evaluated, the first one is the cell itself
+        order = self.dependency_graph.get_recalc_order([cell.name])
+        self.value_cache.invalidate(order[1:])
 
-        return row, col.upper()
+        return self.evaluate_order(order[1:], evaluated)
 
 
-    def get_cell_formula(self, cell_name) -> str:
+    def evaluate_order(self, order: List[str], evaluated: Dict[str, Any], edited: Container[str] = ()) -> Dict[str, SpreadsheetError]:
         """
-        Function get_cell_formula
-        The function returns a given cell's formula using it's id
+        Function evaluate_order
+        The function evaluates cells by a recalculation order and stores their values. Big recalculations are split into levels of cells
+        that do not depend on each other, and big levels are evaluated in parallel.
+        In case of an error, it changes the cell's value to the corresponding error value and moves on to the next one.
+
+        Parameters:
+            * order: List[str] - names of the cells, every cell after all of the cells it depends on
+            * evaluated: Dict[str, Any] - values of cells that were already evaluated in this recalculation, updated with the new values
+            * edited: Container[str] - cells that were edited, an edited cell that fails is set to the error like edit_cell does.
+                      Other cells keep their formulas, so they can recover later
+
+        Return value: Dict[str, SpreadsheetError] - the errors that occured, by the name of the cell they occured in
+        """
+
+        with self.notifier:
+            errors: Dict[str, SpreadsheetError] = {}
+
+            if self.parallel_recalc.should_run(len(order)) or (self.metrics is not None and order):
+                levels = self.dependency_graph.get_recalc_levels(order)
+            else:
+                levels = [order]
+
+            if self.metrics is not None:
+                self.metrics.propagation_cells.observe(len(order))
+                self.metrics.propagation_depth.observe(len(levels) if order else 0)
+
+            for level in levels:
+                names = []
+
+                # Regular values need no evaluation, they are read from the values store
+                for name in level:
+                    if self.is_formula(self.__get_cell_by_name__(name).formula):
+                        names.append(name)
+                    else:
+                        evaluated[name] = self.__get_stored_value__(self.__get_cell_by_name__(name))
+
+                # Evaluating cell by cell, every result is stored before the next cell is evaluated
+                if self.parallel_recalc.should_run(len(names)):
+                    results = self.parallel_recalc.evaluate(self, names, evaluated)
+                else:
+                    results = ((name, self.__evaluate_cell__(name, evaluated)) for name in names)
+
+                for name, value in results:
+                    curr_cell = self.__get_cell_by_name__(name)
+
+                    # Taking care of an error if any has occured
+                    if isinstance(value, SpreadsheetError):
+                        errors[name] = value
+                        self.__count_error__(value)
+
+                        if name in edited:
+                            self.__set_edited_cell_error__(curr_cell, value)
+                            evaluated[name] = self.__get_stored_value__(curr_cell)
+                        else:
+                            evaluated[name] = value
+                            self.value_cache.set(name, value)
+                            self.__store_cell_error__(curr_cell, value)
+
+                    else:
+                        evaluated[name] = value
+                        self.value_cache.set(name, value)
+                        self.__store_cell_value__(curr_cell, value)
+
+            return errors
+
+
+    def __evaluate_cell__(self, cell_name: str, evaluated: Dict[str, Any]) -> Union[str, int, float, SpreadsheetError]:
+        """
+        Function __evaluate_cell__
+        An auxiliary function that evaluates a formula cell without storing its value
 
         Parameters:
             * cell_name: str
+            * evaluated: Dict[str, Any] - values of cells that were already evaluated in this recalculation
         
-        Return Value: str - the formula of the cell, usually starts with '=', unless user just put a value and then its just the value
+        Return value: the value of the cell, or the SpreadsheetError that occured
         """
+
+        try:
+            return self.__evaluate_expression__(self.__get_cell_by_name__(cell_name).formula, cell_name, evaluated)
+        except SpreadsheetError as error:
+            return error
+
+
+    def __set_cell_precedents__(self, cell: Cell, formula: str, check_circles=True) -> None:
+        """
+        Function __set_cell_precedents__
+        The function registers the cells that a new formula refers to in the dependency graph, and makes sure it does not create a circle.
+
+        Parameters:
+            * cell: Cell - the cell that is being edited
+            * formula: str - the cell's new formula
+            * check_circles: bool - by defult True. Batches look for circles once, when they end
         
-        # Getting cell by it's id
-        cell = self.__get_cell_by_name__(cell_name)
+        Return Value: None
 
-        return cell.get_formula()
+        Exceptions: CircularReferenceError if the formula refers to the cell itself, directly or not. Errors of the formula parsing.
+        """
 
+        if not self.is_formula(formula):
+            self.dependency_graph.set_precedents(cell.name)
+            return
 
-    def __update_cell_dependencies__(self, cell: Cell) -> None:
+        compiled = self.formula_compiler.compile(formula)
+
+        # Ranges as cells indexes, making sure the cells exist
+        ranges = []
+        for call in compiled.range_calls:
+            start_row, start_col = self.__cell_location__(call.start)
+            stop_row, stop_col = self.__cell_location__(call.stop)
+            ranges.append((start_row, stop_row, start_col, stop_col))
+
+        references = [self.__get_cell_by_name__(token).name for token in compiled.precedents]
+
+        # The formula creates a circle if it refers to one of the cells that depend on the current cell
+        for dependent in self.dependency_graph.get_recalc_order([cell.name]) if check_circles else ():
+            row, col = self.__cell_location__(dependent)
+
+            if dependent in references or any(start_row <= row <= stop_row and start_col <= col <= stop_col for start_row, stop_row, start_col, stop_col in ranges):
+                raise CircularReferenceError(f"Circular Reference at cell: {cell.name}")
+
+        self.dependency_graph.set_precedents(cell.name, references, ranges)
+
+
+    def __store_cell_value__(self, cell: Cell, value: Union[str, int, float]) -> None:
         """
-        Function __update_cell_dependencies__
-        The function recives a cell and gets its dependent cells - the ones that depend on its value, and updates every one of them with the new value recursively.
-        In case of an error, it changes the value to the corresponding error value.
+        Function __store_cell_value__
+        The function stores the new value of a cell in the values store, and updates the cell object with the value as it is shown.
 
         Parameters:
-            * cell: Cell - an actual cell object
+            * cell: Cell
+            * value: Union[str, int, float] - a number or a string
         
-        Return value: None
+        Return Value: None
+        """
 
-        Exceptions: Function raises an exception of the type SpreadsheetError. It raises the specific error it cateches.
+        row, col = cell.get_index()
+        self.__write_value__(row, col - 1, self.values.set, value)
+        self.__set_cell_value__(cell, self.values.get_text(row, col - 1))
+
+
+    def __store_cell_error__(self, cell: Cell, error: SpreadsheetError) -> None:
         """
+        Function __store_cell_error__
+        The function stores the value of an error that occured in a cell in the values store and in the cell object.
 
-        # Getting cells that depend on current cell
-        deps = cell.get_dependent_cell()
+        Parameters:
+            * cell: Cell
+            * error: SpreadsheetError
+        
+        Return Value: None
+        """
 
-        # Going over the tokens of the cells
-        for token in deps:
+        row, col = cell.get_index()
+        self.__write_value__(row, col - 1, self.values.set_error, error.VALUE)
+        self.__set_cell_value__(cell, error.VALUE)
 
-            # Gettingn actual cell object for each token
-            curr_cell = self.__get_cell_by_name__(token)
-            row, col = self.__cell_name_tuple__(token)
 
-            try:
-                # Getting cell new value after the original cell has changed
-                value = self.evaluate_cell_value(curr_cell.formula, token)
-                curr_cell.set_value(value)
+    def __set_cell_value__(self, cell: Cell, value: str) -> None:
+        """
+        Function __set_cell_value__
+        An auxiliary function that sets the value a cell shows, and records the change if the value is different
+        """
 
-                # Recursively updating the current cell's dependent cells
-                self.__update_cell_dependencies__(curr_cell)
+        if self.notifier.observers and cell.value != value:
+            self.notifier.changes.values.add(cell.name)
 
-                # Updating the dataframe
-                self.cells_df.at[row, col] = value
+        cell.set_value(value)
 
-            # Taking care of an error if any has occured
-            except SpreadsheetError as error:
 
-                # Getting corresponding error's value
-                error_val =  error.VALUE   #Spreadsheet.__ERRORS_INFO[type(error)]
+    def __set_cell_formula__(self, cell: Cell, formula: str) -> None:
+        """
+        Function __set_cell_formula__
+        An auxiliary function that sets the formula of a cell, and records the change if the formula is different
+        """
 
-                # Updating cell's value with error value
-                curr_cell.set_value(error_val)
-                row, col = self.__cell_name_tuple__(token)
-                self.cells_df.at[row, col] = error_val
+        if self.notifier.observers and cell.formula != formula:
+            self.notifier.changes.formulas.add(cell.name)
 
-                raise error
+        cell.set_formula(formula)
+
+
+    def __write_value__(self, row: int, col: int, write: Callable[[int, int, Any], None], value: Any) -> None:
+        """
+        Function __write_value__
+        An auxiliary function that writes a value to the values store, and keeps the values indexes up to date.
+
+        Parameters:
+            * row, col: int - indexes in the values store, both start from 0
+            * write: Callable - the store's function to write with
+            * value: the value to write
+        
+        Return Value: None
+        """
+
+        if self.range_index is not None:
+            self.range_index.remove_cell(row, col)
+        self.value_index.remove_cell(row, col)
+
+        write(row, col, value)
+
+        if self.range_index is not None:
+            self.range_index.add_cell(row, col)
+        self.value_index.add_cell(row, col)
+
+
+    def __get_stored_value__(self, cell: Cell) -> Union[str, int, float]:
+        """
+        Function __get_stored_value__
+        Returns the value of a cell from the values store - a number for numeral values, a string otherwise
+        """
+
+        row, col = cell.get_index()
+        return self.values.get(row, col - 1)
+
+
+    def __cache_cell_value__(self, cell: Cell) -> None:
+        """
+        Function __cache_cell_value__
+        The function stores the value of a cell that was just evaluated in the values cache, only formulas values are cached.
+
+        Parameters:
+            * cell: Cell
+        
+        Return Value: None
+        """
+
+        if self.is_formula(cell.formula):
+            self.value_cache.set(cell.name, self.__get_stored_value__(cell))
+        else:
+            self.value_cache.discard(cell.name)
 
 
-    def edit_cell(self, cell_name: str, new_val: str) -> None:
+    def add_observer(self, observer: Callable[[Changeset], None]) -> None:
+        """
+        Function add_observer
+        The function adds a function that is called with the changes of every edit, batch and recalculation, once it is done.
+        Edits made on another thread (see RecalcScheduler) call it on that thread.
+
+        Parameters:
+            * observer: Callable[[Changeset], None]
+        
+        Return Value: None
+        """
+        self.notifier.observers.append(observer)
+
+
+    def remove_observer(self, observer: Callable[[Changeset], None]) -> None:
+        """
+        Function remove_observer
+        The function stops calling a function that was added with add_observer
+        """
+        self.notifier.observers.remove(observer)
+
+
+    def set_cell_design(self, cell_name: Union[str, CellRef], bg: Optional[str] = None, fg: Optional[str] = None) -> None:
+        """
+        Function set_cell_design
+        The function sets the colors of a cell, a color that is not given stays the same
+
+        Parameters:
+            * cell_name: str or CellRef
+            * bg: str - background color
+            * fg: str - text color
+        
+        Return Value: None
+        """
+
+        with self.notifier:
+            cell = self.__get_cell_by_name__(cell_name)
+            style = (bg or cell.bg, fg or cell.fg)
+
+            if self.notifier.observers and style != cell.style:
+                self.notifier.changes.styles.add(cell.name)
+
+            cell.set_design(bg=style[0], fg=style[1])
+
+
+    def edit_cell(self, cell_name: Union[str, CellRef], new_val: str) -> None:
         """
         Function edit_cell
         The function edits the cell's value while making sure it's possible. The function takes care of errors if any occur.
+        Every cell that depends on the edited cell is updated as well.
+        Inside a batch, the cell is evaluated when the batch ends and errors are kept in the batch instead of being raised.
 
         Parameters:
             * cell_name: str
@@ -197,41 +470,309 @@ class Spreadsheet:
         
         Return Value: None
         """
-        # Gettin current cell and updating its formula to the new value
-        cell = self.__get_cell_by_name__(cell_name)
-        cell.set_formula(new_val)
-        row, col = self.__cell_name_tuple__(cell_name)
+
+        with self.notifier:
+            if self.current_batch is not None:
+                self.__edit_in_batch__(cell_name, new_val)
+                return
+
+            start = perf_counter() if self.metrics is not None else 0.0
+
+            # Gettin current cell and updating its formula to the new value
+            cell = self.__get_cell_by_name__(cell_name)
+            self.__set_cell_formula__(cell, new_val)
+
+            try:
+                # Registering the cells the formula refers to and evalueating new cell value based on the formula if any
+                self.__set_cell_precedents__(cell, new_val)
+                evaluated = {}
+                final_value = self.__evaluate_expression__(new_val, cell.name, evaluated)
+
+                # If no errors occured, actually changing the value
+                self.__store_cell_value__(cell, final_value)
+                self.__cache_cell_value__(cell)
+
+            # Taking care of errors that may occur
+            except SpreadsheetError as error:
+                self.__set_edited_cell_error__(cell, error)
+                self.__count_error__(error)
+
+                # Updating dependencies as well
+                self.__update_cell_dependencies__(cell)
+                self.__record_edit__('edit_cell', start)
+                raise error
+
+            # Updating the cells that depend on the new value
+            self.__update_cell_dependencies__(cell, evaluated)
+            self.__record_edit__('edit_cell', start)
+
+
+    def edit_cells(self, cells: Dict[Union[str, CellRef], str], keep_formulas: bool = False) -> Dict[str, SpreadsheetError]:
+        """
+        Function edit_cells
+        The function edits many cells at once. All of the cells are written first, and then every cell that was edited or depends
+        on an edited cell is evaluated exactly once, in dependency order. An error in a cell does not stop the other cells from being edited.
+
+        Parameters:
+            * cells: Dict[str or CellRef, str] - cell name -> new value
+            * keep_formulas: bool - by defult False. True for loading a sheet, cells that fail keep their formulas (see EditBatch)
         
-        final_value = SpreadsheetError.VALUE
+        Return Value: Dict[str, SpreadsheetError] - the errors that occured, by the name of the cell they occured in.
+                      Inside another batch the cells are evaluated when it ends, and its errors are returned so far.
+        """
 
-        try:
-            # Evalueating new cell value based on the formula if any
-            final_value = self.evaluate_cell_value(new_val, cell_name)
+        with self.batch(keep_formulas) as batch:
+            for cell_name, new_val in cells.items():
+                self.edit_cell(cell_name, new_val)
+
+        return batch.errors
+
+
+    @contextmanager
+    def batch(self, keep_formulas: bool = False) -> Iterator[EditBatch]:
+        """
+        Function batch
+        A context manager for a batch of edits - every edit_cell inside it only writes the cell, and the cells are evaluated together
+        when the context ends, even if it ends with an exception. Batches inside a batch are part of it.
+
+        Usage:
+            with spreadsheet.batch() as batch:
+                spreadsheet.edit_cell('A1', '=A2+1')
+                spreadsheet.edit_cell('A2', '5')
+            errors = batch.errors
+
+        Parameters:
+            * keep_formulas: bool - by defult False. True for loading a sheet, cells that fail keep their formulas (see EditBatch).
+                             A batch inside a batch is part of it, and has its way of handling errors
+
+        Return Value: Iterator[EditBatch] - the batch, with the edited cells and the errors that occured
+        """
+
+        if self.current_batch is not None:
+            yield self.current_batch
+            return
+
+        batch = self.current_batch = EditBatch(keep_formulas)
+        start = perf_counter() if self.metrics is not None else 0.0
+
+        with self.notifier:
+            try:
+                yield batch
+            finally:
+                self.current_batch = None
+                self.__commit_batch__(batch)
+                self.__record_edit__('batch', start)
 
-            # If no errors occured, actually changing the value and updating dependencies
-            cell.set_value(final_value)
-            self.__update_cell_dependencies__(cell)
 
-            # Updating grid
-            self.cells_df.at[row, col] = str(final_value)
+    def __edit_in_batch__(self, cell_name: Union[str, CellRef], new_val: str) -> None:
+        """
+        Function __edit_in_batch__
+        An auxiliary function that edits a cell inside a batch - the cell's formula and precedents are set and regular values are stored,
+        formulas are evaluated when the batch ends.
 
-        # Taking care of errors that may occur
+        Parameters:
+            * cell_name: str or CellRef
+            * new_val: str
+        
+        Return Value: None
+        """
+
+        batch = self.current_batch
+
+        try:
+            cell = self.__get_cell_by_name__(cell_name)
         except SpreadsheetError as error:
+            batch.add_error(str(cell_name), error)
+            self.__count_error__(error)
+            return
+
+        self.__set_cell_formula__(cell, new_val)
+        batch.add_cell(cell.name)
+
+        try:
+            self.__set_cell_precedents__(cell, new_val, check_circles=False)
+        except SpreadsheetError as error:
+            self.__set_batch_cell_error__(batch, cell, error)
+            return
+
+        if not self.is_formula(new_val):
+            self.__store_cell_value__(cell, new_val)
+            self.value_cache.discard(cell.name)
+
+
+    def stage_cells(self, cells: Dict[Union[str, CellRef], str], pending: Iterable[str] = ()) -> Tuple[EditBatch, List[str]]:
+        """
+        Function stage_cells
+        The function writes cells like a batch does, without evaluating them. It is used by whoever evaluates the cells later,
+        for example in parts on another thread.
+
+        Parameters:
+            * cells: Dict[str or CellRef, str] - cell name -> new value
+            * pending: Iterable[str] - names of cells that were staged before and were not evaluated yet, they are evaluated with the new ones
+
+        Return Value: Tuple of the batch, with the edited cells and the errors that occured so far,
+                      and the names of the cells to evaluate by their order (see evaluate_order)
+        """
+
+        batch = self.current_batch = EditBatch()
+        start = perf_counter() if self.metrics is not None else 0.0
+
+        with self.notifier:
+            try:
+                for cell_name, new_val in cells.items():
+                    self.edit_cell(cell_name, new_val)
+            finally:
+                self.current_batch = None
 
-            # Getting error value and updating cell's value and formula accordingly
-            error_value = error.VALUE #Spreadsheet.__ERRORS_INFO[type(error)]
-            cell.set_formula(error_value)
-            cell.set_value(error_value)
+            order = self.__prepare_batch__(batch, pending)
+            self.__record_edit__('staged', start)
 
-            # Updating dataframe as well
-            self.cells_df.at[row, col] = error_value
-            raise error
+            return batch, order
+
+
+    def __commit_batch__(self, batch: EditBatch) -> None:
+        """
+        Function __commit_batch__
+        An auxiliary function that evaluates the cells of a batch that ended and every cell that depends on them, each one exactly once
+        and after all of the cells it depends on. Errors are kept in the batch like edit_cell would raise them - an edited cell that fails
+        is set to the error unless the batch keeps formulas, a dependent cell keeps its formula.
+
+        Parameters:
+            * batch: EditBatch
+        
+        Return Value: None
+        """
+
+        order = self.__prepare_batch__(batch)
+        batch.errors.update(self.evaluate_order(order, {}, () if batch.keep_formulas else batch.cells))
+
+
+    def __prepare_batch__(self, batch: EditBatch, pending: Iterable[str] = ()) -> List[str]:
+        """
+        Function __prepare_batch__
+        An auxiliary function that breaks the circles a batch created and returns the cells that should be evaluated because of it
+
+        Parameters:
+            * batch: EditBatch
+            * pending: Iterable[str] - more cells to evaluate
+
+        Return Value: List[str] - the edited cells, the pending cells and every cell that depends on them, in recalculation order
+        """
+
+        # Every circle the batch created is broken at the cell that was edited last in it, the edit that would have failed by itself
+        edit_order = {name: i for i, name in enumerate(batch.cells)}
+        roots = [*batch.cells, *pending]
+        order, circle = self.dependency_graph.topological_sort(roots)
+
+        while circle:
+            cell = self.__get_cell_by_name__(max((name for name in circle if name in edit_order), key=edit_order.get))
+            error = CircularReferenceError(f"Circular Reference at cell: {cell.name}")
+
+            self.__set_batch_cell_error__(batch, cell, error)
+            order, circle = self.dependency_graph.topological_sort(roots)
+
+        self.value_cache.invalidate(order)
+
+        return order
+
+
+    def recalculate(self) -> Dict[str, SpreadsheetError]:
+        """
+        Function recalculate
+        The function evaluates every formula in the spreadsheet again, each one exactly once and after all of the cells it depends on.
+
+        Parameters: None
+
+        Return Value: Dict[str, SpreadsheetError] - the errors that occured, by the name of the cell they occured in
+        """
+
+        start = perf_counter() if self.metrics is not None else 0.0
+        formulas = [cell.name for cell in self.iter_cells() if self.is_formula(cell.formula)]
+
+        order = self.dependency_graph.get_recalc_order(formulas)
+        self.value_cache.invalidate(order)
+
+        errors = self.evaluate_order(order, {})
+        self.__record_edit__('recalculate', start)
+
+        return errors
+
+
+    def __record_edit__(self, kind: str, start: float) -> None:
+        """
+        Function __record_edit__
+        An auxiliary function that counts an edit and its time in the metrics, if there are any
+
+        Parameters:
+            * kind: str - edit_cell, batch, staged or recalculate
+            * start: float - perf_counter time the edit started at
+        """
+
+        if self.metrics is not None:
+            self.metrics.edits.inc(label=kind)
+            self.metrics.edit_seconds.observe(perf_counter() - start, kind)
+
+
+    def __count_error__(self, error: SpreadsheetError) -> None:
+        """
+        Function __count_error__
+        An auxiliary function that counts an error that was set to a cell in the metrics, by its type, if there are any
+        """
+
+        if self.metrics is not None:
+            self.metrics.errors.inc(label=type(error).__name__)
+
+
+    def __set_edited_cell_error__(self, cell: Cell, error: SpreadsheetError) -> None:
+        """
+        Function __set_edited_cell_error__
+        An auxiliary function that sets a cell that could not be edited to the error that occured.
+        The error's value replaces the cell's formula, so the cell does not refer to any cell anymore.
+
+        Parameters:
+            * cell: Cell
+            * error: SpreadsheetError
+        
+        Return Value: None
+        """
+
+        self.__set_cell_formula__(cell, error.VALUE)
+        self.__store_cell_error__(cell, error)
+        self.dependency_graph.set_precedents(cell.name)
+        self.__cache_cell_value__(cell)
+
+
+    def __set_batch_cell_error__(self, batch: EditBatch, cell: Cell, error: SpreadsheetError) -> None:
+        """
+        Function __set_batch_cell_error__
+        An auxiliary function that sets an error to a cell of a batch that could not be edited, and keeps it in the batch.
+        A batch that keeps formulas stores the error as the cell's value only and keeps the formula, the cell stops referring to other cells
+        so it can not be part of a circle.
+
+        Parameters:
+            * batch: EditBatch
+            * cell: Cell
+            * error: SpreadsheetError
+        
+        Return Value: None
+        """
+
+        if batch.keep_formulas:
+            self.__store_cell_error__(cell, error)
+            self.dependency_graph.set_precedents(cell.name)
+            self.__cache_cell_value__(cell)
+        else:
+            self.__set_edited_cell_error__(cell, error)
+
+        batch.add_error(cell.name, error)
+        self.__count_error__(error)
 
 
     def evaluate_cell_value(self, expression: str, original_cell_name: str) -> Optional[str]:
         """
         Function evaluate_cell_value
-        The function recursovley going through cells and their dependencies and reaching the final value. If any errors occur, the function raises a matching SpreadSheetError.
+        The function goes through cells and their dependencies and reaches the final value. If any errors occur, the function raises a matching SpreadSheetError.
+        The cells the formula depends on are evaluated using a stack instead of recursion, so there is no limit to the length of a chain of references.
 
         Parameters:
             * expression: str - may be a fomula or just a regular value
@@ -240,6 +781,25 @@ class Spreadsheet:
         Return Value: Optional[str] - The final value of the cell, might raise an error if any occures.
         """
 
+        value = self.__evaluate_expression__(expression, original_cell_name)
+
+        return value if value is None else str(value)
+
+
+    def __evaluate_expression__(self, expression: str, original_cell_name: str, evaluated: Optional[Dict[str, Any]] = None) -> Union[str, int, float, None]:
+        """
+        Function __evaluate_expression__
+        An auxiliary function that evaluates an expression like evaluate_cell_value does, but returns numeral values as numbers.
+
+        Parameters:
+            * expression: str - may be a fomula or just a regular value
+            * original_cell_name: str - the cell to store the new value in
+            * evaluated: Dict[str, Any] - optional, values of cells that were already evaluated in the current recalculation (or their errors).
+                         Every cell that is evaluated is added to it, so it is never evaluated twice.
+        
+        Return Value: Union[str, int, float, None] - The final value of the cell, might raise an error if any occures.
+        """
+
         # Base-case checks
         if expression is None or expression == Cell.EMPTY_CELL:
             return expression
@@ -248,54 +808,157 @@ class Spreadsheet:
         if not self.is_formula(expression):
             return expression
 
-        # Uppering all of the values in order to evaluate porperly
+        # Uppering cell name in order to evaluate porperly
         original_cell_name = original_cell_name.upper()
-        expression = expression.upper()
 
-        # Getting rid of any spaces and getting rid of '=' sign
-        expression = expression[1:].replace(' ', '')
+        # Getting the parsed formula - parsed only the first time it is seen
+        compiled: CompiledFormula = self.formula_compiler.compile(expression)
 
-        # Calculating any supported function if there are any, updating the formula accordingly
-        formula = self.__calculate_ranged_funcs__(expression, original_cell_name)
+        # Checking for circular reference, raising matching error if found
+        if original_cell_name in compiled.precedents:
+            raise CircularReferenceError(f"Circular Reference at cell: {original_cell_name}")
 
+        if evaluated is None:
+            evaluated = {}
 
-        # Getting all of the tokens of cell names that appear in the formula in order to evaluate their values
-        tokens: List[str] = findall(Spreadsheet.__CELL_NAME_RGULAR_EXPRESSION, formula)
+        # Evaluating the cells the formula refers to before the formula itself
+        self.__evaluate_references__(compiled.precedents, original_cell_name, evaluated)
+
+        return self.__evaluate_compiled__(compiled, original_cell_name, evaluated)
+
+
+    def __evaluate_references__(self, references: Iterable[str], original_cell_name: str, evaluated: Dict[str, Any]) -> None:
+        """
+        Function __evaluate_references__
+        An auxiliary function that evaluates the given cells and every cell they depend on, each one after the cells it depends on.
+        It uses a stack of cells to evaluate instead of recursion.
+
+        Parameters:
+            * references: Iterable[str] - names of the cells to evaluate
+            * original_cell_name: str - the cell the evaluation started from, none of the cells may refer to it
+            * evaluated: Dict[str, Any] - values of cells that were already evaluated (or their errors), updated with the new values
         
-        # Checking for circular reference, raising matching error if found
-        if original_cell_name in tokens:
-            raise CircularReferenceError(f"Circular Reference at cell: {original_cell_name}")
+        Return Value: None
+
+        Exceptions: SpreadsheetError of the first cell that could not be evaluated
+        """
+
+        # Cells waiting for evaluation, and cells whose references are being evaluated at the moment
+        stack = [name for name in references if name not in evaluated]
+        stack.reverse()
+        visiting = set()
+
+        while stack:
+            name = stack[-1]
+
+            # Cell might have been pushed twice, from two cells that refer to it
+            if name in evaluated:
+                stack.pop()
+                continue
+
+            cell = self.__get_cell_by_name__(name)
+
+            # Regular values need no evaluation, they are read from the values store
+            if not self.is_formula(cell.formula):
+                evaluated[name] = self.__get_stored_value__(cell)
+                stack.pop()
+                continue
+
+            # Cells that did not change since they were last evaluated are not evaluated again
+            cached = self.value_cache.get(name)
+            if cached is not ValueCache.MISSING:
+                evaluated[name] = cached
+                stack.pop()
+                continue
+
+            compiled = self.formula_compiler.compile(cell.formula)
+
+            # First time the cell is reached, its references should be evaluated before it
+            if name not in visiting:
+
+                if original_cell_name in compiled.precedents:
+                    raise CircularReferenceError(f"Circular Reference at cell: {original_cell_name}")
+
+                visiting.add(name)
+                pending = [reference for reference in compiled.precedents if reference not in evaluated]
+
+                for reference in pending:
+                    if reference in visiting:
+                        raise CircularReferenceError(f"Circular Reference at cell: {reference}")
+
+                if pending:
+                    pending.reverse()
+                    stack.extend(pending)
+                    continue
+
+            # All of the cell's references are evaluated
+            stack.pop()
+            visiting.discard(name)
+
+            try:
+                value = self.__evaluate_compiled__(compiled, original_cell_name, evaluated)
+            except SpreadsheetError as error:
+                self.value_cache.set(name, error)
+                raise error
+
+            evaluated[name] = value
+            self.value_cache.set(name, value)
+
+
+    def __evaluate_compiled__(self, compiled: CompiledFormula, original_cell_name: str, evaluated: Dict[str, Any]) -> Union[str, int, float]:
+        """
+        Function __evaluate_compiled__
+        An auxiliary function that calculates the value of a compiled formula, once all of the cells it refers to are evaluated.
+
+        Parameters:
+            * compiled: CompiledFormula
+            * original_cell_name: str - the cell the evaluation started from
+            * evaluated: Dict[str, Any] - values of the cells the formula refers to
         
+        Return Value: Union[str, int, float] - the value of the formula, numbers for numeral values
+
+        Exceptions: SpreadsheetError matching the error that occured
+        """
+
+        # Calculating any supported range function if there are any, their values are stored by their placeholders
+        range_values = {call.placeholder: self.__calculate_range_call__(call, original_cell_name, evaluated) for call in compiled.range_calls}
+
+        # Getting all of the tokens of cell names that appear in the formula in order to evaluate their values
+        tokens = compiled.tokens
+
         # Calculate each value for every token in the formula if any
         if tokens:
             values = {}
-            for token in tokens:
+            for token in compiled.references:
+                value = evaluated[token]
 
-                # Getting actual cell object by its name
-                cell = self.__get_cell_by_name__(token)
+                # A cell the formula refers to has failed, so does the formula
+                if isinstance(value, SpreadsheetError):
+                    raise value
 
-                # Recursively creating a dictionary of cells names and thier values, updating cell's dependent cells
-                values[token] = self.evaluate_cell_value(cell.formula, original_cell_name)
-                cell.add_dependent_cell(original_cell_name)
+                values[token] = value
 
             # Replacing empty cells with 0 for calcuation purpuses
-            values = {key: value if value != Cell.EMPTY_CELL else '0' for key, value in values.items()}
+            values = {key: value if value != Cell.EMPTY_CELL else 0 for key, value in values.items()}
 
             # Covering a case where the user inserts only one cell and that cell contains a string value
-            if len(tokens) == 1:
-                string_to_check = formula.replace(tokens[0], "").strip()
-                if not string_to_check:
-                    return values[tokens[0].upper()]
+            if compiled.is_reference:
+                return values[tokens[0]]
 
             # Changin values in the dictionary to numeral values if possible, raising an error if not
             if self.__str_values_to_numeric__(values):
 
-                # Adding supported functions to the values dictionary
+                # Adding supported functions and range functions values to the values dictionary
                 values.update(self.SUPPORTED_FUNCTIONS)
+                values.update(range_values)
+
+                # Formula could not be compiled
+                if compiled.code is None:
+                    raise FunctionSyntaxError("Invalid syntax for function")
 
                 try:
                    # Evaluating mathematical value based on formulas an actions
-                   return_value = str(eval(formula, values))
+                   return_value = eval(compiled.code, values)
                 
                 # Taking care of errors that may occure
                 except NameError:
@@ -309,8 +972,14 @@ class Spreadsheet:
 
         else:
             # In case there arent any tokens, evaluating value for mathematical value
+            values = dict(self.SUPPORTED_FUNCTIONS)
+            values.update(range_values)
+
             try:
-                return_value = str(eval(formula, self.SUPPORTED_FUNCTIONS))
+                if compiled.code is None:
+                    raise SyntaxError(compiled.expression)
+
+                return_value = eval(compiled.code, values)
             
             # Taking care of errors that may occure
             except ZeroDivisionError:
@@ -318,6 +987,10 @@ class Spreadsheet:
             except:
                 raise FormulaValueError("Forula format is invalid. Can only contain cell names, numbers and supported functions. Formula must contain at least two values!")
 
+        # Only numbers are kept as they are, any other result is a string like it is shown to the user
+        if isinstance(return_value, bool) or not isinstance(return_value, (int, float)):
+            return_value = str(return_value)
+
         return return_value
 
 
@@ -337,38 +1010,158 @@ class Spreadsheet:
         return False
 
 
-    def __get_cell_by_name__(self, cell_name: str) -> Cell:
+    def __cell_location__(self, cell_name: Union[str, CellRef]) -> Tuple[int, int]:
         """
-        Function __get_cell_by_name__
-        An auxiliary function that returns a Cell object based on its id.
+        Function __cell_location__
+        An auxiliary function that returns the index of a cell based on its id, in the same form as the cell's index - (row, col).
+        Rows start from 0 and columns start from 1.
 
         Parameters:
-            * cell_name: str
+            * cell_name: str or CellRef
         
-        Return Value: Cell object
+        Return Value: Tuple[int, int]
+
+        Exceptions: CellLocationError if the cell does not exist
         """
 
-        # Speprating row and col values from the id
-        row, col = self.__cell_name_tuple__(cell_name)
+        ref = self.cell_ref(cell_name)
 
-        cols = self.cells_df.columns.to_list()
+        return ref.row, ref.col
 
-        # Setting row index
-        row_index = int(row) - 1
 
-        found = False
+    def cell_ref(self, cell_name: Union[str, CellRef]) -> CellRef:
+        """
+        Function cell_ref
+        The function returns the reference of a cell in the spreadsheet by its name. References can be used instead of names
+        in all of the spreadsheet's functions, and save parsing the name again.
 
-        # Finding column index based on its name
-        for col_index, column in enumerate(cols):
-            if column == col:
-                found = True
-                break
+        Parameters:
+            * cell_name: str or CellRef - for example 'A4' or 'a4'
         
+        Return Value: CellRef
+
+        Exceptions: CellLocationError if the cell does not exist
+        """
+
+        ref = self.addresses.parse(cell_name)
+
         # Validating rows and cols
-        if row_index < 0 or row_index > len(self.cells_objs) - 1 or not found:
+        if ref.row >= self.rows or not 1 <= ref.col <= self.cols:
             raise CellLocationError("Cell Does not exist")
 
-        return self.cells_objs[row_index][col_index]
+        return ref
+
+
+    def __get_cell_by_name__(self, cell_name: Union[str, CellRef]) -> Cell:
+        """
+        Function __get_cell_by_name__
+        An auxiliary function that returns a Cell object based on its id. Cells objects are created the first time they are used.
+
+        Parameters:
+            * cell_name: str or CellRef
+        
+        Return Value: Cell object
+        """
+
+        ref = self.cell_ref(cell_name)
+        cell = self.cells.get(ref.position)
+
+        if cell is None:
+            cell = self.cells[ref.position] = Cell(ref.row, ref.col, ref.name)
+
+        return cell
+
+
+    def __find_cell__(self, cell_name: Union[str, CellRef]) -> Cell:
+        """
+        Function __find_cell__
+        An auxiliary function that returns a Cell object based on its id, for reading only.
+        A cell that was never used is not created, an empty cell object that is not part of the spreadsheet is returned instead.
+
+        Parameters:
+            * cell_name: str or CellRef
+        
+        Return Value: Cell object
+        """
+
+        ref = self.cell_ref(cell_name)
+        cell = self.cells.get(ref.position)
+
+        return cell if cell is not None else Cell(ref.row, ref.col, ref.name)
+
+
+    def __cell_at__(self, position: int) -> Optional[Cell]:
+        """
+        Function __cell_at__
+        An auxiliary function that returns the Cell object at a position (as in CellRef.position), or None if the cell was never used
+        """
+        return self.cells.get(position)
+
+
+    @property
+    def cells_objs(self) -> List[List[Cell]]:
+        """
+        Property cells_objs
+        Cells objects of the whole spreadsheet as a list of rows. Kept for compatibility - it creates every cell that was not used yet,
+        use iter_cells to go over the used cells only.
+        """
+        return [[self.__get_cell_by_name__(column + str(row + 1)) for column in self.columns_names] for row in range(self.rows)]
+
+
+    def iter_cells(self) -> Iterator[Cell]:
+        """
+        Function iter_cells
+        The function goes over the cells objects that were used (written, styled or referred to) by rows order.
+
+        Parameters: None
+
+        Return Value: Iterator[Cell]
+        """
+
+        # Packed positions are ordered by rows and then by columns
+        for position in sorted(self.cells):
+            yield self.cells[position]
+
+
+    def __check_cols__(self, cols: int) -> None:
+        """
+        Function __check_cols__
+        An auxiliary function that makes sure an amount of columns fits the spreadsheet - a cell's location is packed with a fixed amount of bits for its column,
+        so more columns would give two cells the same location
+
+        Exceptions: ValueError if there are more columns than CellRef.MAX_COLS
+        """
+
+        if cols > CellRef.MAX_COLS:
+            raise ValueError(f'A spreadsheet can have up to {CellRef.MAX_COLS} columns, got {cols}')
+
+
+    def __create_storage__(self) -> None:
+        """
+        Function __create_storage__
+        An auxiliary function that creates an empty values store and an empty cells objects table for the current size of the spreadsheet.
+        In sparse mode values are stored in tiles that are created only when they get a value,
+        so memory depends on the amount of used cells and not on the size of the spreadsheet.
+
+        Parameters: None
+
+        Return Value: None
+        """
+
+        # Typed values of the cells - numbers are stored as numbers
+        if self.sparse:
+            self.values = ChunkedValueStore(self.rows, self.cols)
+        else:
+            self.values = ValueStore(self.rows, self.cols)
+
+        # Packed position -> cell, for cells that were used
+        self.cells: Dict[int, Cell] = {}
+
+        # Prefix sums of the values, its regions are built when ranges over them are summed
+        self.range_index = PrefixSumIndex(self.values) if self.use_range_index else None
+
+        # Rows of every value by columns, a column is indexed the first time COUNTIF is calculated over it
+        self.value_index = ValueIndex(self.values)
 
 
     def __str_values_to_numeric__(self, values_dict: Dict[str,str]) -> bool:
@@ -412,78 +1205,56 @@ class Spreadsheet:
 
     #######                      SUPPORTED FUNCTIONS SECTION                    #######
 
-    def __calculate_ranged_funcs__(self, formula: str, target_cell: str) -> str:
+    def __calculate_range_call__(self, call: RangeCall, target_cell: str, evaluated: Dict[str, Any]) -> Union[int, float]:
         """
-        Function __calculate_ranged_funcs__
-        An auxiliary function that calls the right range function that the user has asked for. It returns a new formula without the functions in it, only values.
+        Function __calculate_range_call__
+        An auxiliary function that calls the right range function that the user has asked for and returns its value.
 
         Parameters:
-            * formula: str
+            * call: RangeCall - the parsed range function call
+            * target_cell: str - the cell the formula belongs to
+            * evaluated: Dict[str, Any] - values of the cells the formula refers to, including the cell of a COUNTIF condition
         
-        Return Value: str - the formula without the functions in it, values only
+        Return Value: Union[int, float] - the value of the function
         """
 
-        # Ranges cell's indexes in the matched tuple
-        START_CELL = 0
-        STOP_CELL = 1
-        CONDITION = 2
-
-        # Extracting needed functions from supported range functions dictionary
-        range_funcs = [func for func in self.RANGE_FUNCTIONS.keys() if func in formula]
-
-        # Going over every found function
-        for func in range_funcs:
+        call_func = self.RANGE_FUNCTIONS[call.func]
+        start = perf_counter() if self.metrics is not None else 0.0
 
-            if func == 'COUNTIF':
-                pattern = rf'COUNTIF\(({self.__CELL_NAME_RGULAR_EXPRESSION}),\s*({self.__CELL_NAME_RGULAR_EXPRESSION}),\s*(.*)\)'
-            else:
+        # Getting row and cols indexes of start and stop cells
+        start_r, start_c = self.__cell_location__(call.start)
+        stop_r, stop_c = self.__cell_location__(call.stop)
 
-                # Creating pattern to look for per function and getting all matches
-                pattern = rf'{func}\(({self.__CELL_NAME_RGULAR_EXPRESSION}),\s*({self.__CELL_NAME_RGULAR_EXPRESSION})\)'
-        
+        # Covering circular references
+        target_r, target_c = self.__cell_location__(target_cell)
+        if start_r <= target_r <= stop_r and start_c <= target_c <= stop_c:
+            raise CircularReferenceError(f"Circular Reference at cell: {target_cell}")
 
-            matches = findall(pattern, formula)
+        # Values of the range as views of the values store
+        range_values = self.values.range_values(start_r, stop_r + 1, start_c - 1, stop_c)
 
-            # Taking care of errors
-            if not matches:
-                raise FormulaValueError("Function not being called correctly")
-            
-            # Getting function to call
-            call_func = self.RANGE_FUNCTIONS[func]
+        if call.func == 'COUNTIF':
 
+            # Condition may be one cell name or a value, a condition cell that failed fails the formula
+            condition = call.condition
+            if call.condition_ref:
+                condition = evaluated[call.condition_ref]
 
-            # For each match, calling function and calculating value
-            for attrs in matches:
-                
-                if call_func == self.RANGE_FUNCTIONS['COUNTIF']:
-                    # New df with range
-                    ranged_df: pd.DataFrame = self.__get_df_by_range__(attrs[START_CELL], attrs[STOP_CELL], target_cell, count_func=True)
-                    new_val = self.__count_if__(ranged_df, attrs[CONDITION])
-                    func_replace = func + '(' + str(attrs[0]) + ',' + str(attrs[1]) + ',' + str(attrs[2]) + ')'
-                else:
-                    count_func = call_func == self.RANGE_FUNCTIONS['COUNTNUMS']
-                    # New df with range
-                    ranged_df: pd.DataFrame = self.__get_df_by_range__(attrs[START_CELL], attrs[STOP_CELL], target_cell, count_func=count_func)
-                    new_val = call_func(ranged_df)
-
-                    # Creating the function again in order to remove it from the string
-                    func_replace = func + '(' + str(attrs[0]) + ',' + str(attrs[1]) +')'
+                if isinstance(condition, SpreadsheetError):
+                    raise condition
 
-                # Updating cells dependencies
-                rows = ranged_df.index.to_list()
-                cols = ranged_df.columns.to_list()
+            new_val = call_func(range_values, condition)
+        else:
+            new_val = call_func(range_values)
 
-                for row in rows:
-                    for col in cols:
-                        cell_id = col+row
-                        cell = self.__get_cell_by_name__(cell_id)
-                        self.__update_cell_dependencies__(cell)
+        # Numpy scalars are turned into python numbers, so they are evaluated exactly like literal values
+        if isinstance(new_val, np.generic):
+            new_val = new_val.item()
 
-                
-                # Replacing function with actual value
-                formula = formula.replace(func_replace, str(new_val))
+        if self.metrics is not None:
+            self.metrics.range_seconds.observe(perf_counter() - start, call.func)
 
-        return formula
+        return new_val
 
 
     def __sqrt__(self, arg: Union[int, float]) -> float:
@@ -553,133 +1324,152 @@ class Spreadsheet:
         return args__sum__ / division
 
 
-    def __sum_by_range__(self, range_df: pd.DataFrame) -> Union[int, float]:
+    def __sum_by_range__(self, range_values: RangeValues) -> Union[int, float]:
         """
         Function __sum_by_range__
-        The Function gets two parameters only: start and stop. ignores any cells with errors. Calculates the sum of the cells in the given range
+        The Function gets two parameters only: start and stop. Calculates the sum of the cells in the given range, empty cells are 0.
+        Every block of the range is summed at once, the result is an int unless there are floats in the range.
 
         Parameters:
-            * range_df: DataFrame - The cut dataframe to calculate
+            * range_values: RangeValues - the values of the range
         
         Return Value: Union[int, float] - the final sum
+
+        Exceptions: FormulaValueError if there are values that are not numbers in the range
         """
 
-        # Operating pandas sum function on given range
-        return range_df.sum().sum()
-    
+        # Answering from the prefix sums index if there is one, unless there are floats or texts in the range that must be summed one by one
+        if self.range_index is not None:
+            total = self.range_index.range_sum(range_values.start_row, range_values.stop_row, range_values.start_col, range_values.stop_col)
+            if total is not None:
+                return total
+
+        int_sum = 0
+        float_sum = 0.0
+        has_floats = False
+
+        for block in range_values.blocks:
+            kinds = block.kinds
+
+            # Texts are allowed only if they are numbers, for example '007'. Their numbers in the store are 0
+            texts = kinds >= ValueKind.TEXT
+            if texts.any():
+                for value in block.values(texts):
+                    number = self.__text_to_number__(value)
+
+                    if isinstance(number, float):
+                        has_floats = True
+                        float_sum += number
+                    else:
+                        int_sum += number
+
+            if (kinds == ValueKind.FLOAT).any():
+                has_floats = True
+                float_sum += float(block.numbers.sum())
+
+            # Integers are summed as floats when the sum is exact, one by one otherwise
+            elif block.store.big_ints or not self.__exact_int_sum__(block.numbers):
+                int_sum += sum(block.values(kinds == ValueKind.INT))
+
+            else:
+                int_sum += int(block.numbers.sum())
+
+        return float_sum + int_sum if has_floats else int_sum
 
-    def __mean_by_range__(self, range_df: pd.DataFrame) -> float:
+
+    def __mean_by_range__(self, range_values: RangeValues) -> float:
         """
         Function __mean_by_range__
-        The Function gets two parameters only: start and stop. ignores any cells with errors. Calculates the avereage of the cells in the given range
+        The Function gets two parameters only: start and stop. Calculates the avereage of the cells in the given range, empty cells are 0.
 
         Parameters:
-            * range_df: DataFrame - The cut dataframe to calculate
+            * range_values: RangeValues - the values of the range
         
         Return Value: float - the final average
         """
 
-        # Operating pandas mean function on given range
-        return range_df.mean().mean()
+        # Mean of an empty range is not a number
+        if not range_values.size:
+            return float('nan')
+
+        return self.__sum_by_range__(range_values) / range_values.size
 
 
-    def __countnums__(self, range_df: pd.DataFrame) -> int:
+    def __countnums__(self, range_values: RangeValues) -> int:
         """
         Function __countnums__
-        Function counts every numeric value in a given range of cells
+        Function counts every numeric value in a given range of cells, empty cells are not counted
 
         Parameters:
-            * range_df: pd.DataFrame - The cut df range
+            * range_values: RangeValues - the values of the range
         
         Return Value: int - The total number of numeral values in the range of cells
         """
 
-        # Getting rows
-        rows = range_df.index.to_list()
-        cols = range_df.columns.to_list()
-
-        count = 0
-
-        # Counting numbers amount
-        for row in rows:
-            for col in cols:
-                if range_df.at[row, col].isdigit():
-                    count += 1
+        # Ints and floats are the kinds between INT and FLOAT
+        return sum(int(np.count_nonzero((block.kinds >= ValueKind.INT) & (block.kinds <= ValueKind.FLOAT))) for block in range_values.blocks)
 
-        return count
 
-
-    def __count_if__(self, range_df: pd.DataFrame, condition: str) -> int:
+    def __count_if__(self, range_values: RangeValues, condition: str) -> int:
         """
         Function __count_if__
-        The function counts every cell in the given range that is equal to the condition
+        The function counts every cell in the given range that is equal to the condition.
+        Numbers are compared by their values, texts by their text and an empty condition counts the empty cells.
 
         Parameters:
-            * range_df: pd.DataFrame - The cut df
-            * condition: str - The value to compare all of the values with
+            * range_values: RangeValues - the values of the range
+            * condition: str - The value to compare all of the values with, already resolved if it was a cell name
         """
 
-        rows = range_df.index.to_list()
-        cols = range_df.columns.to_list()
-
-        count = 0
-
-        cell_token = findall(self.__CELL_NAME_RGULAR_EXPRESSION, condition)
+        condition = str(condition)
+        bounds = (range_values.start_row, range_values.stop_row, range_values.start_col, range_values.stop_col)
 
-        if len(cell_token) > 1:
-            raise FunctionSyntaxError('Wrong useage in COUNTIF function. Correct one: COUNTIF(start, stop, condition), condition can be only one cell name or a value')
-        elif cell_token:
-            condition = self.get_value_from_cell(cell_token[0])
+        # Empty cells are the ones that are not counted by the index
+        if condition == Cell.EMPTY_CELL:
+            return range_values.size - self.value_index.count(*bounds)
 
-        # Counting based on condition
-        for row in rows:
-            for col in cols:
-                if range_df.at[row, col] == condition:
-                    count += 1
-        
-        return count
+        return self.value_index.count(*bounds, ValueStore.parse_number(condition))
 
 
-    def __get_df_by_range__(self, start: str, stop: str, target_cell: str, count_func=False) -> pd.DataFrame:
+    def __text_to_number__(self, value: str) -> Union[int, float]:
         """
-        Function __get_df_by_range__
-        An auxiliary function that cuts the existing df and returns only the needed part from it.
+        Function __text_to_number__
+        An auxiliary function that converts a text value to a number for the range functions
 
         Parameters:
-            * start: str - starting cell id
-            * stop: str - end of range cell id
+            * value: str - text value of a cell, for example '007'
         
-        Return Value: DataFrame - the new cut
+        Return Value: Union[int, float]
+
+        Exceptions: FormulaValueError if the value is not a number
         """
 
-        # Getting row and cols sperated from start and stop cells ids
-        start_r, start_c = self.__cell_name_tuple__(start)
-        stop_r, stop_c = self.__cell_name_tuple__(stop)
+        try:
+            return int(value)
+        except ValueError:
+            pass
 
-        # Getting needed df part
-        range_to_sum = self.cells_df.loc[start_r:stop_r, start_c:stop_c]
+        try:
+            return float(value)
+        except ValueError:
+            raise FormulaValueError("Cannot perform mathematical operation on non numeral types. Check your cells in the wanted range.")
 
-        # Maintaining old version of pandas where pandas infer types
-        range_to_sum = range_to_sum.replace(Cell.EMPTY_CELL, '0').infer_objects()
 
-        rows = range_to_sum.index.to_list()
-        cols = range_to_sum.columns.to_list()
+    def __exact_int_sum__(self, numbers: np.ndarray) -> bool:
+        """
+        Function __exact_int_sum__
+        An auxiliary function that checks if the integers in an array can be summed as floats without losing precision
 
-        # Covering circular references
-        for row in rows:
-            for col in cols:
-                if col+row == target_cell:
-                    raise CircularReferenceError("Circular Reference at cell: target_cell")
+        Parameters:
+            * numbers: np.ndarray
+        
+        Return Value: bool
+        """
 
+        if not numbers.size:
+            return True
 
-        try:
-            # Making sure all of the values in the cut df are numeric or raising matching SpreadsheetError
-            if not count_func:
-                range_to_sum = range_to_sum.apply(pd.to_numeric)
-        except:
-            raise FormulaValueError("Cannot perform mathematical operation on non numeral types. Check your cells in the wanted range.")
-        
-        return range_to_sum
+        return max(-numbers.min(), numbers.max()) * numbers.size <= ValueStore.MAX_EXACT_INT
 
 
     def reset_sheet(self, rows: int, cols: int) -> None:
@@ -693,27 +1483,34 @@ class Spreadsheet:
         Return Value: None
         """
 
+        # Making sure the new size fits before anything changes
+        self.__check_cols__(cols)
+
         # Temp prev vars
         self.prev_rows = self.rows
         self.prev_cols = self.cols
-        self.prev_df = self.cells_df
-        self.prev_cells_objs = self.cells_objs[:]
+        self.prev_columns_names = self.columns_names
+        self.prev_values = self.values
+        self.prev_cells = self.cells
+        self.prev_dependency_graph = self.dependency_graph
+        self.prev_value_cache = self.value_cache
+        self.prev_range_index = self.range_index
+        self.prev_value_index = self.value_index
 
 
         # Size of the spreadsheet
         self.rows = rows
         self.cols = cols
 
-        # Dataframe representation of the spreadsheet
-        self.cells_df = pd.DataFrame(index=[str(i + 1) for i in range(rows)], columns=[self.__int_to_letter__(i) for i in range(1, self.cols+1)])
-        self.cells_df.index.name = 'Row'
-        self.cells_df.columns.name = 'Column'
+        # Columns names, empty values store and cells objects
+        self.columns_names = self.addresses.columns_names(self.cols)
+        self.__create_storage__()
 
-        # Making sure no Nan values are in initial dataframe
-        self.cells_df.fillna('', inplace=True)
+        # Empty dependency graph and values cache
+        self.dependency_graph = DependencyGraph(self.__get_cell_by_name__, self.__cell_at__)
+        self.value_cache = ValueCache()
 
-        # Cells objects list
-        self.cells_objs: List[List[Cell]] = [[Cell(row, col, name=(self.__int_to_letter__(col)+str(row+1))) for col in range(1, self.cols+1)] for row in range(rows)]
+        self.__reset_changes__()
 
 
     def undo_reset(self) -> None:
@@ -730,5 +1527,64 @@ class Spreadsheet:
 
         self.rows = self.prev_rows
         self.cols = self.prev_cols
-        self.cells_df = self.prev_df
-        self.cells_objs = self.prev_cells_objs[:]
+        self.columns_names = self.prev_columns_names
+        self.values = self.prev_values
+        self.cells = self.prev_cells
+        self.dependency_graph = self.prev_dependency_graph
+        self.value_cache = self.prev_value_cache
+        self.range_index = self.prev_range_index
+        self.value_index = self.prev_value_index
+
+        self.__reset_changes__()
+
+
+    def load_sheet(self, staging: 'Spreadsheet') -> None:
+        """
+        Function load_sheet
+        The function replaces the whole content of the spreadsheet with the content of another spreadsheet at once, for example
+        a staging spreadsheet a file was imported into. The other spreadsheet should not be used after it.
+
+        Parameters:
+            * staging: Spreadsheet
+        
+        Return Value: None
+        """
+
+        # Size and storage mode
+        self.rows = staging.rows
+        self.cols = staging.cols
+        self.sparse = staging.sparse
+        self.use_range_index = staging.use_range_index
+        self.columns_names = staging.columns_names
+
+        # Values, cells objects and their indexes
+        self.values = staging.values
+        self.cells = staging.cells
+        self.range_index = staging.range_index
+        self.value_index = staging.value_index
+
+        # The dependency graph finds cells through the spreadsheet it belongs to
+        self.dependency_graph = staging.dependency_graph
+        self.dependency_graph.get_cell = self.__get_cell_by_name__
+        self.dependency_graph.find_cell = self.__cell_at__
+        self.value_cache = staging.value_cache
+
+        self.__reset_changes__()
+
+
+    def __reset_changes__(self) -> None:
+        """
+        Function __reset_changes__
+        An auxiliary function that tells the observers the whole spreadsheet was replaced
+        """
+
+        with self.notifier:
+            self.notifier.changes.reset = bool(self.notifier.observers)
+
+
+if __name__ == '__main__':
+
+    # Headless entry point - python -m spreadsheet recalc in.json --out out.xlsx
+    import sys
+    from cli import main
+    sys.exit(main())
@@ -56,4 +56,8 @@ class ImportTypeError(FileError):
 
 class EmptyFileImportError(FileError):
     """ Importing an empty file """
-    pass
\ No newline at end of file
+    pass
+
+class FileJobCancelledError(FileError):
+    """ Import or export cancelled by the user """
+    pass
@@ -1,20 +1,48 @@
 from libraries import *
+
+# GUI related importing, only the GUI needs tkinter
+import tkinter as tk
+import tkinter.font as font
 from tkinter import messagebox
 import tkinter.colorchooser as colorchooser
 from tkinter import filedialog
+from tkinter import ttk
 from spreadsheet import Spreadsheet
 from spreadsheet_types import *
 from spreadsheet_errors import *
 from file_manager import FileManager
+from recalc_scheduler import RecalcScheduler
+from changeset import Changeset
+from latency_tracer import LatencyTracer
+from grid_window import GridWindow
+from time import perf_counter
+from file_job import FileJob
+from threading import Thread
+from queue import Queue, Empty
 
 
 class SpreadsheetGui:
-    def __init__(self, spreadsheet: Spreadsheet):
+
+    # Class's constants
+    CALCULATING_TEXT = '...'
+    POLL_INTERVAL_MS = 15
+    CELL_WIDTH = 10
+    SCROLL_UNITS = 3
+
+    # Bind tag shared by all of the cells entries, events are bound to it once instead of to every entry
+    CELL_TAG = 'SpreadsheetCell'
+
+    def __init__(self, spreadsheet: Spreadsheet, status_bar=False, latency_file: Optional[str] = None):
+        """
+        Parameters:
+            * spreadsheet: Spreadsheet
+            * status_bar: bool - by defult False. Shows the latency of the edits in a status bar
+            * latency_file: str - optional, a json file the latency of the edits is written to when the window is closed
+        """
 
         # Setting class needed objects
         self.spreadsheet: Spreadsheet = spreadsheet
-        self.rows_names = self.spreadsheet.cells_df.index.to_list()
-        self.cols_names = self.spreadsheet.cells_df.columns.to_list()
+        self.cols_names = self.spreadsheet.columns_names
 
         self.file_manager: FileManager = FileManager(self.spreadsheet)
 
@@ -24,11 +52,35 @@ class SpreadsheetGui:
         self.root.geometry("950x600")
         self.root.title("Spreadsheet Application")
 
+        # Entries of the cells that are shown at the moment by the cells ids, and the cells of the entries as (row, col), both start from 0
         self.cells_entries: Dict[str, tk.Entry] = {}
+        self.entries_cells: Dict[tk.Entry, Tuple[int, int]] = {}
+
+        # Cells are recalculated on a background thread, its results are handled here through a queue
+        self.results_queue: Queue = Queue()
+        self.recalc = RecalcScheduler(self.spreadsheet, post=self.post_result, on_pending=self.show_pending,
+                                      on_values=self.show_values, on_error=self.show_cell_error, on_idle=self.finish_edits)
+
+        # Latency of every edit until its results are shown, and the time the result that is being handled was ready at
+        self.tracer = LatencyTracer()
+        self.latency_file = latency_file
+        self.show_status_bar = status_bar
+        self.posted_at = perf_counter()
+
+        # Import or export that runs in the background, one at a time
+        self.file_job: Optional[FileJob] = None
+
+        # Cell id -> generation of the newest edit it waits for, the cell is shown as calculating until then
+        self.pending_cells: Dict[str, int] = {}
+
+        # Only cells that changed are shown again, the changes are handled here through the same queue
+        self.spreadsheet.add_observer(self.post_changes)
 
         self.create_widgets()
         self.bind_events()
 
+        self.root.after(SpreadsheetGui.POLL_INTERVAL_MS, self.process_results)
+
 
     def create_widgets(self):
         """
@@ -39,22 +91,19 @@ class SpreadsheetGui:
         self.create_toolbar()
         self.create_formula_bar()
 
-        # Creating canvas
-        self.canvas = tk.Canvas(self.root, height=10)
-        self.canvas.pack(side="left", fill="both", expand=True)
+        # Latency of the edits, at the bottom of the window
+        if self.show_status_bar:
+            self.status_bar = tk.Label(self.root, text=self.tracer.status_text(), anchor="w")
+            self.status_bar.pack(side="bottom", fill="x")
 
-
-        # Creating vertical scrollbar
-        self.scrollbar_vertical = tk.Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
+        # Scrollbars move over the whole spreadsheet, not over the widgets
+        self.scrollbar_vertical = tk.Scrollbar(self.root, orient="vertical", command=self.scroll_vertical)
         self.scrollbar_vertical.pack(side="right", fill="y")
-        self.canvas.configure(yscrollcommand=self.scrollbar_vertical.set)
-        self.canvas.bind('<Configure>', lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
 
-        # Horizontal scrollbar
-        self.scrollbar_horizontal = tk.Scrollbar(self.root, orient="horizontal", command=self.canvas.xview)
+        self.scrollbar_horizontal = tk.Scrollbar(self.root, orient="horizontal", command=self.scroll_horizontal)
         self.scrollbar_horizontal.pack(side="bottom", fill="x", anchor="w")
-        self.canvas.configure(xscrollcommand=self.scrollbar_horizontal.set)
-        self.canvas.bind('<Configure>', lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+
+        self.create_progress_area()
 
         self.create_grid()
 
@@ -82,85 +131,159 @@ class SpreadsheetGui:
     def create_grid(self):
         """
         Function create_grid
-        The function creates the grid of cells
-
+        The function creates the area of the grid. The grid has entries only for the cells that fit in the window, they show
+        other cells when the grid is scrolled. Entries are created once the window's size is known, and again when it changes.
         """
 
         # Create the spreadsheet display
-        self.grid_frame = tk.Frame(self.canvas)
-        self.canvas.create_window((0,0), window=self.grid_frame, anchor="nw")
+        self.grid_frame = tk.Frame(self.root)
+        self.grid_frame.pack(side="left", fill="both", expand=True)
+
+        # Size of the grid and the sheet row and column shown at its top left corner
+        self.window = GridWindow(self.spreadsheet.rows, self.spreadsheet.cols)
+
+        # Entries and labels of the grid, by their place in the grid
+        self.pool: List[List[tk.Entry]] = []
+        self.rows_lables: List[tk.Label] = []
+        self.cols_lables: List[tk.Label] = []
 
         # Corner
         self.blank_lable = tk.Label(self.grid_frame, text='|||', width=3, background='white')
         self.blank_lable.grid(row=0, column=0)
 
+        # Size of a single cell in pixels
+        sample = tk.Entry(self.grid_frame, width=SpreadsheetGui.CELL_WIDTH)
+        self.cell_width = sample.winfo_reqwidth()
+        self.cell_height = sample.winfo_reqheight()
+        sample.destroy()
 
-        self.fill_grid()
+        self.grid_frame.bind('<Configure>', self.resize_grid)
 
 
-    def fill_grid(self):
+    def resize_grid(self, event: Optional[tk.Event] = None):
         """
-        Function fill_grid
-        The function creates and fills the entries in th grid with values from the spreadsheet.
+        Function resize_grid
+        The function creates the entries of the grid - as many as fit in the window, and never more than the spreadsheet has
         """
+
+        width = self.grid_frame.winfo_width() if event is None else event.width
+        height = self.grid_frame.winfo_height() if event is None else event.height
+
+        # One more row and column than fit entirely, the last ones are partly shown
+        if not self.window.resize(height // self.cell_height, width // self.cell_width) and self.pool:
+            return
+
+        pool_rows, pool_cols = self.window.pool_rows, self.window.pool_cols
+
+        self.save_focused_entry()
+        self.reset_grid()
+
         # Create column lables
-        for col in range(len(self.cols_names)):
-            lable = tk.Label(self.grid_frame, text=self.cols_names[col], width=10, background='white')
-            lable.grid(row=0, column=col+1)
+        for j in range(pool_cols):
+            lable = tk.Label(self.grid_frame, width=SpreadsheetGui.CELL_WIDTH, background='white')
+            lable.grid(row=0, column=j+1)
+            self.cols_lables.append(lable)
 
         # Create rows lables
-        for r in self.rows_names:
-            lable = tk.Label(self.grid_frame, text=str(r), width=3, background='white')
-            lable.grid(row = r, column=0)
+        for i in range(pool_rows):
+            lable = tk.Label(self.grid_frame, width=3, background='white')
+            lable.grid(row=i+1, column=0)
+            self.rows_lables.append(lable)
+
+        # Creating the entries, all of them share the events of the cells tag
+        for i in range(pool_rows):
+            row = []
+            for j in range(pool_cols):
+                entry = tk.Entry(self.grid_frame, width=SpreadsheetGui.CELL_WIDTH)
+                entry.bindtags((str(entry), SpreadsheetGui.CELL_TAG) + entry.bindtags()[1:])
+                entry.grid(row=i+1, column=j+1)
+                row.append(entry)
+            self.pool.append(row)
+
+        self.scroll_to(self.window.first_row, self.window.first_col)
 
 
+    def fill_grid(self):
+        """
+        Function fill_grid
+        The function shows the cells from the first row and column on in the grid's entries - values and colors from the spreadsheet.
+        """
+
+        self.cells_entries = {}
+        self.entries_cells = {}
+
+        for j, lable in enumerate(self.cols_lables):
+            lable.config(text=self.cols_names[self.window.first_col + j] if self.window.first_col + j < self.spreadsheet.cols else '')
+
+        for i, lable in enumerate(self.rows_lables):
+            lable.config(text=str(self.window.first_row + i + 1) if self.window.first_row + i < self.spreadsheet.rows else '')
+
+        # Reading the spreadsheet, it may be in the middle of a recalculation
+        with self.recalc.lock:
+            self.__fill_entries__()
+
+
+    def __fill_entries__(self):
+        """
+        Function __fill_entries__
+        An auxiliary function that fills every entry of the grid with the cell it shows now
+        """
+
         # Flag for showing color error only once, only to notify
         fg_error_showed = False
         bg_error_showed = False
 
-        # Creating empty cell entries
-        for i in self.rows_names:
-            for j in range(len(self.cols_names)):
+        for i, pool_row in enumerate(self.pool):
+            for j, entry in enumerate(pool_row):
+                cell = self.window.cell_of(i, j)
+
+                entry.config(state='normal')
+                entry.delete(0, tk.END)
 
-                cell_id = self.cols_names[j] + str(i)
+                # Entries after the end of the spreadsheet stay empty
+                if cell is None:
+                    entry.config(state='disabled')
+                    continue
 
-                #if cell_id not in self.cells_entries:
+                row, col = cell
+                cell_id = self.cols_names[col] + str(row + 1)
                 curr_cell_info = self.spreadsheet.get_cells_info(cell_id)
-                self.cells_entries[cell_id] = tk.Entry(self.grid_frame, width=10)
+                self.cells_entries[cell_id] = entry
+                self.entries_cells[entry] = (row, col)
 
                 try:
-                    self.cells_entries[cell_id].config(foreground=curr_cell_info['fg color'])
+                    entry.config(foreground=curr_cell_info['fg color'])
                 except:
                     if not fg_error_showed:
                         messagebox.showerror('Foreground Color Error', f"Text color for one or more cells is illegal, setting defult color for each")
                         fg_error_showed = True
                 try:
-                    self.cells_entries[cell_id].config(background=curr_cell_info['bg color'])
+                    entry.config(background=curr_cell_info['bg color'])
                 except:
                     if not bg_error_showed:
                         messagebox.showerror('Foreground Color Error', f"Background color for one or more cells is illegal, setting defult color for eacg")
                         bg_error_showed = True
 
-                self.cells_entries[cell_id].grid(row=i  , column=j+1)
-
                 # Adding value
-                self.cells_entries[cell_id].delete(0, tk.END)
-                self.cells_entries[cell_id].insert(0, curr_cell_info['value'])
-                self.cells_entries[cell_id].config(state="readonly", readonlybackground= self.cells_entries[cell_id].cget("bg"))
+                value = SpreadsheetGui.CALCULATING_TEXT if cell_id in self.pending_cells else self.spreadsheet.get_value_from_cell(cell_id)
+                entry.insert(0, value)
+                entry.config(state="readonly", readonlybackground=entry.cget("bg"))
 
 
     def reset_grid(self):
         """
         Function reset_grid
-        The function resets the grid by erasing all of the entries
+        The function resets the grid by erasing all of the entries and lables
         """
 
-        cells_ids = list(self.cells_entries.keys())
+        for widget in [entry for pool_row in self.pool for entry in pool_row] + self.rows_lables + self.cols_lables:
+            widget.destroy()
 
-        # Erasing entries and emptying the entries dictionary
-        for cell_id in cells_ids:
-            self.cells_entries[cell_id].destroy()
-            self.cells_entries.pop(cell_id)
+        self.pool = []
+        self.rows_lables = []
+        self.cols_lables = []
+        self.cells_entries = {}
+        self.entries_cells = {}
 
 
     def create_toolbar(self):
@@ -267,30 +390,45 @@ class SpreadsheetGui:
             messagebox.showerror(str(e))
 
 
-        try:
-            if filename:
-                
-                # Handling import
-                self.file_manager.import_file(filename, file_type, mode)
-                
-                # Creating new grid
-                self.reset_grid()
-                
-                self.rows_names = self.spreadsheet.cells_df.index.to_list()
-                self.cols_names = self.spreadsheet.cells_df.columns.to_list()
-                
-                self.fill_grid()
-                self.bind_events()
-            else:
-                messagebox.showinfo(message='No file was chosen')
+        # The file is loaded into a staging spreadsheet in the background, the current spreadsheet is replaced only if it succeeds
+        if filename:
+            self.start_file_job('Importing', lambda job: self.file_manager.load_file(filename, file_type, mode, job), self.finish_import)
+        else:
+            messagebox.showinfo(message='No file was chosen')
+
+
+    def finish_import(self, loaded: Tuple[Spreadsheet, Dict[str, SpreadsheetError]]):
+        """
+        Function finish_import
+        The function replaces the spreadsheet with the staging spreadsheet a file was loaded into, and shows it from the first cell
+
+        Parameters:
+            * loaded: Tuple of the staging spreadsheet and the errors of its cells
+        """
+
+        staging, errors = loaded
 
-        # Handling Errors
-        except SpreadsheetError as e:
-            messagebox.showerror(f'{e}', f"An Error has occured: {e}")
+        # The recalculation in progress is dropped with the old spreadsheet
+        with self.recalc.paused():
+            self.spreadsheet.load_sheet(staging)
+        self.pending_cells.clear()
+        self.tracer.clear()
+        
+        # Creating new grid for the new size, from the first cell
+        self.cols_names = self.spreadsheet.columns_names
+        self.window = GridWindow(self.spreadsheet.rows, self.spreadsheet.cols)
+
+        self.reset_grid()
+        self.resize_grid()
+
+        # The file was loaded, but some of its cells failed - showing them like the errors of edited cells
+        if errors:
+            lines = [f'{cell_id}: {error}' for cell_id, error in list(errors.items())[:10]]
+            if len(errors) > len(lines):
+                lines.append(f'...and {len(errors) - len(lines)} more cells')
+
+            messagebox.showerror('Import Errors', f'An Error has occured in {len(errors)} cells of the file:\n' + '\n'.join(lines))
 
-        except FileError as e:
-            messagebox.showerror(f'{e}', f"An Error has occured: {e}")
- 
 
     def export(self, file_type: FileType, export_type: ExportType) -> None:
         """
@@ -314,14 +452,116 @@ class SpreadsheetGui:
             messagebox.showerror(str(e))
 
 
-        # Exporting and handling errros
-        try:
-            if file_path:
-                self.file_manager.export_to_file(file_path, file_type, export_type)
+        # Exporting in the background, errors are shown when it ends
+        if file_path:
+            self.start_file_job('Exporting', lambda job: self.file_manager.export_to_file(file_path, file_type, export_type, job))
+        else:
+            messagebox.showinfo(message='No file was exported')
+
+
+    def create_progress_area(self):
+        """
+        Function create_progress_area
+        The function creates the area that shows the progress of an import or export, it is shown only while one runs
+        """
+
+        self.progress_frame = tk.Frame(self.root)
+
+        self.progress_label = tk.Label(self.progress_frame, anchor="w")
+        self.progress_label.pack(side="left")
+
+        self.cancel_button = tk.Button(self.progress_frame, text="Cancel", command=self.cancel_file_job)
+        self.cancel_button.pack(side="right")
+
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode="determinate")
+        self.progress_bar.pack(side="right", fill="x", expand=True)
+
+
+    def start_file_job(self, title: str, work: Callable[[FileJob], Any], on_done: Optional[Callable[[Any], None]] = None):
+        """
+        Function start_file_job
+        The function runs an import or export on another thread and shows its progress until it ends
+
+        Parameters:
+            * title: str - shown until the job reports its first step
+            * work: Callable(job) - the import or export, its result is handed to on_done
+            * on_done: Callable(result) - optional, called on the GUI's thread if the job succeeded
+        """
+
+        if self.file_job is not None:
+            messagebox.showinfo(message='Another file is being handled, please wait for it to end or cancel it')
+            return
+
+        job = self.file_job = FileJob(progress=lambda stage, done, total: self.post_result(lambda: self.show_progress(job, stage, done, total)),
+                                      lock=self.recalc.lock)
+
+        def run():
+            try:
+                result = work(job)
+            except Exception as error:
+                self.post_result(lambda error=error: self.end_file_job(job, error=error))
             else:
-                messagebox.showinfo(message='No file was exported')
-        except FileError as e:
-            messagebox.showerror("An error has occured During file saving", str(e))
+                self.post_result(lambda: self.end_file_job(job, on_done, result))
+
+        self.progress_frame.pack(side="bottom", fill="x", before=self.scrollbar_vertical)
+        self.show_progress(job, title, 0, 0)
+
+        Thread(target=run, name='file job', daemon=True).start()
+
+
+    def show_progress(self, job: FileJob, stage: str, done: int, total: int):
+        """
+        Function show_progress
+        The function shows the progress of the current file job
+
+        Parameters:
+            * job: FileJob - progress of jobs that ended is not shown
+            * stage: str
+            * done, total: int - items done out of all of the stage's items
+        """
+
+        if job is not self.file_job or job.cancelled.is_set():
+            return
+
+        self.progress_label.config(text=f'{stage} {done:,} / {total:,}' if total else f'{stage}...')
+        self.progress_bar.config(maximum=max(total, 1), value=done)
+
+
+    def cancel_file_job(self):
+        """
+        Function cancel_file_job
+        The function cancels the current file job, it stops at its next step
+        """
+
+        if self.file_job is not None:
+            self.file_job.cancel()
+            self.progress_label.config(text='Cancelling...')
+
+
+    def end_file_job(self, job: FileJob, on_done: Optional[Callable[[Any], None]] = None, result: Any = None, error: Optional[Exception] = None):
+        """
+        Function end_file_job
+        The function hides the progress of a file job that ended, and shows its error or hands its result on
+
+        Parameters:
+            * job: FileJob
+            * on_done: Callable(result) - optional
+            * result: the result of the job
+            * error: Exception - the error the job ended with, if any
+        """
+
+        self.file_job = None
+        self.progress_frame.pack_forget()
+
+        # Handling Errors, a file job that failed or was cancelled did not change the spreadsheet
+        if isinstance(error, FileJobCancelledError):
+            messagebox.showinfo(message='The file job was cancelled, the spreadsheet was not changed')
+
+        elif error is not None:
+            messagebox.showerror(f'{error}', f"An Error has occured: {error}")
+
+        elif on_done is not None:
+            on_done(result)
 
 
     def text_formatting_area(self):
@@ -384,11 +624,9 @@ class SpreadsheetGui:
         focused_cell: tk.Entry = self.root.focus_get()
 
         # Making sure to color only entries within the grid
-        for cell_entry in self.cells_entries.values():
-            if focused_cell == cell_entry:
-                focused_cell.config(fg=color)
-                self.save_change_in_color(focused_cell, fg=color)
-                break
+        if self.entry_cell(focused_cell) is not None:
+            focused_cell.config(fg=color)
+            self.save_change_in_color(focused_cell, fg=color)
 
 
     def apply_bg_color(self, color: str):
@@ -403,11 +641,9 @@ class SpreadsheetGui:
         focused_cell: tk.Entry = self.root.focus_get()
        
         # Making sure to color only entries within the grid
-        for cell_entry in self.cells_entries.values():
-            if focused_cell == cell_entry:
-                focused_cell.config(bg=color)
-                self.save_change_in_color(focused_cell, bg=color)
-                break
+        if self.entry_cell(focused_cell) is not None:
+            focused_cell.config(bg=color)
+            self.save_change_in_color(focused_cell, bg=color)
 
     
     def save_change_in_color(self, focused_cell: tk.Entry, fg=None, bg=None):
@@ -416,54 +652,47 @@ class SpreadsheetGui:
         The function updates the actual cell object of the cell with the new color
         """
         # Getting cell id
-        for cell_id, entry in self.cells_entries.items():
-            if entry == focused_cell:
-                
-                # Getting cell
-                cell = self.spreadsheet.__get_cell_by_name__(cell_id)
-                
-                # Updating color
-                if fg:
-                    cell.set_design(fg=fg)
-                if bg:
-                    cell.set_design(bg=bg)
+        cell_id = self.entry_cell(focused_cell)
+
+        if cell_id is not None:
 
-                break
+            # Updating color, the spreadsheet may be in the middle of a recalculation
+            with self.recalc.lock:
+                self.spreadsheet.set_cell_design(cell_id, bg=bg, fg=fg)
 
 
     def bind_events(self):
         """
         Function bind_events
-        The function takes care of binding keys and events to the relevant functions per cell
+        The function takes care of binding keys and events to the relevant functions. Cells events are bound once to the tag all of the
+        cells entries share, the mouse wheel scrolls the grid.
         """
 
         # Bind events for cell updates
-        for i in self.rows_names:
-            for j in range(len(self.cols_names)):
-                cell_id = self.cols_names[j]+str(i)
-                cell_entry = self.cells_entries[cell_id]
-                cell_entry.bind("<FocusIn>", self.update_formula_entry)
-                cell_entry.bind("<FocusOut>", self.save_cell_value)
-                cell_entry.bind("<Left>", self.navigate)
-                cell_entry.bind("<Right>", self.navigate)
-                cell_entry.bind("<Up>", self.navigate)
-                cell_entry.bind("<Down>", self.navigate)
-                cell_entry.bind("<Shift-Tab>", self.navigate)
-                cell_entry.bind("<Tab>", self.navigate)
-                cell_entry.bind("<F2>", lambda event, i=i, j=j: self.start_editing(i, j))
-                cell_entry.bind("<Double-Button-1>", lambda event, i=i, j=j: self.start_editing(i, j))
-                cell_entry.bind("<Return>", lambda event, i=i, j=j: self.start_editing(i, j))
-
-
-    def start_editing(self, i, j):
+        self.root.bind_class(SpreadsheetGui.CELL_TAG, "<FocusIn>", self.update_formula_entry)
+        self.root.bind_class(SpreadsheetGui.CELL_TAG, "<FocusOut>", self.save_cell_value)
+
+        for key in ("<Left>", "<Right>", "<Up>", "<Down>", "<Shift-Tab>", "<Tab>"):
+            self.root.bind_class(SpreadsheetGui.CELL_TAG, key, self.navigate)
+
+        for key in ("<F2>", "<Double-Button-1>", "<Return>"):
+            self.root.bind_class(SpreadsheetGui.CELL_TAG, key, self.start_editing)
+
+        # Scrolling with the mouse wheel - MouseWheel on Windows and macOS, buttons 4 and 5 on Linux
+        self.grid_frame.bind_all("<MouseWheel>", lambda event: self.scroll_vertical('scroll', -SpreadsheetGui.SCROLL_UNITS if event.delta > 0 else SpreadsheetGui.SCROLL_UNITS, 'units'))
+        self.grid_frame.bind_all("<Button-4>", lambda event: self.scroll_vertical('scroll', -SpreadsheetGui.SCROLL_UNITS, 'units'))
+        self.grid_frame.bind_all("<Button-5>", lambda event: self.scroll_vertical('scroll', SpreadsheetGui.SCROLL_UNITS, 'units'))
+
+
+    def start_editing(self, event: tk.Event):
         """
         Function start_editing
         The function takes the cell out of readonly mode and sets it to editing mode
         """
 
-        # Getting entry by index and updating its state
-        cell_entry = self.cells_entries[self.cols_names[j]+i]
-        cell_entry.config(state="normal")
+        # Entries after the end of the spreadsheet can not be edited
+        if event.widget.cget('state') == 'readonly':
+            event.widget.config(state="normal")
 
 
     def update_formula_entry(self, event: tk.Event):
@@ -476,66 +705,60 @@ class SpreadsheetGui:
         """
 
         # Getting matching cell
-        for cell_id, entry in self.cells_entries.items():
-            if entry == event.widget:
+        cell_id = self.entry_cell(event.widget)
+
+        if cell_id is not None:
+            self.show_formula(cell_id)
 
-                # Getting cell's formula
-                formula = self.spreadsheet.get_cell_formula(cell_id)
 
-                # Making sure to actually show the formula and not the current cell value
-                if self.formula_entry.get() != formula:
-                    
-                    # Editing the formula entry
-                    self.formula_entry.config(state='normal')
-                    self.formula_entry.delete(0, tk.END)
-                    self.formula_entry.insert(0, formula)
-                    self.formula_entry.config(state='readonly', readonlybackground=self.formula_entry.cget("bg"))
+    def show_formula(self, cell_id: str):
+        """
+        Function show_formula
+        The function shows the formula of a cell in the formula bar
+
+        parameters:
+            * cell_id: str
+        """
+
+        # Getting cell's formula
+        formula = self.spreadsheet.get_cell_formula(cell_id)
+
+        # Making sure to actually show the formula and not the current cell value
+        if self.formula_entry.get() != formula:
+            
+            # Editing the formula entry
+            self.formula_entry.config(state='normal')
+            self.formula_entry.delete(0, tk.END)
+            self.formula_entry.insert(0, formula)
+            self.formula_entry.config(state='readonly', readonlybackground=self.formula_entry.cget("bg"))
 
 
     def navigate(self, event: tk.Event):
         """
         Function navigate
-        The function updates the focused cell based on the move the user chose
+        The function updates the focused cell based on the move the user chose, the grid is scrolled if the cell is not shown
         """
 
-        # Getting needed entry for the move
-        curr_entry = event.widget
-        found_entry = False
+        # Getting the cell of the entry, only moving if focused widget is an actual entry
+        cell = self.entries_cells.get(event.widget)
 
-        # Getting index
-        for row in self.rows_names:
-            for col, col_name in enumerate(self.cols_names):
-                if self.cells_entries[col_name+str(row)] == curr_entry:
-                    found_entry = True
-                    break
-            if found_entry:
-                break
-
-        # Only moving if focused widget is an actual entry
-        if not found_entry:
+        if cell is None:
             return
 
-        row = int(row)
-        rows = len(self.rows_names)
-
         # Update row and column indices based on the pressed key
-        if event.keysym == 'Right' or event.keysym == 'Tab':
-            col = col + 1 if col < len(self.cols_names)-1 else col
+        moved = self.window.move(*cell, event.keysym)
 
-        elif event.keysym == 'Left' or event.keysym == 'Shift-Tab':
-            col = col - 1 if col > 0 else col
+        if moved is None:
+            print("Ilegal move")
+            moved = cell
 
-        elif event.keysym == 'Up':
-            row = row - 1 if row > 1 else row
+        # Scrolling so the new cell is shown entirely, the entries still know the cells they show until the grid is filled again
+        if self.window.follow(*moved):
+            self.scroll_to(self.window.first_row, self.window.first_col)
 
-        elif event.keysym == 'Down':
-            row = row + 1 if row < rows else rows
-        else:
-            print("Ilegal move")
-        
-        # Setting the new focus
-        new_entry = self.cells_entries[self.cols_names[col]+str(row)]
-        new_entry.focus()
+        # Setting the new focus, the entry is found by its place in the grid
+        i, j = self.window.place_of(*moved)
+        self.pool[i][j].focus()
 
 
     def save_cell_value(self, event: tk.Event):
@@ -546,55 +769,305 @@ class SpreadsheetGui:
         Parameters:
             * event: tk.Event
         """
+        self.save_entry(event.widget)
+
+
+    def save_entry(self, curr_entry: tk.Entry):
+        """
+        Function save_entry
+        The function sends the new value of the cell an entry shows to the background recalculation,
+        the cell is shown as calculating until it is done.
+
+        Parameters:
+            * curr_entry: tk.Entry
+        """
 
         # Getting cell
-        for cell_id, entry in self.cells_entries.items():
-            if entry == event.widget:
-                new_value = entry.get()
-                old_value = self.spreadsheet.get_value_from_cell(cell_id)
-                try:
-                    # Updating only if the value has changed
-                    if new_value != old_value:
-                        self.spreadsheet.edit_cell(cell_id, new_value)
-                # Taking care of errors
-                except SpreadsheetError as e:
-                    messagebox.showerror(message=e)
+        cell_id = self.entry_cell(curr_entry)
 
-                entry.delete(0, tk.END)
-                entry.insert(0, self.spreadsheet.get_value_from_cell(cell_id))
-                self.populate_entries()
-                entry.config(state="readonly", readonlybackground=entry.cget("bg"))
-                break
+        if cell_id is None:
+            return
+
+        new_value = curr_entry.get()
+
+        # Reading the spreadsheet, it may be in the middle of a recalculation
+        with self.recalc.lock:
+            old_value = self.spreadsheet.get_value_from_cell(cell_id)
+
+        # Updating only if the value has changed
+        if new_value != old_value and new_value != SpreadsheetGui.CALCULATING_TEXT:
+            self.pending_cells[cell_id] = self.recalc.submit(cell_id, new_value)
+            self.tracer.start(self.pending_cells[cell_id])
+
+        curr_entry.config(state="readonly", readonlybackground=curr_entry.cget("bg"))
+        self.set_entry_value(cell_id, SpreadsheetGui.CALCULATING_TEXT if cell_id in self.pending_cells else old_value)
+
+
+    def entry_cell(self, entry: Any) -> Optional[str]:
+        """
+        Function entry_cell
+        The function returns the id of the cell an entry shows at the moment
+
+        Parameters:
+            * entry: any widget
+
+        Return Value: str, None if the widget is not an entry of a cell
+        """
+
+        cell = self.entries_cells.get(entry)
+
+        if cell is None:
+            return None
+
+        return self.cols_names[cell[1]] + str(cell[0] + 1)
+
+
+    def save_focused_entry(self):
+        """
+        Function save_focused_entry
+        The function saves the cell that is being edited before its entry shows another cell
+        """
+
+        focused_entry = self.root.focus_get()
+
+        if isinstance(focused_entry, tk.Entry) and focused_entry.cget('state') == 'normal':
+            self.save_entry(focused_entry)
+
+
+    def scroll_to(self, first_row: int, first_col: int):
+        """
+        Function scroll_to
+        The function shows the cells from the given row and column on in the grid, and updates the scrollbars
+
+        Parameters:
+            * first_row, first_col: int - the cell at the top left corner of the grid, both start from 0
+        """
+
+        if not self.pool:
+            return
+
+        # The cell that is being edited is saved while its entry still shows it
+        self.save_focused_entry()
+
+        self.window.scroll_to(first_row, first_col)
+        self.fill_grid()
+
+        vertical, horizontal = self.window.scrollbars()
+        self.scrollbar_vertical.set(*vertical)
+        self.scrollbar_horizontal.set(*horizontal)
+
+        self.update_priority()
+
+
+    def scroll_vertical(self, *args):
+        """
+        Function scroll_vertical
+        The function scrolls the grid up or down by the scrollbar's command, the cells that become visible are recalculated first
+        """
+        self.scroll_to(GridWindow.scroll_position(args, self.window.first_row, self.window.rows, self.window.pool_rows), self.window.first_col)
+
+
+    def scroll_horizontal(self, *args):
+        """
+        Function scroll_horizontal
+        The function scrolls the grid left or right by the scrollbar's command, the cells that become visible are recalculated first
+        """
+
+        if self.pool:
+            self.scroll_to(self.window.first_row, GridWindow.scroll_position(args, self.window.first_col, self.window.cols, self.window.pool_cols))
+
+
+    def visible_cells(self) -> List[str]:
+        """
+        Function visible_cells
+        The function returns the ids of the cells that are shown in the grid
+
+        Return Value: List[str]
+        """
+        return list(self.cells_entries.keys())
+
+
+    def update_priority(self):
+        """
+        Function update_priority
+        The function tells the background recalculation which cells are visible now, so they are recalculated and shown first
+        """
+        self.recalc.set_priority(self.visible_cells())
+
+
+    def post_result(self, result: Callable[[], None]):
+        """
+        Function post_result
+        The function is called on the thread of the background recalculation, and queues a result with the time it was ready at
+        """
+        self.results_queue.put((perf_counter(), result))
+
+
+    def finish_edits(self, generation: int):
+        """
+        Function finish_edits
+        The function is called when all of the edits up to a generation were recalculated and their results were shown
+
+        Parameters:
+            * generation: int
+        """
+
+        self.tracer.finish(generation, self.posted_at)
+
+        if self.show_status_bar:
+            self.status_bar.config(text=self.tracer.status_text())
+
+
+    def process_results(self):
+        """
+        Function process_results
+        The function handles the results of the background recalculation that are waiting, and checks again after a short while
+        """
+
+        idle = True
+
+        try:
+            while True:
+                self.posted_at, result = self.results_queue.get_nowait()
+                start = perf_counter()
+
+                # Time the oldest result waited for the event loop, the results after it waited at the same time
+                if idle:
+                    self.tracer.add_time('idle', start - self.posted_at)
+                    idle = False
+
+                # Time it takes to show the result
+                result()
+                self.tracer.add_time('repaint', perf_counter() - start)
+        except Empty:
+            pass
+
+        self.root.after(SpreadsheetGui.POLL_INTERVAL_MS, self.process_results)
+
+
+    def show_pending(self, generation: int, cells_ids: List[str]):
+        """
+        Function show_pending
+        The function shows visible cells that are about to be recalculated as calculating
+
+        Parameters:
+            * generation: int - the generation of the edits the recalculation includes
+            * cells_ids: List[str] - only cells of the visible pool, the recalculation reports the pending cells that are shown
+        """
+
+        for cell_id in cells_ids:
+            if self.pending_cells.get(cell_id, 0) < generation:
+                self.pending_cells[cell_id] = generation
+                self.set_entry_value(cell_id, SpreadsheetGui.CALCULATING_TEXT)
+
+
+    def show_values(self, generation: int, values: Dict[str, str]):
+        """
+        Function show_values
+        The function shows the new values of recalculated cells. Cells that wait for a newer edit stay calculating.
+
+        Parameters:
+            * generation: int - the generation of the edits the values include
+            * values: Dict[str, str] - cell id -> value as it is shown
+        """
+
+        self.tracer.result(generation, self.posted_at)
+
+        # Values that changed are shown by show_changes, here only the cells that were shown as calculating are needed
+        for cell_id, value in values.items():
+            if cell_id in self.pending_cells and self.pending_cells[cell_id] <= generation:
+                del self.pending_cells[cell_id]
+                self.set_entry_value(cell_id, value)
+
+
+    def post_changes(self, changes: Changeset):
+        """
+        Function post_changes
+        The function is called with the changes of the spreadsheet, on the thread that changed it, and hands them to show_changes
+        """
+        self.post_result(lambda: self.show_changes(changes))
+
+
+    def show_changes(self, changes: Changeset):
+        """
+        Function show_changes
+        The function shows again only the visible cells that changed - their values, colors, and the formula bar if the focused cell's
+        formula changed. Cells that wait for an edit stay calculating.
+
+        Parameters:
+            * changes: Changeset
+        """
+
+        if changes.reset:
+            self.fill_grid()
+            return
+
+        # Reading the spreadsheet, it may be in the middle of a recalculation
+        with self.recalc.lock:
+            for cell_id in changes.values | changes.styles:
+                entry = self.cells_entries.get(cell_id)
+
+                if entry is None:
+                    continue
+
+                if cell_id in changes.styles:
+                    cell_info = self.spreadsheet.get_cells_info(cell_id)
+
+                    try:
+                        entry.config(foreground=cell_info['fg color'], background=cell_info['bg color'], readonlybackground=cell_info['bg color'])
+                    except tk.TclError:
+                        pass
+
+                if cell_id in changes.values and cell_id not in self.pending_cells:
+                    self.set_entry_value(cell_id, self.spreadsheet.get_value_from_cell(cell_id))
+
+            # Showing the focused cell's new formula
+            focused_cell = self.entry_cell(self.root.focus_get())
+
+            if focused_cell in changes.formulas:
+                self.show_formula(focused_cell)
+
+
+    def show_cell_error(self, cell_id: str, error: SpreadsheetError):
+        """
+        Function show_cell_error
+        The function shows an error of a cell that was edited
+        """
+        messagebox.showerror(message=f'{cell_id}: {error}')
+
+
+    def set_entry_value(self, cell_id: str, value: str):
+        """
+        Function set_entry_value
+        The function shows a value in a cell's entry, unless the user is editing it
+        """
+
+        entry = self.cells_entries.get(cell_id)
+
+        if entry is None or (entry.cget('state') == 'normal' and entry == self.root.focus_get()):
+            return
+
+        entry.config(state='normal')
+        entry.delete(0, tk.END)
+        entry.insert(0, value)
+        entry.config(state="readonly", readonlybackground=entry.cget("bg"))
 
 
     def populate_entries(self):
         """
         Function populate_entries
-        The function fills the entries with the values from the spreadsheet based on formula and colors
-        """
-        for i in self.rows_names:
-            for j in range(len(self.cols_names)):
-                
-                # Getting cell and its values
-                cell_id = self.cols_names[j] + str(i)
-                cell_value = self.spreadsheet.get_value_from_cell(cell_id)
-                formula = self.spreadsheet.get_cell_formula(cell_id)
-
-                # Insert cell' value
-                self.cells_entries[cell_id].config(state='normal')
-                self.cells_entries[cell_id].delete(0, tk.END)
-                self.cells_entries[cell_id].insert(0, cell_value)
-                self.cells_entries[cell_id].config(state="readonly", readonlybackground= self.cells_entries[cell_id].cget("bg"))
-                
-                # inserting formula
-                self.formula_entry.delete(0,tk.END)
-                self.formula_entry.insert(0,formula)
+        The function fills the shown entries with the values from the spreadsheet based on formula and colors
+        """
+        self.fill_grid()
 
 
     def run(self):
         """
         Function run
-        Gets called only to run the program
+        Gets called only to run the program, the latency of the edits is written once the window is closed
         """
         self.root.mainloop()
 
+        if self.latency_file:
+            self.tracer.dump(self.latency_file)
+
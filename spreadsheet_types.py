@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 # Types for files
@@ -18,3 +18,12 @@ class ExportType(Enum):
 class ImportType(Enum):
     FORMULAS = 'f'
     VALUES_ONLY = 'v'
+
+
+# Kinds of values stored in cells
+class ValueKind(IntEnum):
+    EMPTY = 0
+    INT = 1
+    FLOAT = 2
+    TEXT = 3
+    ERROR = 4
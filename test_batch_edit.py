@@ -0,0 +1,92 @@
+import pytest
+from spreadsheet import Spreadsheet
+from spreadsheet_errors import *
+
+
+@pytest.fixture
+def spreadsheet():
+    return Spreadsheet(rows=10, cols=5)
+
+
+def test_edit_cells_order(spreadsheet: Spreadsheet):
+    """
+    Testing cells are evaluated with the values of cells that are edited after them, and every cell is evaluated once
+    """
+    spreadsheet.edit_cell('E1', '=A1*10')
+
+    errors = spreadsheet.edit_cells({'A1': '=A2+1', 'A2': '=A3/B1', 'A3': '6', 'B1': '2'})
+    assert not errors
+
+    assert spreadsheet.get_value_from_cell('A2') == '3.0'
+    assert spreadsheet.get_value_from_cell('A1') == '4.0'
+    assert spreadsheet.get_value_from_cell('E1') == '40.0'
+
+    # Later edits update the batch's cells like any other cells
+    spreadsheet.edit_cell('A3', '8')
+    assert spreadsheet.get_value_from_cell('E1') == '50.0'
+
+    # Evaluating a cell again uses the cache instead of its formula
+    misses = spreadsheet.value_cache.misses
+    spreadsheet.evaluate_cell_value('=A1+E1', 'C1')
+    assert spreadsheet.value_cache.misses == misses
+
+
+def test_batch_errors(spreadsheet: Spreadsheet):
+    """
+    Testing errors are kept by cells and do not stop the other cells from being edited
+    """
+    with spreadsheet.batch() as batch:
+        spreadsheet.edit_cell('A1', '=B1/0')
+        spreadsheet.edit_cell('A2', '=A3+1')
+        spreadsheet.edit_cell('A3', '=A2+1')
+        spreadsheet.edit_cell('Z99', '1')
+        spreadsheet.edit_cell('C1', '=A1+1')
+        spreadsheet.edit_cell('D1', '7')
+
+        # Cells are not evaluated before the batch ends
+        assert spreadsheet.get_value_from_cell('A1') == ''
+
+    assert isinstance(batch.errors['A1'], ZeroDivision)
+    assert isinstance(batch.errors['A3'], CircularReferenceError)
+    assert isinstance(batch.errors['Z99'], CellLocationError)
+
+    # Cells that refer to a cell with an error fail as well
+    assert isinstance(batch.errors['A2'], FormulaValueError) and isinstance(batch.errors['C1'], FormulaValueError)
+
+    # Edited cells are set to their errors like edit_cell does
+    assert spreadsheet.get_cell_formula('A1') == ZeroDivision.VALUE
+    assert spreadsheet.get_value_from_cell('A3') == CircularReferenceError.VALUE
+    assert spreadsheet.get_value_from_cell('D1') == '7'
+
+
+def test_batch_keep_formulas(spreadsheet: Spreadsheet):
+    """
+    Testing a batch that loads cells keeps the formulas of cells that fail, and they recover when the cells they refer to change
+    """
+    errors = spreadsheet.edit_cells({'A1': '=B1/0', 'A2': '=A3+1', 'A3': '=A2+1', 'B1': 'x', 'C1': '=B1+1'}, keep_formulas=True)
+
+    assert isinstance(errors['A1'], FormulaValueError) and isinstance(errors['C1'], FormulaValueError)
+    assert isinstance(errors['A3'], CircularReferenceError) and isinstance(errors['A2'], CircularReferenceError)
+
+    assert spreadsheet.get_cell_formula('A1') == '=B1/0' and spreadsheet.get_cell_formula('A3') == '=A2+1'
+    assert spreadsheet.get_value_from_cell('C1') == FormulaValueError.VALUE
+    assert spreadsheet.get_value_from_cell('A3') == CircularReferenceError.VALUE
+
+    spreadsheet.edit_cell('B1', '4')
+    assert spreadsheet.get_value_from_cell('C1') == '5'
+    assert spreadsheet.get_value_from_cell('A1') == ZeroDivision.VALUE
+
+
+def test_nested_batch(spreadsheet: Spreadsheet):
+    """
+    Testing a batch inside a batch is evaluated with the outer one, and a batch is evaluated when it ends with an exception
+    """
+    with pytest.raises(KeyError):
+        with spreadsheet.batch():
+            spreadsheet.edit_cells({'A1': '=A2*2'})
+            assert spreadsheet.get_value_from_cell('A1') == ''
+            spreadsheet.edit_cell('A2', '4')
+            raise KeyError('A1')
+
+    assert spreadsheet.current_batch is None
+    assert spreadsheet.get_value_from_cell('A1') == '8'
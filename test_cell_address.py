@@ -0,0 +1,115 @@
+import pytest
+import sys
+import threading
+from spreadsheet import Spreadsheet
+from cell_address import AddressResolver, CellRef
+from spreadsheet_errors import *
+
+
+def test_columns_tables():
+    """
+    Testing columns names and indexes convert both ways, including columns that were not in the table yet
+    """
+    addresses = AddressResolver()
+
+    assert addresses.columns_names(3) == ['A', 'B', 'C']
+    assert addresses.column_name(26) == 'Z'
+    assert addresses.column_name(27) == 'AA'
+    assert addresses.column_name(16384) == 'XFD'
+
+    for col in range(1, 16385):
+        assert addresses.column_index(addresses.column_name(col)) == col
+
+    assert addresses.column_index('ZZZZ') == 475254
+
+
+def test_parse_interned():
+    """
+    Testing parsed names are cached and every way to write a name returns the same reference
+    """
+    addresses = AddressResolver(cache_size=4)
+
+    ref = addresses.parse('B3')
+    assert (ref.row, ref.col, ref.name) == (2, 2, 'B3')
+    assert addresses.parse('b3') is ref
+    assert addresses.parse('B03') is ref
+    assert addresses.ref(2, 2) is ref
+    assert addresses.parse(ref) is ref
+
+    # References are equal by location, even after they left the cache
+    for name in ['A1', 'A2', 'A3', 'A4', 'A5']:
+        addresses.parse(name)
+    assert addresses.parse('B3') == ref and hash(addresses.parse('B3')) == hash(ref)
+
+    for name in ['', 'A', '3B', 'A0', 'A1B', 'A-1']:
+        with pytest.raises(CellLocationError):
+            addresses.parse(name)
+
+
+def test_spreadsheet_refs():
+    """
+    Testing the spreadsheet accepts references instead of names, and validates them against its size
+    """
+    spreadsheet = Spreadsheet(rows=5, cols=3)
+
+    ref = spreadsheet.cell_ref('c5')
+    spreadsheet.edit_cell(ref, '4')
+    spreadsheet.edit_cell('A1', '=C5*2')
+
+    assert spreadsheet.get_value_from_cell(ref) == '4'
+    assert spreadsheet.get_value_from_cell(spreadsheet.cell_ref('A1')) == '8'
+    assert spreadsheet.get_cell_formula(ref) == '4'
+
+    for name in ['D1', 'A6', CellRef(5, 1, 'A6')]:
+        with pytest.raises(CellLocationError):
+            spreadsheet.cell_ref(name)
+
+
+def test_columns_limit():
+    """
+    Testing a spreadsheet can not have more columns than a packed position holds, so two cells never share a position
+    """
+    spreadsheet = Spreadsheet(rows=3, cols=CellRef.MAX_COLS, sparse=True)
+    last = spreadsheet.columns_names[-1]
+
+    spreadsheet.edit_cell(f'{last}1', '1')
+    spreadsheet.edit_cell('A2', '2')
+    assert spreadsheet.get_value_from_cell(f'{last}1') == '1'
+
+    with pytest.raises(ValueError):
+        Spreadsheet(rows=3, cols=CellRef.MAX_COLS + 1, sparse=True)
+
+    # A reset to a size that does not fit changes nothing
+    with pytest.raises(ValueError):
+        spreadsheet.reset_sheet(3, 70000)
+    assert spreadsheet.cols == CellRef.MAX_COLS and spreadsheet.get_value_from_cell('A2') == '2'
+
+
+def test_parse_threads():
+    """
+    Testing threads that parse names at the same time through a small cache get the right references, and never fail on an eviction
+    """
+    addresses = AddressResolver(cache_size=8)
+    failures = []
+
+    def parse_names(offset):
+        try:
+            for i in range(20_000):
+                row = (i + offset) % 12
+                ref = addresses.parse(f'B{row + 1}')
+                assert (ref.row, ref.col) == (row, 2)
+        except Exception as error:
+            failures.append(error)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=parse_names, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert not failures
@@ -0,0 +1,74 @@
+import pytest
+from spreadsheet import Spreadsheet
+from changeset import Changeset
+from spreadsheet_errors import *
+
+
+@pytest.fixture
+def spreadsheet():
+    return Spreadsheet(rows=10, cols=5)
+
+
+@pytest.fixture
+def changes(spreadsheet: Spreadsheet):
+    changes = []
+    spreadsheet.add_observer(changes.append)
+
+    return changes
+
+
+def test_edit_changes(spreadsheet: Spreadsheet, changes: list):
+    """
+    Testing an edit reports the edited cell and only the dependent cells whose values changed
+    """
+    spreadsheet.edit_cell('B1', '=A1*2')
+    spreadsheet.edit_cell('C1', '=COUNTIF(A1, A9, 7)')
+    changes.clear()
+
+    spreadsheet.edit_cell('A1', '3')
+
+    assert len(changes) == 1
+    assert changes[0].values == {'A1', 'B1'}
+    assert changes[0].formulas == {'A1'}
+    assert not changes[0].styles
+
+    # Same value again - the formula is the same and nothing is shown differently
+    spreadsheet.edit_cell('A1', '3')
+    assert len(changes) == 1
+
+    # An edit that fails still reports the cells it changed
+    with pytest.raises(ZeroDivision):
+        spreadsheet.edit_cell('D1', '=B1/0')
+
+    assert changes[-1].values == {'D1'}
+    assert changes[-1].formulas == {'D1'}
+
+    spreadsheet.remove_observer(changes.append)
+    spreadsheet.edit_cell('A1', '4')
+    assert len(changes) == 2
+
+
+def test_batch_changes(spreadsheet: Spreadsheet, changes: list):
+    """
+    Testing a batch is reported once, with the cells of all of its edits, and styles and resets are reported too
+    """
+    with spreadsheet.batch():
+        spreadsheet.edit_cell('A1', '=A2+1')
+        spreadsheet.edit_cell('A2', '5')
+        spreadsheet.edit_cell('A3', '')
+
+    assert len(changes) == 1
+    assert changes[0].values == {'A1', 'A2'}
+    assert changes[0].formulas == {'A1', 'A2'}
+
+    spreadsheet.set_cell_design('A1', fg='red')
+    spreadsheet.set_cell_design('A1', fg='red')
+
+    assert len(changes) == 2
+    assert changes[1].styles == {'A1'}
+    assert spreadsheet.get_cells_info('A1')['bg color'] == 'white'
+
+    spreadsheet.reset_sheet(3, 3)
+    assert changes[-1].reset
+
+    assert not Changeset()
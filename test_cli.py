@@ -0,0 +1,97 @@
+import pytest
+import subprocess
+import sys
+import os
+from libraries import *
+from spreadsheet import Spreadsheet
+from file_manager import FileManager
+from spreadsheet_types import FileType, ExportType
+from cli import main
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    spreadsheet = Spreadsheet(rows=20, cols=3)
+    spreadsheet.edit_cells({**{f'A{row}': str(row) for row in range(1, 21)}, 'B1': '=SUM_BY_RANGE(A1, A20)', 'B2': '=B1/A2'})
+
+    path = str(tmp_path / 'in.json')
+    FileManager(spreadsheet).export_to_file(path, FileType.JSON, ExportType.INCLUDE_INFO)
+
+    return path
+
+
+def test_recalc_files(input_file, tmp_path, capsys):
+    """
+    Testing files are recalculated and written by the headless entry point, and a file that fails does not stop the others
+    """
+    assert main(['recalc', input_file, '--out', str(tmp_path / 'out.json')]) == 0
+
+    with open(tmp_path / 'out.json') as json_file:
+        cells = {cell['name']: cell for cell in json.load(json_file)['cells']}
+
+    assert cells['B1']['value'] == '210'
+    assert cells['B2']['value'] == '105.0'
+
+    assert main(['recalc', input_file, str(tmp_path / 'missing.json'), '--out-dir', str(tmp_path / 'out'), '--format', 'csv', 'xlsx']) == 1
+    assert (tmp_path / 'out' / 'in.csv').exists()
+    assert (tmp_path / 'out' / 'in.xlsx').exists()
+
+    output = capsys.readouterr()
+    assert '1 of 2 files' in output.out
+    assert 'missing.json: failed' in output.err
+
+    with pytest.raises(SystemExit):
+        main(['recalc', input_file, input_file, '--out', str(tmp_path / 'out.json')])
+
+
+def test_recalc_keeps_failing_formulas(tmp_path, capsys):
+    """
+    Testing formulas that fail in the input are written as formulas, and a file the formats libraries can not read fails by itself
+    """
+    spreadsheet = Spreadsheet(rows=5, cols=3)
+    spreadsheet.edit_cells({'A1': '5', 'B1': '=A1+1', 'C1': '=B1*2'})
+    spreadsheet.edit_cell('A1', 'x')
+
+    input_path = str(tmp_path / 'errors.json')
+    FileManager(spreadsheet).export_to_file(input_path, FileType.JSON, ExportType.INCLUDE_INFO)
+
+    broken_path = tmp_path / 'broken.xlsx'
+    broken_path.write_text('not a workbook')
+
+    assert main(['recalc', str(broken_path), input_path, '--out-dir', str(tmp_path / 'out')]) == 1
+
+    with open(tmp_path / 'out' / 'errors.json') as json_file:
+        cells = {cell['name']: cell for cell in json.load(json_file)['cells']}
+
+    assert cells['B1']['formula'] == '=A1+1' and cells['C1']['formula'] == '=B1*2'
+    assert cells['B1']['value'] == cells['C1']['value'] == '#FuncValue#'
+
+    output = capsys.readouterr()
+    assert '1 of 2 files' in output.out
+    assert 'broken.xlsx: failed' in output.err
+
+
+def test_no_gui_imports(input_file):
+    """
+    Testing the headless entry point never imports tkinter
+    """
+    # Every module that is imported is listed by -X importtime
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'spreadsheet', 'recalc', input_file],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    assert result.returncode == 0
+    assert 'tkinter' not in result.stderr
+
+
+def test_metrics_file(input_file, tmp_path):
+    """
+    Testing the metrics of the engine are written for all of the files in the Prometheus format
+    """
+    metrics_path = str(tmp_path / 'metrics.prom')
+    assert main(['recalc', input_file, input_file, '--metrics', metrics_path]) == 0
+
+    with open(metrics_path) as metrics_file:
+        lines = metrics_file.read().splitlines()
+
+    assert 'spreadsheet_edits_total{kind="recalculate"} 2' in lines
+    assert 'spreadsheet_range_function_seconds_count{function="SUM_BY_RANGE"} 4' in lines
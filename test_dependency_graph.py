@@ -0,0 +1,262 @@
+import pytest
+import sys
+from spreadsheet import Spreadsheet
+from spreadsheet_errors import *
+from value_cache import ValueCache
+
+
+@pytest.fixture
+def spreadsheet():
+    return Spreadsheet(rows=10, cols=5)
+
+
+def test_recalc_order_diamond(spreadsheet: Spreadsheet):
+    """
+    Testing every dependent cell appears once, after the cells it depends on
+    """
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('B1', '=A1+1')
+    spreadsheet.edit_cell('C1', '=A1*2')
+    spreadsheet.edit_cell('D1', '=B1+C1')
+    spreadsheet.edit_cell('E1', '=D1+B1')
+
+    order = spreadsheet.dependency_graph.get_recalc_order(['A1'])
+
+    assert sorted(order) == ['A1', 'B1', 'C1', 'D1', 'E1']
+    assert order.index('B1') < order.index('D1') < order.index('E1')
+    assert order.index('C1') < order.index('D1')
+
+    spreadsheet.edit_cell('A1', '10')
+    assert spreadsheet.get_value_from_cell('D1') == '31'
+    assert spreadsheet.get_value_from_cell('E1') == '42'
+
+
+def test_stale_dependencies_removed(spreadsheet: Spreadsheet):
+    """
+    Testing a cell stops depending on cells its formula does not refer to anymore
+    """
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('A2', '2')
+    spreadsheet.edit_cell('B1', '=A1')
+    spreadsheet.edit_cell('B1', '=A2')
+
+    assert spreadsheet.dependency_graph.get_dependents('A1') == []
+    assert spreadsheet.dependency_graph.get_dependents('A2') == ['B1']
+
+    spreadsheet.edit_cell('A1', '100')
+    assert spreadsheet.get_value_from_cell('B1') == '2'
+
+
+def test_range_dependencies(spreadsheet: Spreadsheet):
+    """
+    Testing cells that use ranges are updated when a cell in the range changes
+    """
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('A2', '2')
+    spreadsheet.edit_cell('B1', '=sum_by_range(A1, A3)')
+    spreadsheet.edit_cell('A3', '3')
+
+    assert spreadsheet.get_value_from_cell('B1') == '6'
+    assert spreadsheet.dependency_graph.get_dependents('A5') == []
+
+    with pytest.raises(CircularReferenceError):
+        spreadsheet.edit_cell('A2', '=B1')
+
+
+def test_countif_condition_dependencies(spreadsheet: Spreadsheet):
+    """
+    Testing cells are updated when the cell of a COUNTIF condition changes, and a condition cell can not create a circle
+    """
+    spreadsheet.edit_cells({'A1': '5', 'A2': '5', 'B1': '5', 'C1': '=COUNTIF(A1, A2, B1)', 'C2': '=C1+1'})
+    assert spreadsheet.get_value_from_cell('C1') == '2'
+
+    spreadsheet.edit_cell('B1', '7')
+    assert spreadsheet.get_value_from_cell('C1') == '0'
+    assert spreadsheet.get_value_from_cell('C2') == '1'
+
+    spreadsheet.edit_cells({'B1': '=A1'})
+    assert spreadsheet.get_value_from_cell('C1') == '2'
+    assert spreadsheet.dependency_graph.get_dependents('B1') == ['C1']
+
+    with pytest.raises(CircularReferenceError):
+        spreadsheet.edit_cell('D1', '=COUNTIF(A1, A2, D1)')
+
+    with pytest.raises(CircularReferenceError):
+        spreadsheet.edit_cell('B1', '=C2')
+
+
+def test_error_does_not_stop_update(spreadsheet: Spreadsheet):
+    """
+    Testing an error in one dependent cell does not stop the update of the others, and the cell recovers later
+    """
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('B1', '=1/A1')
+    spreadsheet.edit_cell('C1', '=A1+1')
+
+    spreadsheet.edit_cell('A1', '0')
+    assert spreadsheet.get_value_from_cell('B1') == ZeroDivision.VALUE
+    assert spreadsheet.get_value_from_cell('C1') == '1'
+
+    spreadsheet.edit_cell('A1', '2')
+    assert spreadsheet.get_value_from_cell('B1') == '0.5'
+    assert spreadsheet.get_cell_formula('B1') == '=1/A1'
+
+
+@pytest.fixture
+def low_recursion_limit():
+    """
+    Lowering the recursion limit, so any evaluation that recurses per reference fails on short chains
+    """
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(250)
+    yield
+    sys.setrecursionlimit(limit)
+
+
+def test_deep_chain(low_recursion_limit):
+    """
+    Testing a chain of references longer than the recursion limit is evaluated and updated
+    """
+    length = 600
+    spreadsheet = Spreadsheet(rows=length, cols=2)
+
+    spreadsheet.edit_cell('A1', '1')
+    for row in range(2, length + 1):
+        spreadsheet.edit_cell(f'A{row}', f'=A{row - 1}+1')
+
+    assert spreadsheet.get_value_from_cell(f'A{length}') == str(length)
+
+    # Updating the head of the chain updates all of it
+    spreadsheet.edit_cell('A1', '10')
+    assert spreadsheet.get_value_from_cell(f'A{length}') == str(length + 9)
+
+    # Evaluating the tail of the chain from scratch
+    assert spreadsheet.evaluate_cell_value(f'=A{length}*2', 'B1') == str((length + 9) * 2)
+
+    # Closing the chain into a circle
+    with pytest.raises(CircularReferenceError):
+        spreadsheet.edit_cell('A1', f'=A{length}')
+
+
+def test_value_cache():
+    """
+    Testing cached values are valid until they are invalidated
+    """
+    cache = ValueCache()
+    assert cache.get('A1') is ValueCache.MISSING
+
+    cache.set('A1', '5')
+    assert cache.get('A1') == '5'
+
+    cache.invalidate(['A1'])
+    assert cache.get('A1') is ValueCache.MISSING
+
+    cache.set('A1', '6')
+    assert cache.get('A1') == '6'
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_shared_total_evaluated_once(spreadsheet: Spreadsheet, monkeypatch):
+    """
+    Testing only the cells that changed are evaluated, clean cells are read from the cache
+    """
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('A2', '2')
+    spreadsheet.edit_cell('B1', '=A1+A2')
+    for row in range(1, 6):
+        spreadsheet.edit_cell(f'C{row}', f'=B1*{row}')
+
+    evaluated_formulas = []
+    evaluate_compiled = spreadsheet.__evaluate_compiled__
+
+    def count_evaluations(compiled, original_cell_name, evaluated):
+        evaluated_formulas.append(compiled.expression)
+        return evaluate_compiled(compiled, original_cell_name, evaluated)
+
+    monkeypatch.setattr(spreadsheet, '__evaluate_compiled__', count_evaluations)
+
+    # The total is read from the cache by every token that refers to it
+    spreadsheet.edit_cell('D1', '=B1+B1+B1+C5')
+    assert evaluated_formulas == ['B1+B1+B1+C5']
+    assert spreadsheet.get_value_from_cell('D1') == '24'
+
+    # Changing an input evaluates the total once, and then each of its dependents once
+    evaluated_formulas.clear()
+    spreadsheet.edit_cell('A1', '2')
+    assert sorted(evaluated_formulas) == sorted(['B1*1', 'B1*2', 'B1*3', 'B1*4', 'B1*5', 'A1+A2', 'B1+B1+B1+C5'])
+    assert spreadsheet.get_value_from_cell('D1') == '32'
+
+    # Changing a cell nobody depends on evaluates nothing else
+    evaluated_formulas.clear()
+    spreadsheet.edit_cell('E5', '7')
+    assert evaluated_formulas == []
+
+
+def test_recalc_levels(spreadsheet: Spreadsheet):
+    """
+    Testing cells are grouped into levels after all of the cells they depend on, by reference or by range
+    """
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('B1', '=A1+1')
+    spreadsheet.edit_cell('B2', '=A1*2')
+    spreadsheet.edit_cell('C1', '=SUM_BY_RANGE(B1, B2)')
+    spreadsheet.edit_cell('D1', '=C1+A1')
+
+    order = spreadsheet.dependency_graph.get_recalc_order(['A1'])
+    levels = spreadsheet.dependency_graph.get_recalc_levels(order)
+
+    assert [sorted(level) for level in levels] == [['A1'], ['B1', 'B2'], ['C1'], ['D1']]
+
+
+def test_parallel_recalc():
+    """
+    Testing a parallel recalculation gives the same values and errors as a serial one
+    """
+    cells = {'A1': '2', 'A2': '0'}
+    cells.update({f'B{row}': f'=A1*{row}' for row in range(1, 41)})
+    cells.update({f'C{row}': f'=B{row}/A2' if row == 7 else f'=B{row}+SUM_BY_RANGE(B1, B40)' for row in range(1, 41)})
+
+    values = {}
+    for workers in (1, 2):
+        spreadsheet = Spreadsheet(rows=40, cols=3, workers=workers)
+        spreadsheet.parallel_recalc.threshold = 10
+
+        errors = spreadsheet.edit_cells(cells)
+        assert list(errors) == ['C7'] and isinstance(errors['C7'], ZeroDivision)
+
+        spreadsheet.edit_cell('A1', '3')
+        assert not spreadsheet.recalculate()
+        assert spreadsheet.get_value_from_cell('C7') == ZeroDivision.VALUE and spreadsheet.get_value_from_cell('C40') == '2580'
+        values[workers] = spreadsheet.cells_df.values.tolist()
+
+        # Levels are evaluated in parallel only when the pool can be forked
+        assert spreadsheet.parallel_recalc.levels == (6 if workers > 1 and spreadsheet.parallel_recalc.enabled else 0)
+
+    assert values[1] == values[2]
+
+
+def test_range_dependents_blocks():
+    """
+    Testing ranges over many blocks find their cells, and reading dependents does not create cells
+    """
+    spreadsheet = Spreadsheet(rows=3000, cols=40)
+    spreadsheet.edit_cell('A1', '=SUM_BY_RANGE(B1000, AH2100)')
+    spreadsheet.edit_cell('A2', '=SUM_BY_RANGE(C5, C6)')
+    used_cells = len(spreadsheet.cells)
+
+    graph = spreadsheet.dependency_graph
+    assert graph.get_dependents('B1000') == ['A1']
+    assert graph.get_dependents('AH2100') == ['A1']
+    assert graph.get_dependents('Q1500') == ['A1']
+    assert graph.get_dependents('AI2100') == graph.get_dependents('B999') == graph.get_dependents('B2101') == []
+    assert graph.get_dependents('C6') == ['A2']
+    assert len(spreadsheet.cells) == used_cells
+
+    # Replacing the ranges of a cell removes it from all of the blocks
+    spreadsheet.edit_cell('A1', '=SUM_BY_RANGE(C5, C5)')
+    assert graph.get_dependents('Q1500') == []
+    assert sorted(graph.get_dependents('C5')) == ['A1', 'A2']
+
+    spreadsheet.edit_cell('Q1500', '4')
+    spreadsheet.edit_cell('C5', '2')
+    assert spreadsheet.get_value_from_cell('A1') == '2'
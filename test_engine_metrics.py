@@ -0,0 +1,73 @@
+import pytest
+from libraries import *
+from spreadsheet import Spreadsheet
+from spreadsheet_errors import *
+from engine_metrics import MetricsRegistry
+
+
+def test_edit_metrics():
+    """
+    Testing edits are counted with the cells they evaluated, the depth of their propagation, their errors and their range functions
+    """
+    spreadsheet = Spreadsheet(rows=10, cols=3, metrics=True)
+    spreadsheet.edit_cells({'A1': '1', 'A2': '=A1+1', 'A3': '=A2+1', 'B1': '=SUM_BY_RANGE(A1, A3)', 'C1': '=1/(A1-2)'})
+
+    spreadsheet.metrics.propagation_cells.series.clear()
+    spreadsheet.metrics.propagation_depth.series.clear()
+    spreadsheet.edit_cell('A1', '2')
+
+    # A2, A3 and C1 depend on A1, B1 depends on all of them and A3 depends on A2
+    assert spreadsheet.metrics.propagation_cells.snapshot()['']['sum'] == 4
+    assert spreadsheet.metrics.propagation_depth.snapshot()['']['sum'] == 3
+    assert spreadsheet.metrics.edits.values == {'batch': 1, 'edit_cell': 1}
+    assert spreadsheet.metrics.errors.values == {'ZeroDivision': 1}
+    assert spreadsheet.metrics.range_seconds.snapshot()['SUM_BY_RANGE']['count'] == 2
+
+    with pytest.raises(CircularReferenceError):
+        spreadsheet.edit_cell('A1', '=A3')
+
+    assert spreadsheet.metrics.errors.values['CircularReferenceError'] == 1
+    assert spreadsheet.metrics.edits.values['edit_cell'] == 2
+
+
+def test_metrics_disabled():
+    """
+    Testing there are no metrics unless they are asked for
+    """
+    spreadsheet = Spreadsheet(rows=5, cols=2)
+    spreadsheet.edit_cells({'A1': '1', 'A2': '=A1/0'})
+
+    assert spreadsheet.metrics is None
+
+
+def test_prometheus_format():
+    """
+    Testing counters and histograms in the Prometheus text format, with cumulative buckets and escaped labels
+    """
+    registry = MetricsRegistry()
+    counter = registry.counter('errors_total', 'Errors', label='type')
+    histogram = registry.histogram('latency_seconds', 'Latency', buckets=[0.1, 1])
+
+    counter.inc(label='a"b')
+    counter.inc(2_000_000, label='c')
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+
+    assert registry.to_prometheus().splitlines() == [
+        '# HELP errors_total Errors',
+        '# TYPE errors_total counter',
+        'errors_total{type="a\\"b"} 1',
+        'errors_total{type="c"} 2000000',
+        '# HELP latency_seconds Latency',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 3.65',
+        'latency_seconds_count 4',
+    ]
+
+    assert json.loads(registry.to_json())['latency_seconds']['values']['']['buckets'] == {'0.1': 2, '1': 3, '+Inf': 4}
+
+    with pytest.raises(ValueError):
+        registry.counter('errors_total', 'Errors again')
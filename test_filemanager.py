@@ -4,8 +4,11 @@ from spreadsheet import Spreadsheet
 from file_manager import FileManager
 from spreadsheet_types import FileType, ExportType, ImportType
 from spreadsheet_errors import *
+from file_job import FileJob
 
 import os
+import subprocess
+import sys
 
 @pytest.fixture
 def initialized_spreadsheet():
@@ -152,3 +155,128 @@ def test_non_existing_file(initialized_spreadsheet):
 
     with pytest.raises(ImportFileError):
         file_manager.import_file('No such file.json', FileType.JSON, ImportType.VALUES_ONLY)
+
+
+def test_import_through_staging(initialized_spreadsheet):
+    """ Testing an import reports its progress, and a cancelled or failed import leaves the spreadsheet as it was """
+
+    initialized_spreadsheet.edit_cell('a1', '=2*3')
+    initialized_spreadsheet.edit_cell('b2', 'text')
+    file_manager = FileManager(initialized_spreadsheet)
+    file_manager.export_to_file("test_i.json", FileType.JSON, ExportType.INCLUDE_INFO)
+
+    other = Spreadsheet(rows=4, cols=3)
+    other.edit_cell('c4', '=1+1')
+    other_manager = FileManager(other)
+
+    # Cancelled import
+    job = FileJob()
+    job.cancel()
+    with pytest.raises(FileJobCancelledError):
+        other_manager.import_file("test_i.json", FileType.JSON, ImportType.FORMULAS, job)
+
+    assert (other.rows, other.cols) == (4, 3)
+    assert other.get_value_from_cell('C4') == '2'
+
+    # Failed import
+    with open("test_i.json") as json_file:
+        data = json.load(json_file)
+    data['cells'][0]['index'] = [5, 5]
+    with open("test_v.json", 'w') as json_file:
+        json.dump(data, json_file)
+
+    with pytest.raises(FileFormatError):
+        other_manager.import_file("test_v.json", FileType.JSON, ImportType.FORMULAS)
+
+    assert other.get_value_from_cell('C4') == '2'
+
+    # Successful import
+    progress = []
+    errors = other_manager.import_file("test_i.json", FileType.JSON, ImportType.FORMULAS, FileJob(progress=lambda *step: progress.append(step)))
+
+    assert not errors
+    assert progress[-1] == ('Importing cells', 2, 2)
+    assert (other.rows, other.cols) == (10, 10)
+    assert other.get_value_from_cell('A1') == '6'
+    assert other.get_value_from_cell('C4') == ''
+
+    # The imported cells are part of the spreadsheet like any other cells
+    other.edit_cell('a2', '=a1+1')
+    other.edit_cell('a1', '1')
+    assert other.get_value_from_cell('A2') == '2'
+
+
+def test_export_progress(initialized_spreadsheet):
+    """ Testing an export reports its progress and can be cancelled """
+
+    initialized_spreadsheet.edit_cell('a1', '3')
+    file_manager = FileManager(initialized_spreadsheet)
+
+    progress = []
+    file_manager.export_to_file("test_yaml_values.csv", FileType.CSV, ExportType.VALUES_ONLY, FileJob(progress=lambda *step: progress.append(step)))
+    assert progress == [('Collecting rows', 0, 10), ('Collecting rows', 10, 10)]
+
+    job = FileJob()
+    job.cancel()
+    with pytest.raises(FileJobCancelledError):
+        file_manager.export_to_file("test_yaml_values.csv", FileType.CSV, ExportType.VALUES_ONLY, job)
+
+
+
+def test_excel_round_trip_numbers(initialized_spreadsheet, tmp_path):
+    """ Testing numbers exported to excel are imported back as cells values """
+
+    initialized_spreadsheet.edit_cell('A1', '5')
+    initialized_spreadsheet.edit_cell('B1', '=A1+1')
+    FileManager(initialized_spreadsheet).export_to_file(str(tmp_path / 'numbers.xlsx'), FileType.EXCEL, ExportType.INCLUDE_INFO)
+
+    spreadsheet = Spreadsheet()
+    FileManager(spreadsheet).import_file(str(tmp_path / 'numbers.xlsx'), FileType.EXCEL, ImportType.FORMULAS)
+
+    assert spreadsheet.get_value_from_cell('A1') == '5'
+    assert spreadsheet.get_value_from_cell('B1') == '6'
+
+
+@pytest.mark.parametrize('file_type, name', [(FileType.JSON, 'errors.json'), (FileType.EXCEL, 'errors.xlsx')])
+def test_round_trip_errored_formulas(initialized_spreadsheet, tmp_path, file_type, name):
+    """ Testing formulas that fail when they are exported are imported as formulas, and recover when their cells change """
+
+    initialized_spreadsheet.edit_cell('A1', '6')
+    initialized_spreadsheet.edit_cell('B1', '=A1+1')
+    initialized_spreadsheet.edit_cell('C1', '=10/(A1-5)')
+    initialized_spreadsheet.edit_cell('A1', 'x')
+    FileManager(initialized_spreadsheet).export_to_file(str(tmp_path / name), file_type, ExportType.INCLUDE_INFO)
+
+    spreadsheet = Spreadsheet()
+    errors = FileManager(spreadsheet).import_file(str(tmp_path / name), file_type, ImportType.FORMULAS)
+
+    assert set(errors) == {'B1', 'C1'}
+    assert spreadsheet.get_cell_formula('B1') == '=A1+1'
+    assert spreadsheet.get_value_from_cell('B1') == FormulaValueError.VALUE
+
+    spreadsheet.edit_cell('A1', '7')
+    assert spreadsheet.get_value_from_cell('B1') == '8'
+    assert spreadsheet.get_value_from_cell('C1') == '5.0'
+
+
+def test_lazy_file_formats(tmp_path):
+    """ Testing the dependencies of a file format are imported only when the format is used """
+
+    # A new interpreter, pytest itself may have imported them already
+    code = f'''
+import sys
+from spreadsheet import Spreadsheet
+from file_manager import FileManager
+from spreadsheet_types import FileType, ExportType
+heavy = ('pandas', 'yaml', 'xlsxwriter', 'openpyxl', 'fpdf', 'tabulate')
+print(*[name for name in heavy if name in sys.modules])
+file_manager = FileManager(Spreadsheet(5, 5))
+file_manager.export_to_file({str(tmp_path / 'info.json')!r}, FileType.JSON, ExportType.INCLUDE_INFO)
+print(*[name for name in heavy if name in sys.modules])
+file_manager.export_to_file({str(tmp_path / 'values.yml')!r}, FileType.YAML, ExportType.VALUES_ONLY)
+print(*[name for name in heavy if name in sys.modules])
+'''
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ['', '', 'pandas yaml']
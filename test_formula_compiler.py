@@ -0,0 +1,73 @@
+import pytest
+from spreadsheet import Spreadsheet
+from formula_compiler import FormulaCompiler
+from spreadsheet_errors import *
+
+
+@pytest.fixture
+def compiler():
+    return FormulaCompiler(r'[A-Za-z]+[1-9]\d*', ["SUM_BY_RANGE", "AVERAGE_BY_RANGE", "COUNTNUMS", "COUNTIF"])
+
+
+def test_compile_formula(compiler: FormulaCompiler):
+    """
+    Testing a formula is parsed into its tokens and range calls
+    """
+    compiled = compiler.compile('=a1 + sum(b2, A1) * sum_by_range(a1, c3)')
+
+    assert compiled.expression == 'A1+SUM(B2,A1)*range_0'
+    assert compiled.tokens == ['A1', 'B2', 'A1']
+    assert compiled.references == ('A1', 'B2')
+    assert not compiled.is_reference
+
+    call = compiled.range_calls[0]
+    assert (call.func, call.start, call.stop) == ('SUM_BY_RANGE', 'A1', 'C3')
+
+    assert compiler.compile('=A1').is_reference
+    assert compiler.compile('=countif(a1, a5, b1)').range_calls[0].condition_ref == 'B1'
+
+
+def test_compile_cache(compiler: FormulaCompiler):
+    """
+    Testing every distinct formula is parsed only once
+    """
+    first = compiler.compile('=A1+1')
+    second = compiler.compile('=A1+1')
+
+    assert first is second
+    assert compiler.hits == 1
+    assert compiler.misses == 1
+    assert len(compiler) == 1
+
+
+def test_compile_errors(compiler: FormulaCompiler):
+    """
+    Testing range functions that are not called correctly
+    """
+    with pytest.raises(FormulaValueError):
+        compiler.compile('=SUM_BY_RANGE(A1)')
+
+    with pytest.raises(FormulaValueError):
+        compiler.compile('=SUM_BY_RANGE(A1, 5)')
+
+    with pytest.raises(FunctionSyntaxError):
+        compiler.compile('=COUNTIF(A1, A5, B1+B2)')
+
+    # Invalid syntax is only raised when evaluated
+    assert compiler.compile('=4 +').code is None
+
+
+def test_spreadsheet_uses_cache():
+    """
+    Testing the spreadsheet reuses compiled formulas when evaluating again
+    """
+    spreadsheet = Spreadsheet(rows=5, cols=2)
+    spreadsheet.edit_cell('A1', '2')
+    spreadsheet.edit_cell('B1', '=A1*3')
+
+    misses = spreadsheet.formula_compiler.misses
+    assert spreadsheet.evaluate_cell_value('=A1*3', 'B1') == '6'
+    assert spreadsheet.formula_compiler.misses == misses
+
+    spreadsheet.edit_cell('B2', '=countif(a1, a5, a1) + sum_by_range(a1, a2)')
+    assert spreadsheet.get_value_from_cell('B2') == '3'
@@ -0,0 +1,105 @@
+import pytest
+import random
+from grid_window import GridWindow
+
+
+@pytest.fixture
+def window():
+    # A spreadsheet of 100 rows and 8 columns, shown by a grid of 10 rows and 4 columns of entries
+    window = GridWindow(rows=100, cols=8)
+    window.resize(10, 4)
+    return window
+
+
+def test_resize(window):
+    """
+    Testing the grid has at least one entry, and no more entries than the spreadsheet has cells
+    """
+    assert not window.resize(10, 4)
+    assert window.resize(0, 50) and (window.pool_rows, window.pool_cols) == (1, 8)
+    assert window.resize(500, 2) and (window.pool_rows, window.pool_cols) == (100, 2)
+
+
+def test_scroll_to(window):
+    """
+    Testing the grid scrolls no further than showing the last row and column at its bottom and right edges
+    """
+    window.scroll_to(-5, -1)
+    assert (window.first_row, window.first_col) == (0, 0)
+
+    window.scroll_to(200, 200)
+    assert (window.first_row, window.first_col) == (91, 5)
+    assert window.cell_of(8, 2) == (99, 7) and window.cell_of(9, 3) is None
+    assert window.scrollbars() == ((0.91, 1), (0.625, 1))
+
+    window.scroll_to(40, 2)
+    assert window.scrollbars() == ((0.4, 0.5), (0.25, 0.75))
+
+
+def test_scroll_position(window):
+    """
+    Testing scrollbars commands - a fraction of the spreadsheet, units and pages, a page keeps one row of the previous one shown
+    """
+    assert GridWindow.scroll_position(('moveto', '0.5'), 7, 100, 10) == 50
+    assert GridWindow.scroll_position(('scroll', '3', 'units'), 7, 100, 10) == 10
+    assert GridWindow.scroll_position(('scroll', '-1', 'pages'), 20, 100, 10) == 11
+    assert GridWindow.scroll_position(('scroll', '1', 'pages'), 0, 100, 1) == 1
+
+
+def test_entries_cells(window):
+    """
+    Testing every entry shows a single cell and every shown cell has a single entry, while the grid scrolls
+    """
+    random.seed(3)
+
+    for _ in range(50):
+        window.scroll_to(random.randrange(-5, 110), random.randrange(-2, 10))
+        cells = {}
+
+        for i in range(window.pool_rows):
+            for j in range(window.pool_cols):
+                cell = window.cell_of(i, j)
+
+                # Entries after the end of the spreadsheet show nothing
+                if cell is None:
+                    assert window.first_row + i >= 100 or window.first_col + j >= 8
+                    continue
+
+                assert window.place_of(*cell) == (i, j)
+                cells[cell] = (i, j)
+
+        assert len(cells) == min(100 - window.first_row, 10) * min(8 - window.first_col, 4)
+        assert window.place_of(window.first_row - 1, window.first_col) is None
+        assert window.place_of(window.first_row + 10, window.first_col) is None
+
+
+def test_navigation(window):
+    """
+    Testing keys move between cells and stop at the edges, and the grid follows the focused cell so it is shown entirely
+    """
+    assert window.move(0, 0, 'Up') == (0, 0) and window.move(0, 0, 'Left') == (0, 0)
+    assert window.move(99, 7, 'Down') == (99, 7) and window.move(99, 7, 'Tab') == (99, 7)
+    assert window.move(5, 5, 'ISO_Left_Tab') == (5, 4)
+    assert window.move(5, 5, 'space') is None
+
+    # Going down from the top, the grid scrolls once the cell reaches the last row, which is partly shown
+    row, col = 0, 0
+    for _ in range(150):
+        row, col = window.move(row, col, 'Down')
+        window.follow(row, col)
+
+        i, j = window.place_of(row, col)
+        assert i <= window.pool_rows - 2 or row == 99
+
+    assert (row, window.first_row) == (99, 91)
+
+    # Going back up, the grid scrolls once the cell is above its first row
+    assert not window.follow(95, 0)
+    assert window.follow(90, 0) and window.first_row == 90
+
+    # Going right to the last column
+    for _ in range(10):
+        row, col = window.move(row, col, 'Right')
+        window.follow(row, col)
+
+    assert window.place_of(row, col) == (8, 2) and window.first_col == 5
@@ -0,0 +1,47 @@
+import pytest
+from latency_tracer import LatencyTracer, RollingHistogram
+
+
+def test_rolling_percentiles():
+    """
+    Testing percentiles are taken from the latest samples only
+    """
+    histogram = RollingHistogram(100)
+    assert histogram.percentiles(50) == [0.0]
+
+    for i in range(1, 201):
+        histogram.add(i)
+
+    assert histogram.count == 200
+    assert histogram.percentiles(50, 95, 99, 100) == [150, 195, 199, 200]
+
+
+def test_latency_phases():
+    """
+    Testing the phases of edits, an edit that was superseded is finished with the edit that superseded it
+    """
+    tracer = LatencyTracer()
+    tracer.start(1)
+    tracer.start(2)
+    start = tracer.traces[1][0]
+
+    tracer.add_time('idle', 0.5)
+    tracer.result(2, start + 1)
+    tracer.add_time('repaint', 0.25)
+    tracer.finish(2, start + 3)
+
+    assert not tracer.traces
+
+    summary = tracer.summary()
+    assert summary['total']['count'] == 2
+    assert summary['idle']['p50'] == 500
+    assert summary['repaint']['p99'] == 250
+    assert summary['propagate']['p50'] == 2000
+    assert 900 <= summary['evaluate']['p50'] <= 1000
+    assert tracer.status_text().startswith('Latency p50')
+
+    # A disabled tracer does not measure anything
+    tracer = LatencyTracer(enabled=False)
+    tracer.start(1)
+    tracer.finish(1, 0)
+    assert tracer.summary()['total']['count'] == 0
@@ -0,0 +1,195 @@
+import pytest
+import random
+from spreadsheet import Spreadsheet
+from prefix_sum_index import PrefixSumIndex
+from spreadsheet_errors import *
+
+
+@pytest.fixture(params=[(False, False), (True, False), (False, True), (True, True)], ids=['dense', 'sparse', 'dense-index', 'sparse-index'])
+def range_spreadsheet(request):
+    sparse, range_index = request.param
+    spreadsheet = Spreadsheet(rows=300, cols=70, sparse=sparse, range_index=range_index)
+
+    # Values on both sides of the sparse tiles edges
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('A2', '2')
+    spreadsheet.edit_cell('BL257', '3')
+    spreadsheet.edit_cell('BM300', '4')
+    spreadsheet.edit_cell('B1', 'text')
+    spreadsheet.edit_cell('B2', '007')
+    return spreadsheet
+
+
+def test_sum_and_average(range_spreadsheet):
+    """
+    Testing sums keep ints as ints, floats make them floats and empty cells are 0
+    """
+    range_spreadsheet.edit_cell('BR1', '=SUM_BY_RANGE(A1, A300)')
+    range_spreadsheet.edit_cell('BR2', '=SUM_BY_RANGE(C1, BM300)')
+    assert range_spreadsheet.get_value_from_cell('BR1') == '3'
+    assert range_spreadsheet.get_value_from_cell('BR2') == '7'
+
+    # Numbers written as text are numbers for the sum
+    range_spreadsheet.edit_cell('BR3', '=SUM_BY_RANGE(B2, B3)')
+    assert range_spreadsheet.get_value_from_cell('BR3') == '7'
+
+    range_spreadsheet.edit_cell('A3', '0.5')
+    assert range_spreadsheet.get_value_from_cell('BR1') == '3.5'
+
+    range_spreadsheet.edit_cell('BR4', '=AVERAGE_BY_RANGE(A1, A4)')
+    assert range_spreadsheet.get_value_from_cell('BR4') == '0.875'
+
+    with pytest.raises(FormulaValueError):
+        range_spreadsheet.edit_cell('BR5', '=SUM_BY_RANGE(A1, B2)')
+
+    with pytest.raises(CircularReferenceError):
+        range_spreadsheet.edit_cell('A5', '=SUM_BY_RANGE(A1, A10)')
+
+
+def test_big_ints_sum(range_spreadsheet):
+    """
+    Testing sums of integers that are too big for a float are exact
+    """
+    range_spreadsheet.edit_cell('D1', str(2 ** 60))
+    range_spreadsheet.edit_cell('D2', '1')
+    range_spreadsheet.edit_cell('E1', '=SUM_BY_RANGE(D1, D300)')
+
+    assert range_spreadsheet.get_value_from_cell('E1') == str(2 ** 60 + 1)
+
+
+def test_count_functions(range_spreadsheet):
+    """
+    Testing COUNTNUMS counts numbers only, and COUNTIF compares numbers, texts and empty cells
+    """
+    range_spreadsheet.edit_cell('A3', '2.0')
+    range_spreadsheet.edit_cell('C1', '2')
+
+    range_spreadsheet.edit_cell('BR1', '=COUNTNUMS(A1, BM300)')
+    range_spreadsheet.edit_cell('BR2', '=COUNTIF(A1, BM300, 2)')
+    range_spreadsheet.edit_cell('BR3', '=COUNTIF(A1, BM300, C1)')
+    range_spreadsheet.edit_cell('BR4', '=COUNTIF(A1, B300, TEXT)')
+    range_spreadsheet.edit_cell('BR5', '=COUNTIF(A1, B300, 007)')
+
+    assert range_spreadsheet.get_value_from_cell('BR1') == '6'
+    assert range_spreadsheet.get_value_from_cell('BR2') == '3'
+    assert range_spreadsheet.get_value_from_cell('BR3') == '3'
+    assert range_spreadsheet.get_value_from_cell('BR4') == '0'
+    assert range_spreadsheet.get_value_from_cell('BR5') == '1'
+
+    # Upper case text, the condition is upper cased with the rest of the formula
+    range_spreadsheet.edit_cell('B3', 'TEXT')
+    assert range_spreadsheet.get_value_from_cell('BR4') == '1'
+
+    # Empty condition counts empty cells
+    range_spreadsheet.edit_cell('Q1', '')
+    range_spreadsheet.edit_cell('BR6', '=COUNTIF(A1, B10, Q1)')
+    assert range_spreadsheet.get_value_from_cell('BR6') == '14'
+
+
+@pytest.mark.parametrize('sparse', [False, True], ids=['dense', 'sparse'])
+def test_prefix_sum_index(sparse):
+    """
+    Testing the prefix sums index gives the same sums as reading the ranges, while cells change, with small regions
+    """
+    spreadsheet = Spreadsheet(rows=40, cols=12, sparse=sparse)
+    index = spreadsheet.range_index = PrefixSumIndex(spreadsheet.values, region_rows=8, region_cols=4)
+
+    random.seed(1)
+    for _ in range(300):
+        row, col = random.randrange(40), random.randrange(11)
+        value = random.choice(['', str(random.randint(-50, 50)), str(random.randint(-50, 50) / 4)])
+        spreadsheet.edit_cell(spreadsheet.columns_names[col] + str(row + 1), value)
+
+        start_row, start_col = random.randrange(40), random.randrange(11)
+        stop_row, stop_col = random.randint(start_row, 40), random.randint(start_col, 11)
+
+        range_values = spreadsheet.values.range_values(start_row, stop_row, start_col, stop_col)
+        indexed = index.range_sum(start_row, stop_row, start_col, stop_col)
+
+        spreadsheet.range_index = None
+        scanned = spreadsheet.__sum_by_range__(range_values)
+        spreadsheet.range_index = index
+
+        # Ranges with floats are summed by reading them
+        assert indexed is None or (type(indexed) is type(scanned) and indexed == scanned)
+
+    # Regions are built only when they are summed
+    assert 0 < len(index.regions) <= 30 and index.memory_usage() > 0
+
+    # Texts are not summed by the index
+    spreadsheet.edit_cell('A1', 'text')
+    assert index.range_sum(0, 40, 0, 11) is None
+
+
+@pytest.mark.parametrize('sparse', [False, True], ids=['dense', 'sparse'])
+def test_prefix_sum_index_floats(sparse):
+    """
+    Testing the prefix sums index does not change the sums of floats, small floats after big ones are not lost
+    """
+    results = []
+
+    for range_index in (False, True):
+        spreadsheet = Spreadsheet(rows=20, cols=4, sparse=sparse, range_index=range_index)
+        spreadsheet.edit_cells({'A1': '=10.0**16', 'A2': '0.5', 'A4': '1e-3', 'A5': '3', 'B1': '-1e20', 'B2': '0.25', 'B3': '7'})
+        spreadsheet.edit_cells({'D1': '=SUM_BY_RANGE(A2, A2)', 'D2': '=AVERAGE_BY_RANGE(A2, A3)', 'D3': '=SUM_BY_RANGE(A2, B5)',
+                                'D4': '=SUM_BY_RANGE(A1, B20)', 'D5': '=SUM_BY_RANGE(A5, A20)', 'D6': '=AVERAGE_BY_RANGE(B2, B3)'})
+
+        spreadsheet.edit_cell('A3', '0.125')
+        results.append([spreadsheet.get_value_from_cell(f'D{row}') for row in range(1, 7)])
+
+    assert results[1] == results[0]
+    assert results[1][:3] == ['0.5', '0.3125', '10.876']
+
+
+@pytest.mark.parametrize('sparse', [False, True], ids=['dense', 'sparse'])
+def test_value_index(sparse):
+    """
+    Testing the values index counts the same cells as comparing them one by one, while cells change, and builds every column once
+    """
+    spreadsheet = Spreadsheet(rows=600, cols=4, sparse=sparse)
+    index = spreadsheet.value_index
+
+    random.seed(2)
+    choices = ['', '1', '2', '2.0', '0.5', 'a', 'A', '007']
+    for _ in range(300):
+        row, col = random.randrange(600), random.randrange(3)
+        spreadsheet.edit_cell(spreadsheet.columns_names[col] + str(row + 1), random.choice(choices))
+
+        start_row, start_col = random.randrange(600), random.randrange(3)
+        stop_row, stop_col = random.randint(start_row, 600), random.randint(start_col, 3)
+        value = random.choice([1, 2, 0.5, 'a', '007', None])
+
+        cells = [spreadsheet.values.get(r, c) for r in range(start_row, stop_row) for c in range(start_col, stop_col)]
+        expected = sum(cell != '' for cell in cells) if value is None else sum(cell == value for cell in cells)
+        assert index.count(start_row, stop_row, start_col, stop_col, value) == expected
+
+    assert index.builds == 3 and index.misses == 3 and index.hits > 0
+
+    # COUNTIF uses the columns that were already built
+    spreadsheet.edit_cell('D1', '=COUNTIF(A1, C600, 2)')
+    assert spreadsheet.get_value_from_cell('D1') == str(index.count(0, 600, 0, 3, 2))
+    assert index.builds == 3
+
+
+@pytest.mark.parametrize('sparse', [False, True], ids=['dense', 'sparse'])
+def test_value_index_not_a_number(sparse):
+    """
+    Testing cells that are not a number are counted as not empty by COUNTIF, like comparing them one by one, and are not equal to anything
+    """
+    spreadsheet = Spreadsheet(rows=10, cols=4, sparse=sparse)
+    spreadsheet.edit_cell('A1', '=(10.0**200*10.0**200)*0')
+    spreadsheet.edit_cell('A2', '1')
+
+    # Both before and after the column's index is built
+    spreadsheet.edit_cell('B1', '=COUNTIF(A1, A10, C1)')
+    assert spreadsheet.get_value_from_cell('B1') == '8'
+
+    spreadsheet.edit_cell('A3', '=(10.0**200*10.0**200)*0')
+    assert spreadsheet.get_value_from_cell('B1') == '7'
+
+    index = spreadsheet.value_index
+    assert index.count(0, 10, 0, 1, float('nan')) == index.count(0, 10, 0, 1, 'nan') == 0
+    assert index.count(0, 10, 0, 1) == 3
+
+    spreadsheet.edit_cell('A1', '')
+    assert index.count(0, 10, 0, 1) == 2
@@ -0,0 +1,91 @@
+import pytest
+from spreadsheet import Spreadsheet
+from recalc_scheduler import RecalcScheduler
+from spreadsheet_errors import *
+
+
+@pytest.fixture
+def chain():
+    """
+    A chain of references of 2000 cells, and a scheduler that keeps everything it reports
+    """
+    spreadsheet = Spreadsheet(rows=2000, cols=3)
+    spreadsheet.edit_cells({f'A{row}': f'=A{row - 1}+1' if row > 1 else '1' for row in range(1, 2001)})
+
+    reports = {'pending': [], 'values': {}, 'errors': {}, 'idle': []}
+    scheduler = RecalcScheduler(spreadsheet, chunk_size=100,
+                                on_pending=lambda generation, names: reports['pending'].append((generation, names)),
+                                on_values=lambda generation, values: reports['values'].update(values),
+                                on_error=lambda name, error: reports['errors'].update({name: error}),
+                                on_idle=reports['idle'].append)
+    yield spreadsheet, scheduler, reports
+    scheduler.stop()
+
+
+def test_background_recalc(chain):
+    """
+    Testing edits are evaluated on the scheduler's thread and every cell that changed is reported
+    """
+    spreadsheet, scheduler, reports = chain
+    scheduler.set_priority(['A1900', 'A2', 'A1', 'C5'])
+
+    generation = scheduler.submit('a1', '10')
+    assert scheduler.wait_idle(timeout=30)
+
+    # Only the pending cells of the priority region are reported
+    assert reports['idle'][-1] == generation
+    assert reports['pending'] == [(generation, ['A1', 'A2', 'A1900'])]
+    assert len(reports['values']) == 2000 and reports['values']['A2000'] == '2009'
+    assert spreadsheet.get_value_from_cell('A2000') == '2009'
+
+    # Errors of edited cells are reported, dependents keep their formulas
+    scheduler.submit('B1', '=A1/0')
+    scheduler.submit('B2', '=B1+1')
+    assert scheduler.wait_idle(timeout=30)
+    assert isinstance(reports['errors']['B1'], ZeroDivision) and 'B2' in reports['errors']
+
+
+def test_newer_edits_supersede(chain):
+    """
+    Testing many edits in a row give the same values as editing the cells one by one, without evaluating the chain for every edit
+    """
+    spreadsheet, scheduler, reports = chain
+
+    for value in range(20):
+        scheduler.submit('A1', str(value))
+    scheduler.submit('C1', '=A2000*2')
+    assert scheduler.wait_idle(timeout=30)
+
+    assert spreadsheet.get_value_from_cell('A2000') == '2018'
+    assert spreadsheet.get_value_from_cell('C1') == '4036'
+    assert len(reports['pending']) < 20
+
+    # Cancelling drops the edits that were not written yet
+    with scheduler.paused():
+        scheduler.submit('A1', '100')
+        scheduler.cancel()
+    assert scheduler.wait_idle(timeout=30)
+    assert spreadsheet.get_value_from_cell('A1') == '19'
+
+
+def test_priority_region():
+    """
+    Testing cells of the priority region and the cells they depend on are evaluated before the rest
+    """
+    spreadsheet = Spreadsheet(rows=3000, cols=3)
+    cells = {'A1': '1', 'A2': '=A1*2'}
+    cells.update({f'B{row}': f'=A1+{row}' for row in range(1, 3001)})
+    cells['C1'] = '=SUM_BY_RANGE(B2999, B3000)+A2'
+    spreadsheet.edit_cells(cells)
+
+    chunks = []
+    scheduler = RecalcScheduler(spreadsheet, chunk_size=50, on_values=lambda generation, values: chunks.append(values))
+    scheduler.set_priority(['C1', 'B10'])
+
+    scheduler.submit('A1', '5')
+    assert scheduler.wait_idle(timeout=30)
+    scheduler.stop()
+
+    assert set(list(chunks[0])[:6]) == {'A1', 'A2', 'B10', 'B2999', 'B3000', 'C1'}
+    assert chunks[0]['C1'] == '6019'
+    assert sum(len(chunk) for chunk in chunks) == 3003
@@ -188,4 +188,47 @@ def test_int_to_letter_conversion(empty_spreadsheet: Spreadsheet):
     # Iterate through expected letters and compare with actual conversion
     for i, expected_letter in enumerate(expected_letters, start=1):
         actual_letter = empty_spreadsheet.__int_to_letter__(i)
-        assert actual_letter == expected_letter, f"Failed for index {i}: Expected {expected_letter}, but got {actual_letter}"
\ No newline at end of file
+        assert actual_letter == expected_letter, f"Failed for index {i}: Expected {expected_letter}, but got {actual_letter}"
+
+def test_compact_cell():
+    """
+    Testing cells are compact - no per instance dictionary, shared defult style and no dependents container until needed
+    """
+    cell = Cell(2, 28)
+    other = Cell(0, 1)
+
+    assert not hasattr(cell, '__dict__')
+    assert cell.get_name() == 'AB3' and cell.get_index() == [2, 28]
+    assert cell.style is other.style
+    assert cell.dependent_cells is None
+
+    cell.add_dependent_cell('a1')
+    assert cell.get_dependent_cell() == ['A1']
+    cell.remove_dependent_cell('A1')
+    assert cell.dependent_cells is None and cell.get_dependent_cell() == []
+
+    # A name that is given is kept when it is the name of the location, the same string the spreadsheet's references hold
+    name = ''.join(['A', 'B', '3'])
+    assert Cell(2, 28, name=name).name is name
+    assert Cell(2, 28, 'ab3', formula='=A1').get_formula() == '=A1'
+
+    with pytest.raises(ValueError):
+        Cell(0, 1, name='B1')
+
+
+def test_lazy_cells(empty_spreadsheet):
+    """
+    Testing cells objects are created only when cells are written, styled or referred to - not when they are read
+    """
+    assert not empty_spreadsheet.cells
+
+    assert empty_spreadsheet.get_cells_info('C3')['name'] == 'C3'
+    assert empty_spreadsheet.get_cell_formula('C3') == ''
+    assert empty_spreadsheet.get_value_from_cell('C3') == ''
+    assert not empty_spreadsheet.cells
+
+    empty_spreadsheet.edit_cell('A1', '=B1+1')
+    empty_spreadsheet.__get_cell_by_name__('D4').set_design(bg='red')
+
+    assert [cell.name for cell in empty_spreadsheet.iter_cells()] == ['A1', 'B1', 'D4']
+    assert empty_spreadsheet.get_cells_info('D4')['bg color'] == 'red'
@@ -0,0 +1,117 @@
+import pytest
+from spreadsheet import Spreadsheet
+from value_store import ValueStore, ChunkedValueStore
+from spreadsheet_types import ValueKind
+from spreadsheet_errors import *
+
+
+def test_store_kinds():
+    """
+    Testing values are stored by their kinds and read back exactly as they were written
+    """
+    store = ValueStore(3, 3)
+
+    store.set(0, 0, '42')
+    store.set(0, 1, '1.5')
+    store.set(0, 2, '007')
+    store.set(1, 0, 2 ** 70)
+    store.set(1, 1, True)
+    store.set_error(1, 2, ZeroDivision.VALUE)
+
+    assert store.get_kind(0, 0) is ValueKind.INT and store.get(0, 0) == 42
+    assert store.get_kind(0, 1) is ValueKind.FLOAT and store.get(0, 1) == 1.5
+    assert store.get_kind(0, 2) is ValueKind.TEXT and store.get(0, 2) == '007'
+    assert store.get_kind(1, 0) is ValueKind.INT and store.get(1, 0) == 2 ** 70
+    assert store.get_kind(1, 1) is ValueKind.TEXT and store.get(1, 1) == 'True'
+    assert store.get_kind(1, 2) is ValueKind.ERROR and store.get(1, 2) == ZeroDivision.VALUE
+    assert store.get_kind(2, 2) is ValueKind.EMPTY and store.get(2, 2) == ''
+
+    assert store.text_block(0, 2, 0, 3).tolist() == [['42', '1.5', '007'], [str(2 ** 70), 'True', ZeroDivision.VALUE]]
+
+    # Integers next to the biggest exact float, only the bigger one is in the side table
+    store.set(2, 0, 2 ** 53 + 1)
+    store.set(2, 1, 2 ** 53)
+    assert store.text_block(2, 3, 0, 2).tolist() == [[str(2 ** 53 + 1), str(2 ** 53)]]
+
+    # Overwriting a text with a number
+    store.set(0, 2, 7)
+    assert store.get_text(0, 2) == '7'
+    assert store.text_block(0, 1, 2, 3).tolist() == [['7']]
+
+
+def test_spreadsheet_values():
+    """
+    Testing the spreadsheet stores numbers as numbers and still shows the same values
+    """
+    spreadsheet = Spreadsheet(rows=5, cols=3)
+    spreadsheet.edit_cell('A1', '10')
+    spreadsheet.edit_cell('A2', '=A1/4')
+    spreadsheet.edit_cell('B1', 'text')
+
+    assert spreadsheet.values.get(0, 0) == 10
+    assert spreadsheet.values.get(1, 0) == 2.5
+    assert spreadsheet.get_value_from_cell('A2') == '2.5'
+
+    with pytest.raises(ZeroDivision):
+        spreadsheet.edit_cell('C1', '=A1/0')
+    assert spreadsheet.values.get_kind(0, 2) is ValueKind.ERROR
+
+    # Dataframe view of the values
+    cells_df = spreadsheet.cells_df
+    assert cells_df.shape == (5, 3)
+    assert cells_df.at['1', 'A'] == '10'
+    assert cells_df.at['2', 'A'] == '2.5'
+    assert cells_df.at['1', 'B'] == 'text'
+    assert cells_df.at['1', 'C'] == ZeroDivision.VALUE
+    assert cells_df.at['5', 'C'] == ''
+
+
+def test_chunked_store():
+    """
+    Testing the chunked store creates tiles only for cells with values, and reads blocks that cross tiles
+    """
+    store = ChunkedValueStore(1_000_000, 200, tile_rows=4, tile_cols=4)
+
+    store.set(999_999, 199, '5')
+    store.set(3, 3, 'x')
+    store.set(4, 4, '1.5')
+    store.set_error(5, 3, ZeroDivision.VALUE)
+
+    assert len(store.tiles) == 4
+    assert store.get(999_999, 199) == 5 and store.get_kind(999_999, 199) is ValueKind.INT
+    assert store.get(500, 100) == '' and store.get_kind(500, 100) is ValueKind.EMPTY
+    assert store.text_block(2, 6, 2, 5).tolist() == [['', '', ''], ['', 'x', ''], ['', '', '1.5'], ['', ZeroDivision.VALUE, '']]
+
+    # A range reads the tiles it covers by their indexes, a range over most of the sheet checks the populated tiles instead
+    assert [(block.row_offset, block.col_offset) for block in store.range_values(0, 8, 0, 8).blocks] == [(0, 0), (4, 0), (4, 4)]
+    assert [(block.row_offset, block.col_offset) for block in store.range_values(2, 1_000_000, 2, 200).blocks] == [(0, 0), (2, 0), (2, 2), (999_994, 194)]
+    assert store.text_block(999_998, 1_000_000, 198, 200).tolist() == [['', ''], ['', '5']]
+
+    # Emptying a tile releases it
+    store.set(3, 3, '')
+    assert len(store.tiles) == 3
+
+
+def test_sparse_spreadsheet():
+    """
+    Testing a huge sparse spreadsheet creates cells only when they are used, and evaluates formulas like a dense one
+    """
+    spreadsheet = Spreadsheet(rows=1_000_000, cols=100, sparse=True)
+    assert not spreadsheet.cells and not spreadsheet.values.tiles
+
+    spreadsheet.edit_cell('A1', '1')
+    spreadsheet.edit_cell('A1000', '2')
+    spreadsheet.edit_cell('CV1000000', '=SUM_BY_RANGE(A1, A1000)+A1')
+    assert spreadsheet.get_value_from_cell('CV1000000') == '4'
+    assert spreadsheet.get_value_from_cell('B5') == ''
+
+    spreadsheet.edit_cell('A500', '7')
+    assert spreadsheet.get_value_from_cell('CV1000000') == '11'
+
+    assert [cell.name for cell in spreadsheet.iter_cells()] == ['A1', 'A500', 'A1000', 'CV1000000']
+
+    # Reset keeps the storage mode
+    spreadsheet.reset_sheet(10, 10)
+    assert spreadsheet.sparse and not list(spreadsheet.iter_cells())
+    spreadsheet.undo_reset()
+    assert spreadsheet.get_value_from_cell('CV1000000') == '11'
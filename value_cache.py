@@ -0,0 +1,86 @@
+from libraries import *
+from spreadsheet_errors import *
+
+
+class ValueCache:
+    """
+    Class ValueCache: computed values of formula cells, stamped with the version they were computed at.
+    A value is reused until the cell is invalidated - when the cell or one of the cells it depends on changes.
+    """
+
+    # Returned when the cache has no valid value for a cell
+    MISSING = object()
+
+    def __init__(self) -> None:
+
+        # Increases on every invalidation
+        self.version = 0
+
+        # Cell name -> (value, version it was computed at), and cell name -> version it was last invalidated at
+        self.__entries: Dict[str, Tuple[Union[str, SpreadsheetError], int]] = {}
+        self.__invalidated: Dict[str, int] = {}
+
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+
+
+    def get(self, cell_name: str) -> Union[str, SpreadsheetError, object]:
+        """
+        Function get
+        Returns the cached value of a cell, or ValueCache.MISSING if there is no value that is still valid
+
+        Parameters:
+            * cell_name: str
+
+        Return Value: the value, an error if the cell's formula has failed, or ValueCache.MISSING
+        """
+
+        entry = self.__entries.get(cell_name)
+
+        if entry is not None and entry[1] >= self.__invalidated.get(cell_name, 0):
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        return ValueCache.MISSING
+
+
+    def set(self, cell_name: str, value: Union[str, SpreadsheetError]) -> None:
+        """
+        Function set
+        Stores the computed value of a cell, stamped with the current version
+
+        Parameters:
+            * cell_name: str
+            * value: the value or the error of the cell's formula
+        """
+        self.__entries[cell_name] = (value, self.version)
+
+
+    def invalidate(self, cells_names: Iterable[str]) -> None:
+        """
+        Function invalidate
+        Marks the values of the given cells as no longer valid
+
+        Parameters:
+            * cells_names: Iterable[str]
+        """
+
+        self.version += 1
+
+        for cell_name in cells_names:
+            self.__invalidated[cell_name] = self.version
+
+
+    def discard(self, cell_name: str) -> None:
+        """
+        Function discard
+        Removes a cell from the cache, used when the cell does not contain a formula anymore
+        """
+        self.__entries.pop(cell_name, None)
+        self.__invalidated.pop(cell_name, None)
+
+
+    def __len__(self) -> int:
+        return len(self.__entries)
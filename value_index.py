@@ -0,0 +1,225 @@
+from libraries import *
+from spreadsheet_types import ValueKind
+from value_store import ValueStore, ChunkedValueStore
+from array import array
+from bisect import bisect_left, insort
+from sys import getsizeof
+
+
+class ColumnIndex:
+    """
+    Class ColumnIndex: the rows of every value in one column, sorted, so the amount of cells with a value in a segment of the column
+    is found with two binary searches. Numbers are found by their value (2 and 2.0 are the same), texts and errors by their text.
+    """
+
+    # Type code of the rows arrays - 8 bytes integers
+    ROWS_TYPE = 'q'
+
+    # Key of the cells that are not a number - they are not empty, but no value is equal to them, not even a text
+    NAN_KEY = ('not a number',)
+
+    def __init__(self) -> None:
+
+        # Value -> sorted rows of the cells that have it, and sorted rows of all of the cells that are not empty
+        self.rows_by_value: Dict[Union[str, int, float, Tuple[str]], array] = {}
+        self.rows = array(ColumnIndex.ROWS_TYPE)
+
+
+    def count(self, start_row: int, stop_row: int, value: Union[str, int, float, None] = None) -> int:
+        """
+        Function count
+        Returns the amount of cells in rows [start_row, stop_row) that have the given value, or that are not empty if no value is given
+        """
+
+        rows = self.rows if value is None else self.rows_by_value.get(value)
+
+        if not rows:
+            return 0
+
+        return bisect_left(rows, stop_row) - bisect_left(rows, start_row)
+
+
+    def add(self, row: int, value: Union[str, int, float]) -> None:
+        """
+        Function add
+        Adds a cell's value to the index
+        """
+
+        rows = self.rows_by_value.get(value)
+
+        if rows is None:
+            rows = self.rows_by_value[value] = array(ColumnIndex.ROWS_TYPE)
+
+        # Inserting moves the rows after the new one, a single memory move of about 0.1 ms per million rows
+        insort(rows, row)
+        insort(self.rows, row)
+
+
+    def remove(self, row: int, value: Union[str, int, float]) -> None:
+        """
+        Function remove
+        Removes a cell's value from the index
+        """
+
+        rows = self.rows_by_value[value]
+        del rows[bisect_left(rows, row)]
+
+        if not rows:
+            del self.rows_by_value[value]
+
+        del self.rows[bisect_left(self.rows, row)]
+
+
+    def memory_usage(self) -> int:
+        """
+        Function memory_usage
+        Returns an estimation of the memory the index takes, in bytes
+        """
+        return getsizeof(self.rows_by_value) + getsizeof(self.rows) + sum(getsizeof(rows) for rows in self.rows_by_value.values())
+
+
+class ValueIndex:
+    """
+    Class ValueIndex: per column indexes of the rows of every value, for COUNTIF and other equality lookups.
+    A column's index is built from the values store the first time the column is looked up, and kept up to date on every change after that.
+    Rows and columns start from 0.
+    """
+
+    def __init__(self, store: Union[ValueStore, ChunkedValueStore]) -> None:
+
+        self.store = store
+
+        # Column -> index
+        self.columns: Dict[int, ColumnIndex] = {}
+
+        # Index statistics - columns built, and lookups of columns that were already built or not
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+
+
+    def count(self, start_row: int, stop_row: int, start_col: int, stop_col: int, value: Union[str, int, float, None] = None) -> int:
+        """
+        Function count
+        The function returns the amount of cells in a range that have the given value, building the indexes of its columns if needed.
+        Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+            * value: a number or a text. None counts the cells that are not empty
+
+        Return Value: int
+        """
+
+        # Not a number is not equal to anything
+        if isinstance(value, float) and value != value:
+            return 0
+
+        return sum(self.__get_column__(col).count(start_row, stop_row, value) for col in range(start_col, stop_col))
+
+
+    def remove_cell(self, row: int, col: int) -> None:
+        """
+        Function remove_cell
+        Removes the current value of a cell from the index, called before the value changes
+        """
+
+        column = self.columns.get(col)
+        value = self.__cell_key__(row, col) if column is not None else None
+
+        if value is not None:
+            column.remove(row, value)
+
+
+    def add_cell(self, row: int, col: int) -> None:
+        """
+        Function add_cell
+        Adds the current value of a cell to the index, called after the value has changed
+        """
+
+        column = self.columns.get(col)
+        value = self.__cell_key__(row, col) if column is not None else None
+
+        if value is not None:
+            column.add(row, value)
+
+
+    def memory_usage(self) -> int:
+        """
+        Function memory_usage
+        Returns an estimation of the memory the built columns take, in bytes
+        """
+        return sum(column.memory_usage() for column in self.columns.values())
+
+
+    def __get_column__(self, col: int) -> ColumnIndex:
+        """
+        Function __get_column__
+        An auxiliary function that returns the index of a column, building it from the values store the first time it is needed
+        """
+
+        column = self.columns.get(col)
+
+        if column is not None:
+            self.hits += 1
+            return column
+
+        self.misses += 1
+        self.builds += 1
+
+        column = self.columns[col] = ColumnIndex()
+        rows_by_value: Dict[Union[str, int, float, Tuple[str]], List[int]] = {}
+
+        for block in self.store.range_values(0, self.store.rows, col, col + 1).blocks:
+            kinds = block.kinds[:, 0]
+            numbers = block.numbers[:, 0]
+
+            # Numbers are grouped all together, big integers are read exactly with the texts
+            is_number = ((kinds == ValueKind.INT) & (np.abs(numbers) <= ValueStore.MAX_EXACT_INT)) | (kinds == ValueKind.FLOAT)
+            is_nan = is_number & np.isnan(numbers)
+            is_number &= ~is_nan
+            number_rows = np.nonzero(is_number)[0]
+
+            if is_nan.any():
+                rows_by_value.setdefault(ColumnIndex.NAN_KEY, []).extend((np.nonzero(is_nan)[0] + block.row_offset).tolist())
+
+            if number_rows.size:
+                order = np.argsort(numbers[number_rows], kind='stable')
+                values, starts = np.unique(numbers[number_rows][order], return_index=True)
+
+                for value, rows in zip(values.tolist(), np.split(number_rows[order] + block.row_offset, starts[1:])):
+                    rows_by_value.setdefault(value, []).extend(rows.tolist())
+
+            other_rows = np.nonzero((kinds != ValueKind.EMPTY) & ~is_number & ~is_nan)[0]
+            for row in other_rows.tolist():
+                value = self.__cell_key__(row + block.start_row, block.start_col, block.store)
+                rows_by_value.setdefault(value, []).append(row + block.row_offset)
+
+        # Blocks of a sparse store are not ordered by rows
+        all_rows = []
+        for value, rows in rows_by_value.items():
+            rows.sort()
+            all_rows.extend(rows)
+            column.rows_by_value[value] = array(ColumnIndex.ROWS_TYPE, rows)
+
+        all_rows.sort()
+        column.rows = array(ColumnIndex.ROWS_TYPE, all_rows)
+
+        return column
+
+
+    def __cell_key__(self, row: int, col: int, store: Union[ValueStore, ChunkedValueStore, None] = None) -> Union[str, int, float, Tuple[str], None]:
+        """
+        Function __cell_key__
+        An auxiliary function that returns the value a cell is indexed by, NAN_KEY if it is not a number, or None if the cell is empty
+        """
+
+        value = (self.store if store is None else store).get(row, col)
+
+        if value == '':
+            return None
+
+        if isinstance(value, float) and value != value:
+            return ColumnIndex.NAN_KEY
+
+        return value
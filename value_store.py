@@ -0,0 +1,489 @@
+from libraries import *
+from spreadsheet_types import ValueKind
+import sys
+
+
+class ValueStore:
+    """
+    Class ValueStore: typed storage of the cells values of a spreadsheet.
+    Numbers are kept in a float64 array, the kind of every value (empty, int, float, text, error) in a matching int8 array,
+    and text and error values in a side table by their (row, col) index. Rows and columns start from 0.
+    """
+
+    # Integers that can be stored exactly in a float64
+    MAX_EXACT_INT = 2 ** 53
+
+    def __init__(self, rows: int, cols: int) -> None:
+
+        self.rows = rows
+        self.cols = cols
+
+        # Numbers and kinds of values
+        self.numbers = np.zeros((rows, cols), dtype=np.float64)
+        self.kinds = np.zeros((rows, cols), dtype=np.int8)
+
+        # Text values, error values and integers too big for a float64, and the amount of those integers
+        self.objects: Dict[Tuple[int, int], Union[str, int]] = {}
+        self.big_ints = 0
+
+
+    def set(self, row: int, col: int, value: Union[str, int, float]) -> None:
+        """
+        Function set
+        The function stores a value in a cell. Numeral strings are stored as numbers if they are written the way python writes numbers,
+        so reading them back returns the exact same string.
+
+        Parameters:
+            * row, col: int
+            * value: Union[str, int, float] - a number, or a string as the user has written it
+
+        Return Value: None
+        """
+
+        if isinstance(value, str):
+            value = ValueStore.parse_number(value)
+
+        # Booleans are ints in python, but are shown as text
+        if isinstance(value, bool):
+            value = str(value)
+
+        self.__pop_object__(row, col)
+
+        if isinstance(value, int):
+            self.kinds[row, col] = ValueKind.INT
+
+            if abs(value) > ValueStore.MAX_EXACT_INT:
+                self.objects[(row, col)] = value
+                self.big_ints += 1
+                self.numbers[row, col] = self.__to_float__(value)
+            else:
+                self.numbers[row, col] = value
+
+        elif isinstance(value, float):
+            self.kinds[row, col] = ValueKind.FLOAT
+            self.numbers[row, col] = value
+
+        elif value == '':
+            self.kinds[row, col] = ValueKind.EMPTY
+            self.numbers[row, col] = 0
+
+        else:
+            self.kinds[row, col] = ValueKind.TEXT
+            self.numbers[row, col] = 0
+            self.objects[(row, col)] = str(value)
+
+
+    def set_error(self, row: int, col: int, error_value: str) -> None:
+        """
+        Function set_error
+        The function stores an error value in a cell
+
+        Parameters:
+            * row, col: int
+            * error_value: str - the value of the error, for example '#ZeroDiv#'
+
+        Return Value: None
+        """
+
+        self.__pop_object__(row, col)
+
+        self.kinds[row, col] = ValueKind.ERROR
+        self.numbers[row, col] = 0
+        self.objects[(row, col)] = error_value
+
+
+    def get(self, row: int, col: int) -> Union[str, int, float]:
+        """
+        Function get
+        The function returns the value of a cell - a number for numeral values, a string otherwise ('' for empty cells)
+
+        Parameters:
+            * row, col: int
+
+        Return Value: Union[str, int, float]
+        """
+
+        # Reading python values out of the arrays, comparing numpy scalars to the kinds is much slower
+        kind = self.kinds.item(row, col)
+
+        if kind == ValueKind.INT:
+            value = self.objects.get((row, col))
+            return int(self.numbers.item(row, col)) if value is None else value
+
+        if kind == ValueKind.FLOAT:
+            return self.numbers.item(row, col)
+
+        if kind == ValueKind.EMPTY:
+            return ''
+
+        return self.objects[(row, col)]
+
+
+    def get_text(self, row: int, col: int) -> str:
+        """
+        Function get_text
+        The function returns the value of a cell as it is shown to the user
+
+        Parameters:
+            * row, col: int
+
+        Return Value: str
+        """
+        return str(self.get(row, col))
+
+
+    def get_kind(self, row: int, col: int) -> ValueKind:
+        """
+        Function get_kind
+        Returns the kind of the value stored in a cell
+        """
+        return ValueKind(self.kinds.item(row, col))
+
+
+    def text_block(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> np.ndarray:
+        """
+        Function text_block
+        The function returns the values of a block of cells as they are shown to the user. Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+
+        Return Value: np.ndarray - 2D array of strings
+        """
+
+        kinds = self.kinds[start_row:stop_row, start_col:stop_col]
+        numbers = self.numbers[start_row:stop_row, start_col:stop_col]
+
+        block = np.full(kinds.shape, '', dtype=object)
+
+        # Texts, errors and big integers are in the side table, only the cells of the block are looked up in it
+        ints = kinds == ValueKind.INT
+        floats = kinds == ValueKind.FLOAT
+        objects = kinds >= ValueKind.TEXT
+
+        if self.big_ints:
+            big = ints & (np.abs(numbers) >= ValueStore.MAX_EXACT_INT)
+            ints &= ~big
+            objects |= big
+
+        # Numbers are turned into strings all together, the same way python writes them
+        block[ints] = [str(int(number)) for number in numbers[ints]]
+        block[floats] = [str(float(number)) for number in numbers[floats]]
+
+        rows, cols = np.nonzero(objects)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            block[row, col] = self.get_text(row + start_row, col + start_col)
+
+        return block
+
+
+    def range_values(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> 'RangeValues':
+        """
+        Function range_values
+        The function returns the values of a range of cells as views of the store's arrays, without copying them.
+        Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+
+        Return Value: RangeValues
+        """
+        return RangeValues([ValueBlock(self, start_row, stop_row, start_col, stop_col)], start_row, stop_row, start_col, stop_col)
+
+
+    def memory_usage(self) -> int:
+        """
+        Function memory_usage
+        Returns an estimation of the memory the store takes, in bytes
+        """
+        return self.numbers.nbytes + self.kinds.nbytes + sum(sys.getsizeof(value) for value in self.objects.values())
+
+
+    @staticmethod
+    def parse_number(value: str) -> Union[str, int, float]:
+        """
+        Function parse_number
+        The function turns a numeral string into a number, only if writing the number back gives the same string.
+
+        Parameters:
+            * value: str
+
+        Return Value: Union[str, int, float] - the number, or the same string if it is not a number
+        """
+
+        try:
+            number = float(value) if '.' in value else int(value)
+        except ValueError:
+            return value
+
+        return number if str(number) == value else value
+
+
+    def __pop_object__(self, row: int, col: int) -> None:
+        """
+        Function __pop_object__
+        An auxiliary function that removes the side table value of a cell, if it has one
+        """
+
+        if isinstance(self.objects.pop((row, col), None), int):
+            self.big_ints -= 1
+
+
+    def __to_float__(self, value: int) -> float:
+        """
+        Function __to_float__
+        An auxiliary function that converts an integer to a float, integers too big for a float become infinity
+        """
+        try:
+            return float(value)
+        except OverflowError:
+            return float('inf') if value > 0 else float('-inf')
+
+
+class ChunkedValueStore:
+    """
+    Class ChunkedValueStore: sparse typed storage of the cells values, for very large sheets that are mostly empty.
+    The sheet is split into fixed size tiles, and only tiles that contain values take memory. Every tile is a small ValueStore,
+    so a cell is found in O(1) by dividing its index by the tile size. Rows and columns start from 0.
+    """
+
+    # Defult tiles size
+    TILE_ROWS = 256
+    TILE_COLS = 64
+
+    def __init__(self, rows: int, cols: int, tile_rows=TILE_ROWS, tile_cols=TILE_COLS) -> None:
+
+        self.rows = rows
+        self.cols = cols
+
+        self.tile_rows = tile_rows
+        self.tile_cols = tile_cols
+
+        # (tile row, tile col) -> tile
+        self.tiles: Dict[Tuple[int, int], ValueStore] = {}
+
+
+    def set(self, row: int, col: int, value: Union[str, int, float]) -> None:
+        """
+        Function set
+        The function stores a value in a cell, creating its tile if needed. Tiles that become empty are released.
+
+        Parameters:
+            * row, col: int
+            * value: Union[str, int, float] - a number, or a string as the user has written it
+
+        Return Value: None
+        """
+
+        tile_index = (row // self.tile_rows, col // self.tile_cols)
+        tile = self.tiles.get(tile_index)
+
+        # Empty values need no tile
+        if tile is None:
+            if value == '':
+                return
+            tile = self.tiles[tile_index] = ValueStore(self.tile_rows, self.tile_cols)
+
+        tile.set(row % self.tile_rows, col % self.tile_cols, value)
+
+        if value == '' and not tile.kinds.any():
+            del self.tiles[tile_index]
+
+
+    def set_error(self, row: int, col: int, error_value: str) -> None:
+        """
+        Function set_error
+        The function stores an error value in a cell
+
+        Parameters:
+            * row, col: int
+            * error_value: str
+
+        Return Value: None
+        """
+
+        tile_index = (row // self.tile_rows, col // self.tile_cols)
+        tile = self.tiles.get(tile_index)
+
+        if tile is None:
+            tile = self.tiles[tile_index] = ValueStore(self.tile_rows, self.tile_cols)
+
+        tile.set_error(row % self.tile_rows, col % self.tile_cols, error_value)
+
+
+    def get(self, row: int, col: int) -> Union[str, int, float]:
+        """
+        Function get
+        The function returns the value of a cell - a number for numeral values, a string otherwise ('' for empty cells)
+        """
+
+        tile = self.tiles.get((row // self.tile_rows, col // self.tile_cols))
+
+        if tile is None:
+            return ''
+
+        return tile.get(row % self.tile_rows, col % self.tile_cols)
+
+
+    def get_text(self, row: int, col: int) -> str:
+        """
+        Function get_text
+        The function returns the value of a cell as it is shown to the user
+        """
+        return str(self.get(row, col))
+
+
+    def get_kind(self, row: int, col: int) -> ValueKind:
+        """
+        Function get_kind
+        Returns the kind of the value stored in a cell
+        """
+
+        tile = self.tiles.get((row // self.tile_rows, col // self.tile_cols))
+
+        if tile is None:
+            return ValueKind.EMPTY
+
+        return tile.get_kind(row % self.tile_rows, col % self.tile_cols)
+
+
+    def text_block(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> np.ndarray:
+        """
+        Function text_block
+        The function returns the values of a block of cells as they are shown to the user. Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+
+        Return Value: np.ndarray - 2D array of strings
+        """
+
+        block = np.full((max(stop_row - start_row, 0), max(stop_col - start_col, 0)), '', dtype=object)
+
+        # Copying the part of every populated tile that is inside the block
+        for tile, tile_start_row, tile_start_col, rows_from, rows_to, cols_from, cols_to in self.__covered_tiles__(start_row, stop_row, start_col, stop_col):
+            block[rows_from - start_row:rows_to - start_row, cols_from - start_col:cols_to - start_col] = tile.text_block(
+                rows_from - tile_start_row, rows_to - tile_start_row, cols_from - tile_start_col, cols_to - tile_start_col)
+
+        return block
+
+
+    def range_values(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> 'RangeValues':
+        """
+        Function range_values
+        The function returns the values of a range of cells as views of the tiles it covers. Tiles that do not exist are empty,
+        so they are not part of the result. Stops are not included, like python slices.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+
+        Return Value: RangeValues
+        """
+
+        blocks = [ValueBlock(tile, rows_from - tile_start_row, rows_to - tile_start_row, cols_from - tile_start_col, cols_to - tile_start_col,
+                             row_offset=rows_from - start_row, col_offset=cols_from - start_col)
+                  for tile, tile_start_row, tile_start_col, rows_from, rows_to, cols_from, cols_to
+                  in self.__covered_tiles__(start_row, stop_row, start_col, stop_col)]
+
+        return RangeValues(blocks, start_row, stop_row, start_col, stop_col)
+
+
+    def memory_usage(self) -> int:
+        """
+        Function memory_usage
+        Returns an estimation of the memory the store takes, in bytes
+        """
+        return sum(tile.memory_usage() for tile in self.tiles.values())
+
+
+    def __covered_tiles__(self, start_row: int, stop_row: int, start_col: int, stop_col: int) -> Iterator[Tuple[ValueStore, int, int, int, int, int, int]]:
+        """
+        Function __covered_tiles__
+        An auxiliary function that finds the populated tiles a block of cells covers, by rows order. Stops are not included, like python slices.
+        The tiles of the block are looked up by their indexes, unless the block covers more tiles than there are populated tiles -
+        then the populated tiles are checked, so the cost is never more than the smaller of the two.
+
+        Parameters:
+            * start_row, stop_row, start_col, stop_col: int
+
+        Return Value: Iterator of tuples - the tile, the row and col it starts at, and the part of the block inside it
+                      (rows from, rows to, cols from, cols to), in the sheet's indexes
+        """
+
+        if start_row >= stop_row or start_col >= stop_col:
+            return
+
+        tile_rows = range(start_row // self.tile_rows, (stop_row - 1) // self.tile_rows + 1)
+        tile_cols = range(start_col // self.tile_cols, (stop_col - 1) // self.tile_cols + 1)
+
+        if len(tile_rows) * len(tile_cols) <= len(self.tiles):
+            indexes = ((tile_row, tile_col) for tile_row in tile_rows for tile_col in tile_cols)
+        else:
+            indexes = sorted(index for index in self.tiles if index[0] in tile_rows and index[1] in tile_cols)
+
+        for tile_row, tile_col in indexes:
+            tile = self.tiles.get((tile_row, tile_col))
+
+            if tile is None:
+                continue
+
+            tile_start_row = tile_row * self.tile_rows
+            tile_start_col = tile_col * self.tile_cols
+
+            yield (tile, tile_start_row, tile_start_col, max(start_row, tile_start_row), min(stop_row, tile_start_row + self.tile_rows),
+                   max(start_col, tile_start_col), min(stop_col, tile_start_col + self.tile_cols))
+
+
+class ValueBlock:
+    """
+    Class ValueBlock: a rectangular part of a ValueStore - views of its numbers and kinds arrays.
+    """
+
+    def __init__(self, store: ValueStore, start_row: int, stop_row: int, start_col: int, stop_col: int, row_offset=0, col_offset=0) -> None:
+
+        self.store = store
+
+        # Location of the block in the store, and in the range it is part of
+        self.start_row = start_row
+        self.start_col = start_col
+        self.row_offset = row_offset
+        self.col_offset = col_offset
+
+        self.numbers = store.numbers[start_row:stop_row, start_col:stop_col]
+        self.kinds = store.kinds[start_row:stop_row, start_col:stop_col]
+
+
+    def values(self, mask: np.ndarray) -> List[Union[str, int, float]]:
+        """
+        Function values
+        Returns the exact values of the cells of the block that are marked in the given mask, by rows order
+
+        Parameters:
+            * mask: np.ndarray - 2D array of booleans, in the shape of the block
+
+        Return Value: List[Union[str, int, float]]
+        """
+
+        rows, cols = np.nonzero(mask)
+
+        return [self.store.get(row + self.start_row, col + self.start_col) for row, col in zip(rows.tolist(), cols.tolist())]
+
+
+class RangeValues:
+    """
+    Class RangeValues: the values of a range of cells, as the blocks of the stores that hold them.
+    Cells of the range that are not in any block are empty.
+    """
+
+    def __init__(self, blocks: List[ValueBlock], start_row: int, stop_row: int, start_col: int, stop_col: int) -> None:
+
+        self.blocks = blocks
+
+        # Location of the range in the spreadsheet, stops are not included
+        self.start_row = start_row
+        self.stop_row = stop_row
+        self.start_col = start_col
+        self.stop_col = stop_col
+
+        # Amount of cells in the range
+        self.size = max(stop_row - start_row, 0) * max(stop_col - start_col, 0)